@@ -3,13 +3,30 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+import os
 import logging
 
 from src.router import router
+from src.main.config.mongodb import get_mongo_client, close_mongo_client
+from src.main.config.indexes import ensure_indexes, check_required_indexes, MONGODB_ENSURE_INDEXES
+from src.main.config.sqs import get_sqs_client, close_sqs_client, get_sqs_executor, close_sqs_executor
+from src.main.ai.di.dependencies import (
+    reset_dependencies,
+    get_outbox_relay,
+    get_change_stream_feed,
+    get_status_cache,
+    get_similarity_engine,
+    get_file_duplicate_check_repository
+)
+from src.main.config.similarity import SIMILARITY_ENABLED
 
 
 load_dotenv()
 
+# 다른 인스턴스의 워커 결과를 change stream으로 받을지 여부
+AI_CHANGE_STREAM_ENABLED = os.getenv("AI_CHANGE_STREAM_ENABLED", "false").lower() == "true"
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -24,8 +41,42 @@ origins = [
 ]
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 시작 시 공유 AsyncMongoClient, SQS 클라이언트 생성
+    mongo_client = get_mongo_client()
+    # 중복 요청을 막는 유니크 인덱스가 없으면 기동하지 않음 (이미 있는 인덱스는 조회만 하므로 빠름)
+    if MONGODB_ENSURE_INDEXES:
+        check_required_indexes(await ensure_indexes(mongo_client.get_database()))
+    get_sqs_client()
+    get_sqs_executor()
+    # 아웃박스 메시지를 SQS로 전달하는 릴레이 시작
+    relay = get_outbox_relay()
+    relay.start()
+    feed = get_change_stream_feed() if AI_CHANGE_STREAM_ENABLED else None
+    if feed is not None:
+        feed.start()
+    # 유사도 인덱스는 기동을 지연시키지 않도록 백그라운드에서 적재 (적재 전에는 워커 경로 사용)
+    similarity = get_similarity_engine() if SIMILARITY_ENABLED else None
+    if similarity is not None:
+        similarity.start(get_file_duplicate_check_repository())
+    yield
+    if feed is not None:
+        await feed.stop()
+    if similarity is not None:
+        await similarity.stop()
+    await relay.stop()
+    await get_status_cache().close()
+    # 종료 시 의존성 캐시 정리 후 공유 클라이언트 종료
+    reset_dependencies()
+    close_sqs_executor()
+    close_sqs_client()
+    await close_mongo_client()
+
+
 app = FastAPI(  
     title="xrpedia-ai-proxy",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -1,40 +1,74 @@
-from typing import Optional
-from pymongo.collection import Collection
-from pymongo import MongoClient
+from typing import List, Optional, Tuple
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo import AsyncMongoClient, ReturnDocument, DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError
 from bson import ObjectId
 from datetime import datetime, timezone
 
 
 class CategoryRecommendationRepository:
-    def __init__(self, client: MongoClient):
+    def __init__(self, client: AsyncMongoClient):
         self.db = client.get_database()
-        self.collection: Collection = self.db.get_collection('category_recommendations')
+        self.collection: AsyncCollection = self.db.get_collection('category_recommendations')
 
-    def create_recommendation_request(self, file_id: str, user_id: str) -> dict:
+    async def create_recommendation_request(self, file_id: str, user_id: str, session=None) -> dict:
         document = {
             "file_id": file_id,
             "user_id": user_id,
             "is_completed": False,
             "created_at": self.get_current_time()
         }
-        result = self.collection.insert_one(document)
+        result = await self.collection.insert_one(document, session=session)
         document["_id"] = result.inserted_id
         return document
 
-    def get_recommendation_by_id(self, request_id: str, user_id: str) -> Optional[dict]:
+    async def create_recommendation_requests(self, file_ids: List[str], user_id: str, session=None) -> List[dict]:
+        """여러 파일의 추천 요청을 insert_many 한 번으로 생성합니다. 반환 순서는 file_ids와 같습니다."""
+        now = self.get_current_time()
+        documents = [
+            {
+                "file_id": file_id,
+                "user_id": user_id,
+                "is_completed": False,
+                "created_at": now
+            }
+            for file_id in file_ids
+        ]
+        result = await self.collection.insert_many(documents, session=session)
+        for document, inserted_id in zip(documents, result.inserted_ids):
+            document["_id"] = inserted_id
+        return documents
+
+    async def get_recommendation_by_id(self, request_id: str, user_id: str) -> Optional[dict]:
         try:
             object_id = ObjectId(request_id)
-            return self.collection.find_one({
+            return await self.collection.find_one({
                 "_id": object_id,
                 "user_id": user_id
             })
         except:
             return None
 
-    def update_recommendation_result(self, request_id: str, predicted_category: str) -> Optional[dict]:
+    async def get_recommendations_by_ids(self, request_ids: List[str], user_id: str) -> List[dict]:
+        # 올바르지 않은 ID는 존재하지 않는 요청으로 취급
+        object_ids = [ObjectId(request_id) for request_id in request_ids if ObjectId.is_valid(request_id)]
+        if not object_ids:
+            return []
+        return await self.collection.find({
+            "_id": {"$in": object_ids},
+            "user_id": user_id
+        }).to_list()
+
+    async def get_pending_recommendations(self, user_id: str, limit: int) -> List[dict]:
+        return await self.collection.find({
+            "user_id": user_id,
+            "is_completed": False
+        }).sort("created_at", DESCENDING).limit(limit).to_list()
+
+    async def update_recommendation_result(self, request_id: str, predicted_category: str) -> Optional[dict]:
         try:
             object_id = ObjectId(request_id)
-            result = self.collection.update_one(
+            return await self.collection.find_one_and_update(
                 {"_id": object_id},
                 {
                     "$set": {
@@ -42,15 +76,50 @@ class CategoryRecommendationRepository:
                         "predicted_category": predicted_category,
                         "updated_at": self.get_current_time()
                     }
-                }
+                },
+                return_document=ReturnDocument.AFTER
             )
-            
-            if result.modified_count == 0:
-                return None
-                
-            return self.collection.find_one({"_id": object_id})
         except:
             return None
+
+
+    async def update_recommendation_results(self, results: List[Tuple[str, str]]) -> List[dict]:
+        """(request_id, predicted_category) 목록을 unordered bulk_write 한 번으로 기록합니다.
+
+        기록에 성공한 문서를 $in 조회 한 번으로 다시 읽어 반환합니다.
+        올바르지 않은 ID나 존재하지 않는 요청은 반환 목록에서 빠집니다.
+        """
+        now = self.get_current_time()
+        object_ids = []
+        operations = []
+        for request_id, predicted_category in results:
+            if not ObjectId.is_valid(request_id):
+                continue
+            object_id = ObjectId(request_id)
+            object_ids.append(object_id)
+            operations.append(UpdateOne(
+                {"_id": object_id},
+                {
+                    "$set": {
+                        "is_completed": True,
+                        "predicted_category": predicted_category,
+                        "updated_at": now
+                    }
+                }
+            ))
+        if not operations:
+            return []
+
+        failed_ids = set()
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            failed_ids = {object_ids[error["index"]] for error in e.details.get("writeErrors", [])}
+
+        updated_ids = [object_id for object_id in object_ids if object_id not in failed_ids]
+        if not updated_ids:
+            return []
+        return await self.collection.find({"_id": {"$in": updated_ids}, "is_completed": True}).to_list()
         
     def get_current_time(self):
         return datetime.now(timezone.utc) 
\ No newline at end of file
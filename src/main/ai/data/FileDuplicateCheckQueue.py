@@ -2,12 +2,10 @@ import json
 import hashlib
 
 class FileDuplicateCheckQueue:
-    def __init__(self, sqs_client, queue_url):
-        self.sqs_client = sqs_client
-        self.queue_url = queue_url
+    """파일 중복 검사 요청의 SQS 메시지 엔트리를 만듭니다. 전송은 아웃박스 릴레이가 담당합니다."""
     
-    def send_message(self, request_id: str, user_id: str, s3_bucket: str, s3_key: str):
-        """SQS 큐에 메시지를 전송합니다."""
+    def build_message_entry(self, request_id: str, user_id: str, s3_bucket: str, s3_key: str) -> dict:
+        """SQS 메시지 엔트리(QueueUrl 제외)를 생성합니다."""
         message_body = {
             'request_type': 'file_duplicate_check_embedding_file',
             'request_id': request_id,
@@ -22,11 +20,8 @@ class FileDuplicateCheckQueue:
         # request_id를 MD5 해시로 변환하여 사용합니다.
         deduplication_id = hashlib.md5(str(request_id).encode()).hexdigest()
         
-        response = self.sqs_client.send_message(
-            QueueUrl=self.queue_url,
-            MessageGroupId=str(user_id),
-            MessageDeduplicationId=deduplication_id,
-            MessageBody=json.dumps(message_body),
-        )
-        
-        return response 
\ No newline at end of file
+        return {
+            'MessageGroupId': str(user_id),
+            'MessageDeduplicationId': deduplication_id,
+            'MessageBody': json.dumps(message_body),
+        }
@@ -1,6 +1,19 @@
 from bson import ObjectId
+from bson.binary import Binary, BinaryVectorDtype
+import logging
+from typing import List, Optional
+from pymongo import ReturnDocument, DESCENDING, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from datetime import datetime, timezone
 
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# file_embeddings에 저장하는 임베딩 형식 (BSON Binary vector, float32)
+EMBEDDING_DTYPE = "float32"
+# files 문서의 파일 내용 해시(SHA-256, 소문자 16진수) 필드
+CONTENT_HASH_FIELD = "sha256"
+
 
 class FileDuplicateCheckRepository:
     def __init__(self, mongo_client):
@@ -14,75 +27,230 @@ class FileDuplicateCheckRepository:
         """현재 시간을 UTC 기준으로 반환합니다."""
         return datetime.now(timezone.utc)
     
-    def get_file_by_id(self, file_id: str):
+    async def get_file_by_id(self, file_id: str):
         """파일 ID로 파일 정보를 조회합니다."""
         try:
             file_obj_id = ObjectId(file_id)
-            return self.files_collection.find_one({"_id": file_obj_id})
+            return await self.files_collection.find_one({"_id": file_obj_id})
         except Exception as e:
             return None
     
-    def has_file_embedding(self, file_id: str) -> bool:
+    async def find_file_by_content_hash(self, content_hash: str, exclude_file_id: str):
+        """내용 해시가 같은 다른 파일을 조회합니다. 없으면 None을 반환합니다."""
+        query = {CONTENT_HASH_FIELD: content_hash}
+        if ObjectId.is_valid(exclude_file_id):
+            query["_id"] = {"$ne": ObjectId(exclude_file_id)}
+        return await self.files_collection.find_one(query, {"_id": True})
+    
+    async def save_file_content_hash(self, file_id: str, content_hash: str):
+        """파일의 내용 해시를 기록합니다."""
+        if not ObjectId.is_valid(file_id):
+            return None
+        return await self.files_collection.update_one(
+            {"_id": ObjectId(file_id)},
+            {"$set": {CONTENT_HASH_FIELD: content_hash}}
+        )
+    
+    async def has_file_embedding(self, file_id: str) -> bool:
         """파일의 임베딩 존재 여부를 확인합니다."""
         try:
             file_obj_id = ObjectId(file_id)
-            result = self.file_embeddings_collection.find_one({"file_id": file_obj_id})
+            result = await self.file_embeddings_collection.find_one({"file_id": file_obj_id})
             return result is not None
         except Exception as e:
             return False
     
-    def create_duplicate_check_request(self, file_id: str, user_id: str):
-        """중복 검사 요청을 생성합니다."""
+    async def save_file_embedding(self, file_id: str, embeddings: List[float]):
+        """파일 임베딩을 저장합니다. 이미 저장된 임베딩이 있으면 덮어씁니다.
+        
+        float 배열 대신 float32 BSON Binary vector로 저장해 문서 크기를 줄이고 디코딩을 빠르게 합니다.
+        """
         now = self.get_current_time()
-        document = {
-            "file_id": file_id,
-            "user_id": user_id,
+        return await self.file_embeddings_collection.find_one_and_update(
+            {"file_id": ObjectId(file_id)},
+            {
+                "$set": {
+                    "embedding": Binary.from_vector(embeddings, BinaryVectorDtype.FLOAT32),
+                    "dimensions": len(embeddings),
+                    "dtype": EMBEDDING_DTYPE,
+                    "updated_at": now
+                },
+                "$setOnInsert": {"created_at": now}
+            },
+            upsert=True,
+            projection={"embedding": False},
+            return_document=ReturnDocument.AFTER
+        )
+    
+    def find_file_embeddings(self, batch_size: int = 1000, updated_after: Optional[datetime] = None):
+        """파일 임베딩을 순회하는 커서를 반환합니다. updated_after가 주어지면 그 시각 이후에 저장된 것만 조회합니다."""
+        query = {} if updated_after is None else {"updated_at": {"$gte": updated_after}}
+        return self.file_embeddings_collection.find(
+            query,
+            {"_id": False, "file_id": True, "embedding": True, "updated_at": True},
+            batch_size=batch_size
+        )
+    
+    async def get_file_embedding(self, file_id: str) -> Optional[List[float]]:
+        """파일 임베딩을 float 목록으로 조회합니다. 없으면 None을 반환합니다."""
+        if not ObjectId.is_valid(file_id):
+            return None
+        document = await self.file_embeddings_collection.find_one({"file_id": ObjectId(file_id)})
+        if document is None:
+            return None
+        return self.decode_embedding(document)
+    
+    @staticmethod
+    def decode_embedding(document: dict) -> List[float]:
+        """file_embeddings 문서의 임베딩을 float 목록으로 변환합니다."""
+        embedding = document["embedding"]
+        if isinstance(embedding, Binary):
+            return embedding.as_vector().data
+        # float 배열로 저장된 기존 문서
+        return list(embedding)
+    
+    async def create_duplicate_check_request(self, file_id: str, user_id: str, session=None, is_duplicated: Optional[bool] = None):
+        """중복 검사 요청을 생성합니다.
+        
+        (file_id, user_id) 기준 조건부 upsert로 한 번에 생성하며,
+        이미 요청이 존재하면 None을 반환합니다.
+        is_duplicated가 주어지면 이미 판정된 결과로 완료된 요청을 생성합니다.
+        """
+        now = self.get_current_time()
+        fields = {
             "is_completed": False,
             "is_duplicated": None,
             "created_at": now
         }
+        if is_duplicated is not None:
+            fields.update({"is_completed": True, "is_duplicated": is_duplicated, "updated_at": now})
+        document = {"file_id": file_id, "user_id": user_id, **fields}
         
-        result = self.file_checks_collection.insert_one(document)
+        try:
+            result = await self.file_checks_collection.update_one(
+                {"file_id": file_id, "user_id": user_id},
+                {"$setOnInsert": fields},
+                upsert=True,
+                session=session
+            )
+        except DuplicateKeyError:
+            # 동시에 들어온 같은 요청이 먼저 생성한 경우
+            return None
+        
+        if result.upserted_id is None:
+            return None
         
-        return self.file_checks_collection.find_one({"_id": result.inserted_id})
+        document["_id"] = result.upserted_id
+        return document
     
-    def get_duplicate_check_by_file_id(self, file_id: str, user_id: str):
+    async def get_duplicate_check_by_file_id(self, file_id: str, user_id: str):
         """파일 ID와 사용자 ID로 중복 검사 요청을 조회합니다."""
-        return self.file_checks_collection.find_one({
+        return await self.file_checks_collection.find_one({
             "file_id": file_id,
             "user_id": user_id
         })
     
-    def get_duplicate_check_by_id(self, request_id: str):
+    async def get_duplicate_checks_by_file_ids(self, file_ids: list, user_id: str):
+        """여러 파일의 중복 검사 요청을 $in 쿼리 한 번으로 조회합니다."""
+        if not file_ids:
+            return []
+        return await self.file_checks_collection.find({
+            "file_id": {"$in": file_ids},
+            "user_id": user_id
+        }).to_list()
+    
+    async def get_pending_duplicate_checks(self, user_id: str, limit: int):
+        """사용자의 완료되지 않은 중복 검사 요청을 최신순으로 조회합니다."""
+        return await self.file_checks_collection.find({
+            "user_id": user_id,
+            "is_completed": False
+        }).sort("created_at", DESCENDING).limit(limit).to_list()
+    
+    async def get_duplicate_check_by_id(self, request_id: str):
         """요청 ID로 중복 검사 요청을 조회합니다."""
         try:
             request_obj_id = ObjectId(request_id)
-            return self.file_checks_collection.find_one({"_id": request_obj_id})
+            return await self.file_checks_collection.find_one({"_id": request_obj_id})
         except Exception as e:
             return None
     
-    def update_file_duplicate_status(self, file_id: str, is_duplicated: bool):
+    async def get_duplicate_checks_by_ids(self, request_ids: list):
+        """여러 요청 ID의 중복 검사 요청을 $in 쿼리 한 번으로 조회합니다. 올바르지 않은 ID는 제외합니다."""
+        object_ids = [ObjectId(request_id) for request_id in request_ids if ObjectId.is_valid(request_id)]
+        if not object_ids:
+            return []
+        return await self.file_checks_collection.find({"_id": {"$in": object_ids}}).to_list()
+    
+    async def update_duplicate_check_results(self, results: list) -> set:
+        """(중복 검사 요청 문서, is_duplicated) 목록을 기록하고 기록에 실패한 요청 _id 집합을 반환합니다.
+        
+        files와 file_duplicate_checks를 각각 unordered bulk_write 한 번으로 업데이트합니다.
+        files를 먼저 기록해 검사 완료가 보이는 시점에 파일 상태도 반영되어 있도록 합니다.
+        files 기록에 실패한 요청은 완료 처리하지 않고 실패로 반환합니다.
+        """
+        if not results:
+            return set()
+        now = self.get_current_time()
+        failed = set()
+        
+        file_operations = []
+        file_checks = []
+        for check, is_duplicated in results:
+            if ObjectId.is_valid(check["file_id"]):
+                file_operations.append(UpdateOne(
+                    {"_id": ObjectId(check["file_id"])},
+                    {"$set": {"is_duplicated": is_duplicated}}
+                ))
+                file_checks.append(check)
+        if file_operations:
+            try:
+                await self.files_collection.bulk_write(file_operations, ordered=False)
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                logger.error(f"파일 중복 상태 일괄 업데이트 일부 실패: {write_errors}")
+                failed = {file_checks[error["index"]]["_id"] for error in write_errors}
+        
+        pending = [(check, is_duplicated) for check, is_duplicated in results if check["_id"] not in failed]
+        if not pending:
+            return failed
+        check_operations = [
+            UpdateOne(
+                {"_id": check["_id"]},
+                {
+                    "$set": {
+                        "is_completed": True,
+                        "is_duplicated": is_duplicated,
+                        "updated_at": now
+                    }
+                }
+            )
+            for check, is_duplicated in pending
+        ]
+        try:
+            await self.file_checks_collection.bulk_write(check_operations, ordered=False)
+        except BulkWriteError as e:
+            failed |= {pending[error["index"]][0]["_id"] for error in e.details.get("writeErrors", [])}
+        return failed
+    
+    async def update_file_duplicate_status(self, file_id: str, is_duplicated: bool):
         """파일의 중복 상태를 업데이트합니다."""
         try:
             file_obj_id = ObjectId(file_id)
-            result = self.files_collection.update_one(
+            return await self.files_collection.find_one_and_update(
                 {"_id": file_obj_id},
-                {"$set": {"is_duplicated": is_duplicated}}
+                {"$set": {"is_duplicated": is_duplicated}},
+                return_document=ReturnDocument.AFTER
             )
-            
-            if result.modified_count > 0:
-                return self.files_collection.find_one({"_id": file_obj_id})
-            return None
         except Exception as e:
             return None
     
-    def update_duplicate_check_result(self, request_id: str, is_duplicated: bool):
+    async def update_duplicate_check_result(self, request_id: str, is_duplicated: bool):
         """중복 검사 결과를 업데이트합니다."""
         try:
             now = self.get_current_time()
             request_obj_id = ObjectId(request_id)
             
-            result = self.file_checks_collection.update_one(
+            return await self.file_checks_collection.find_one_and_update(
                 {"_id": request_obj_id},
                 {
                     "$set": {
@@ -90,11 +258,8 @@ class FileDuplicateCheckRepository:
                         "is_duplicated": is_duplicated,
                         "updated_at": now
                     }
-                }
+                },
+                return_document=ReturnDocument.AFTER
             )
-            
-            if result.modified_count > 0:
-                return self.file_checks_collection.find_one({"_id": request_obj_id})
-            return None
         except Exception as e:
             return None 
\ No newline at end of file
@@ -0,0 +1,161 @@
+import os
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Optional
+from dotenv import load_dotenv
+
+from src.main.ai.data.OutboxRepository import OutboxRepository
+from src.main.ai.data.SQSBatchPublisher import SQSBatchPublisher, SQS_MAX_BATCH_SIZE
+
+load_dotenv()
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 릴레이 설정 (환경 변수로 조정 가능)
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "1"))
+OUTBOX_LEASE_SECONDS = float(os.getenv("OUTBOX_LEASE_SECONDS", "30"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "20"))
+
+
+class OutboxRelay:
+    """아웃박스에 쌓인 메시지를 배치로 SQS에 전달하는 백그라운드 태스크
+
+    메시지는 전송이 확인된 뒤에만 삭제되므로 최소 한 번(at-least-once) 전달되며,
+    FIFO 큐의 MessageDeduplicationId로 중복 전송이 걸러집니다.
+    """
+
+    def __init__(
+        self,
+        outbox: OutboxRepository,
+        publisher: SQSBatchPublisher,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_interval: float = OUTBOX_POLL_INTERVAL,
+        lease_seconds: float = OUTBOX_LEASE_SECONDS,
+        base_backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+    ):
+        self.outbox = outbox
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # 지표
+        self.messages_sent = 0
+        self.messages_retried = 0
+        self.messages_given_up = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """현재 이벤트 루프에서 릴레이 태스크를 시작합니다."""
+        if self.is_running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """릴레이 태스크를 멈춥니다. 선점 후 처리되지 않은 메시지는 선점 기간이 지나면 다시 전송됩니다."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def notify(self):
+        """새 메시지가 추가되었음을 알려 다음 폴링을 기다리지 않고 전송하게 합니다."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def get_backoff(self, attempts: int) -> float:
+        """attempts번째 실패 후 다음 시도까지 기다릴 시간(초)을 반환합니다."""
+        return min(self.max_backoff, self.base_backoff * (2 ** attempts))
+
+    async def relay_once(self) -> int:
+        """전송 대상 메시지를 한 번 선점해 전송하고, 처리한 메시지 수를 반환합니다."""
+        messages = await self.outbox.claim_messages(self.batch_size, self.lease_seconds)
+        if not messages:
+            return 0
+
+        chunks = [messages[i:i + SQS_MAX_BATCH_SIZE] for i in range(0, len(messages), SQS_MAX_BATCH_SIZE)]
+        chunk_results = await asyncio.gather(
+            *[self.publisher.send_batch([message["entry"] for message in chunk]) for chunk in chunks],
+            return_exceptions=True
+        )
+
+        sent_ids = []
+        failures = []
+        now = self.outbox.get_current_time()
+        for chunk, results in zip(chunks, chunk_results):
+            if isinstance(results, BaseException):
+                results = [results] * len(chunk)
+            for message, result in zip(chunk, results):
+                if isinstance(result, BaseException):
+                    failures.append(self._build_failure(message, result, now))
+                else:
+                    sent_ids.append(message["_id"])
+
+        await self.outbox.delete_messages(sent_ids)
+        await self.outbox.reschedule_messages(failures)
+
+        self.messages_sent += len(sent_ids)
+        for failure in failures:
+            if failure["give_up"]:
+                self.messages_given_up += 1
+                logger.error(f"아웃박스 메시지 전송 포기. outbox_id: {failure['_id']}, error: {failure['error']}")
+            else:
+                self.messages_retried += 1
+        return len(messages)
+
+    def stats(self) -> dict:
+        """현재 지표를 반환합니다."""
+        return {
+            "messages_sent": self.messages_sent,
+            "messages_retried": self.messages_retried,
+            "messages_given_up": self.messages_given_up,
+        }
+
+    def _build_failure(self, message: dict, error: BaseException, now) -> dict:
+        attempts = message.get("attempts", 0) + 1
+        return {
+            "_id": message["_id"],
+            "error": str(error),
+            "next_attempt_at": now + timedelta(seconds=self.get_backoff(attempts - 1)),
+            "give_up": attempts >= self.max_attempts
+        }
+
+    async def _run(self):
+        while True:
+            # 전송 중 들어온 알림을 놓치지 않도록 전송 전에 초기화
+            self._wakeup.clear()
+            try:
+                relayed = await self.relay_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"아웃박스 릴레이 실패: {e}")
+                relayed = 0
+
+            # 가득 찬 배치를 처리했다면 남은 메시지가 있을 수 있으므로 바로 다시 시도
+            if relayed >= self.batch_size:
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,112 @@
+import os
+from typing import List
+from datetime import datetime, timedelta, timezone
+from bson import ObjectId
+from dotenv import load_dotenv
+from pymongo import AsyncMongoClient, ASCENDING, UpdateOne
+
+load_dotenv()
+
+# 트랜잭션 사용 여부 (단일 노드 MongoDB 등 트랜잭션을 지원하지 않는 환경에서는 false)
+MONGODB_TRANSACTIONS_ENABLED = os.getenv("MONGODB_TRANSACTIONS_ENABLED", "true").lower() == "true"
+
+OUTBOX_STATUS_PENDING = "pending"
+OUTBOX_STATUS_FAILED = "failed"
+
+
+class OutboxRepository:
+    """SQS로 보낼 메시지를 요청 문서와 함께 저장하는 아웃박스 컬렉션 리포지토리"""
+
+    def __init__(self, client: AsyncMongoClient):
+        self.client = client
+        self.db = client.get_database()
+        self.collection = self.db.get_collection('outbox')
+
+    def get_current_time(self):
+        return datetime.now(timezone.utc)
+
+    async def run_in_transaction(self, callback):
+        """callback(session)을 하나의 트랜잭션으로 실행합니다.
+
+        트랜잭션이 비활성화된 경우 session 없이 callback을 실행합니다.
+        """
+        if not MONGODB_TRANSACTIONS_ENABLED:
+            return await callback(None)
+        async with self.client.start_session() as session:
+            return await session.with_transaction(callback)
+
+    async def add_messages(self, entries: List[dict], session=None) -> List[ObjectId]:
+        """SQS 메시지 엔트리를 아웃박스에 추가합니다."""
+        if not entries:
+            return []
+        now = self.get_current_time()
+        documents = [
+            {
+                "entry": entry,
+                "status": OUTBOX_STATUS_PENDING,
+                "attempts": 0,
+                "next_attempt_at": now,
+                "created_at": now
+            }
+            for entry in entries
+        ]
+        result = await self.collection.insert_many(documents, ordered=False, session=session)
+        return list(result.inserted_ids)
+
+    async def claim_messages(self, limit: int, lease_seconds: float) -> List[dict]:
+        """전송할 메시지를 최대 limit개 선점합니다.
+
+        선점한 메시지는 lease_seconds 동안 다른 릴레이가 가져가지 않으며,
+        그 안에 처리 결과가 기록되지 않으면 다시 전송 대상이 됩니다.
+        """
+        now = self.get_current_time()
+        due = {"status": OUTBOX_STATUS_PENDING, "next_attempt_at": {"$lte": now}}
+        candidates = await self.collection.find(due, {"_id": 1}) \
+            .sort("next_attempt_at", ASCENDING) \
+            .limit(limit) \
+            .to_list()
+        ids = [candidate["_id"] for candidate in candidates]
+        if not ids:
+            return []
+
+        claim_id = ObjectId()
+        await self.collection.update_many(
+            {"_id": {"$in": ids}, **due},
+            {"$set": {"next_attempt_at": now + timedelta(seconds=lease_seconds), "claim_id": claim_id}}
+        )
+        return await self.collection.find({"_id": {"$in": ids}, "claim_id": claim_id}) \
+            .sort("created_at", ASCENDING) \
+            .to_list()
+
+    async def delete_messages(self, ids: List[ObjectId]) -> int:
+        """전송이 끝난 메시지를 삭제합니다."""
+        if not ids:
+            return 0
+        result = await self.collection.delete_many({"_id": {"$in": ids}})
+        return result.deleted_count
+
+    async def reschedule_messages(self, failures: List[dict]) -> int:
+        """전송에 실패한 메시지의 다음 시도 시각을 기록합니다.
+
+        failures의 각 항목은 _id, error, next_attempt_at, give_up 키를 가집니다.
+        give_up이 참이면 더 이상 재시도하지 않도록 failed 상태로 바꿉니다.
+        """
+        if not failures:
+            return 0
+        now = self.get_current_time()
+        operations = []
+        for failure in failures:
+            update = {
+                "$set": {
+                    "last_error": failure["error"],
+                    "next_attempt_at": failure["next_attempt_at"],
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1},
+                "$unset": {"claim_id": ""}
+            }
+            if failure.get("give_up"):
+                update["$set"]["status"] = OUTBOX_STATUS_FAILED
+            operations.append(UpdateOne({"_id": failure["_id"]}, update))
+        result = await self.collection.bulk_write(operations, ordered=False)
+        return result.modified_count
@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+from src.main.config.executor import BoundedExecutor
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# SQS SendMessageBatch 한 번에 보낼 수 있는 최대 메시지 수
+SQS_MAX_BATCH_SIZE = 10
+
+
+class SQSBatchEntryError(Exception):
+    """배치 전송 중 개별 메시지가 실패했을 때 발생하는 예외"""
+
+    def __init__(self, code: str, message: str, sender_fault: bool = False):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.message = message
+        self.sender_fault = sender_fault
+
+
+class SQSBatchPublisher:
+    """여러 메시지를 SendMessageBatch 한 번으로 전송하는 퍼블리셔
+
+    아웃박스 릴레이가 최대 SQS_MAX_BATCH_SIZE개씩 묶어 호출하며,
+    엔트리별 MessageId 또는 SQSBatchEntryError를 돌려줍니다.
+    """
+
+    def __init__(self, sqs_client, queue_url: str, executor: Optional[BoundedExecutor] = None):
+        self.sqs_client = sqs_client
+        self.queue_url = queue_url
+        self.executor = executor
+
+        # 지표
+        self.batches_sent = 0
+        self.messages_sent = 0
+        self.messages_failed = 0
+
+    async def send_batch(self, entries: List[dict]) -> List[dict]:
+        """엔트리를 SendMessageBatch로 전송하고 엔트리별 결과를 순서대로 반환합니다.
+
+        성공한 엔트리는 {"MessageId": ...}, 실패한 엔트리는 SQSBatchEntryError입니다.
+        """
+        request_entries = [{"Id": str(index), **entry} for index, entry in enumerate(entries)]
+        if self.executor is None:
+            response = await asyncio.to_thread(self._send_message_batch, request_entries)
+        else:
+            response = await self.executor.run(self._send_message_batch, request_entries)
+
+        results: List = [None] * len(entries)
+        for success in response.get("Successful", []):
+            results[int(success["Id"])] = {"MessageId": success["MessageId"]}
+        for failure in response.get("Failed", []):
+            results[int(failure["Id"])] = SQSBatchEntryError(
+                code=failure.get("Code", "Unknown"),
+                message=failure.get("Message", ""),
+                sender_fault=failure.get("SenderFault", False),
+            )
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = SQSBatchEntryError(code="MissingResult", message="배치 응답에 결과가 없습니다.")
+
+        self.batches_sent += 1
+        for result in results:
+            if isinstance(result, SQSBatchEntryError):
+                self.messages_failed += 1
+            else:
+                self.messages_sent += 1
+        return results
+
+    def stats(self) -> dict:
+        """현재 지표를 반환합니다."""
+        return {
+            "batches_sent": self.batches_sent,
+            "messages_sent": self.messages_sent,
+            "messages_failed": self.messages_failed,
+        }
+
+    def _send_message_batch(self, entries: List[dict]) -> dict:
+        return self.sqs_client.send_message_batch(QueueUrl=self.queue_url, Entries=entries)
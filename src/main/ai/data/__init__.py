@@ -2,3 +2,6 @@ from src.main.ai.data.CategoryRecommendationRepository import CategoryRecommenda
 from src.main.ai.data.CategoryRecommendationQueue import CategoryRecommendationQueue
 from src.main.ai.data.FileDuplicateCheckRepository import FileDuplicateCheckRepository
 from src.main.ai.data.FileDuplicateCheckQueue import FileDuplicateCheckQueue
+from src.main.ai.data.SQSBatchPublisher import SQSBatchPublisher
+from src.main.ai.data.OutboxRepository import OutboxRepository
+from src.main.ai.data.OutboxRelay import OutboxRelay
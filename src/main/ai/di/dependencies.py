@@ -1,5 +1,5 @@
 import os
-import boto3
+from functools import lru_cache
 from dotenv import load_dotenv
 
 from src.main.ai.data.CategoryRecommendationRepository import CategoryRecommendationRepository
@@ -8,52 +8,137 @@ from src.main.ai.data.CategoryRecommendationQueue import CategoryRecommendationQ
 from src.main.ai.data.FileDuplicateCheckRepository import FileDuplicateCheckRepository
 from src.main.ai.service.FileDuplicateCheckService import FileDuplicateCheckService
 from src.main.ai.data.FileDuplicateCheckQueue import FileDuplicateCheckQueue
+from src.main.ai.data.SQSBatchPublisher import SQSBatchPublisher
+from src.main.ai.data.OutboxRepository import OutboxRepository
+from src.main.ai.data.OutboxRelay import OutboxRelay
+from src.main.ai.notification.NotificationHub import NotificationHub
+from src.main.ai.notification.ChangeStreamFeed import ChangeStreamFeed
+from src.main.ai.similarity.SimilarityEngine import SimilarityEngine
 from src.main.config.mongodb import get_mongo_client
+from src.main.config.cache import create_status_cache, STATUS_CACHE_ENABLED
+from src.main.config.similarity import create_embedding_index, SIMILARITY_ENABLED
+from src.main.config.sqs import get_sqs_client, get_sqs_executor
 
 load_dotenv()
 
 
+@lru_cache
+def get_sqs_batch_publisher():
+    queue_url = os.getenv('SQS_REQUEST_QUEUE_URL')
+    return SQSBatchPublisher(get_sqs_client(), queue_url, get_sqs_executor())
+
+
+@lru_cache
+def get_outbox_repository():
+    client = get_mongo_client()
+    return OutboxRepository(client)
+
+
+@lru_cache
+def get_outbox_relay():
+    return OutboxRelay(get_outbox_repository(), get_sqs_batch_publisher())
+
+
+@lru_cache
+def get_notification_hub():
+    return NotificationHub()
+
+
+@lru_cache
+def get_status_cache():
+    # STATUS_CACHE_BACKEND에 따라 태스크별 캐시 또는 공유 Redis 캐시
+    return create_status_cache()
+
+
+def get_optional_status_cache():
+    # 완료된 작업 상태를 캐시할지 여부
+    return get_status_cache() if STATUS_CACHE_ENABLED else None
+
+
+@lru_cache
+def get_similarity_engine():
+    # SIMILARITY_INDEX_PATH에 따라 디스크 인덱스 또는 메모리 인덱스 사용
+    return SimilarityEngine(create_embedding_index())
+
+
+def get_optional_similarity_engine():
+    # 임베딩이 있는 파일을 프록시에서 바로 판정할지 여부
+    return get_similarity_engine() if SIMILARITY_ENABLED else None
+
+
+@lru_cache
+def get_change_stream_feed():
+    # 다른 인스턴스가 처리한 결과도 구독자에게 전달
+    client = get_mongo_client()
+    return ChangeStreamFeed(
+        client.get_database(),
+        get_notification_hub(),
+        {
+            "category_recommendations": CategoryRecommendationService.completion_events,
+            "file_duplicate_checks": FileDuplicateCheckService.completion_events,
+        }
+    )
+
+
+@lru_cache
 def get_category_recommendation_repository():
     client = get_mongo_client()
     return CategoryRecommendationRepository(client)
 
 
+@lru_cache
 def get_category_recommendation_queue():
-    if os.getenv('ENV') == 'local':
-        aws_profile = os.getenv('AWS_PROFILE', 'default')
-        session = boto3.Session(profile_name=aws_profile)
-        sqs_client = session.client('sqs')
-    else:
-        sqs_client = boto3.client('sqs', region_name=os.getenv('AWS_REGION'))
-
-    queue_url = os.getenv('SQS_REQUEST_QUEUE_URL')
-    return CategoryRecommendationQueue(sqs_client, queue_url)
+    return CategoryRecommendationQueue()
 
 
 def get_category_recommendation_service():
     repository = get_category_recommendation_repository()
     queue = get_category_recommendation_queue()
-    return CategoryRecommendationService(repository, queue)
+    return CategoryRecommendationService(
+        repository,
+        queue,
+        get_outbox_repository(),
+        get_outbox_relay(),
+        get_notification_hub(),
+        get_optional_status_cache()
+    )
 
 
+@lru_cache
 def get_file_duplicate_check_repository():
     client = get_mongo_client()
     return FileDuplicateCheckRepository(client)
 
 
+@lru_cache
 def get_file_duplicate_check_queue():
-    if os.getenv('ENV') == 'local':
-        aws_profile = os.getenv('AWS_PROFILE', 'default')
-        session = boto3.Session(profile_name=aws_profile)
-        sqs_client = session.client('sqs')
-    else:
-        sqs_client = boto3.client('sqs', region_name=os.getenv('AWS_REGION'))
-
-    queue_url = os.getenv('SQS_REQUEST_QUEUE_URL')
-    return FileDuplicateCheckQueue(sqs_client, queue_url)
+    return FileDuplicateCheckQueue()
 
 
 def get_file_duplicate_check_service():
     repository = get_file_duplicate_check_repository()
     queue = get_file_duplicate_check_queue()
-    return FileDuplicateCheckService(repository, queue)
+    return FileDuplicateCheckService(
+        repository,
+        queue,
+        get_outbox_repository(),
+        get_outbox_relay(),
+        get_notification_hub(),
+        get_optional_status_cache(),
+        get_optional_similarity_engine()
+    )
+
+
+def reset_dependencies():
+    """캐시된 의존성 객체를 비웁니다. 공유 클라이언트를 닫을 때 함께 호출됩니다."""
+    get_sqs_batch_publisher.cache_clear()
+    get_outbox_repository.cache_clear()
+    get_outbox_relay.cache_clear()
+    get_notification_hub.cache_clear()
+    get_status_cache.cache_clear()
+    get_similarity_engine.cache_clear()
+    get_change_stream_feed.cache_clear()
+    get_category_recommendation_repository.cache_clear()
+    get_category_recommendation_queue.cache_clear()
+    get_file_duplicate_check_repository.cache_clear()
+    get_file_duplicate_check_queue.cache_clear()
@@ -0,0 +1,27 @@
+from pydantic import BaseModel
+from typing import List, Literal, Union
+
+from src.main.ai.models.CategoryRecommendation import CategoryRecommendationStatusResponse
+from src.main.ai.models.FileDuplicateCheck import FileDuplicateCheckStatusResponse
+
+AI_JOB_CATEGORY_RECOMMENDATION = "category_recommendation"
+AI_JOB_FILE_DUPLICATE_CHECK = "file_duplicate_check"
+
+
+class AIJobCompletedEvent(BaseModel):
+    """AI 작업 완료 이벤트 모델"""
+    type: Literal["category_recommendation", "file_duplicate_check"]
+    result: Union[CategoryRecommendationStatusResponse, FileDuplicateCheckStatusResponse]
+
+
+class AIPendingJobsEvent(BaseModel):
+    """연결 시점에 진행 중인 AI 작업 목록 모델"""
+    type: Literal["pending"] = "pending"
+    category_recommendations: List[CategoryRecommendationStatusResponse]
+    file_duplicate_checks: List[FileDuplicateCheckStatusResponse]
+
+
+class AIJobEventsDroppedEvent(BaseModel):
+    """수신이 느려 버려진 이벤트 수 알림 모델. 받으면 진행 중인 작업을 다시 조회해야 합니다."""
+    type: Literal["events_dropped"] = "events_dropped"
+    count: int
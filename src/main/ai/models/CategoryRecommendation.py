@@ -1,16 +1,28 @@
 from pydantic import BaseModel, Field
 import uuid
-from typing import Optional
+from typing import List, Optional
 
 
 class CategoryRecommendationRequest(BaseModel):
     file_id: str
 
 
+# 한 번에 요청할 수 있는 최대 파일 수
+CATEGORY_RECOMMENDATION_BULK_MAX_SIZE = 500
+
+
+class CategoryRecommendationBulkRequest(BaseModel):
+    file_ids: List[str] = Field(min_length=1, max_length=CATEGORY_RECOMMENDATION_BULK_MAX_SIZE)
+
+
 class CategoryRecommendationResponse(BaseModel):
     request_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
 
 
+class CategoryRecommendationBulkResponse(BaseModel):
+    request_ids: List[str]
+
+
 class CategoryRecommendationStatusResponse(BaseModel):
     request_id: str
     is_completed: bool
@@ -19,4 +31,17 @@ class CategoryRecommendationStatusResponse(BaseModel):
 
 class CategoryRecommendationResultRequest(BaseModel):
     request_id: Optional[str] = None
-    predicted_category: str 
\ No newline at end of file
+    predicted_category: str
+
+
+class CategoryRecommendationResultBatchRequest(BaseModel):
+    results: List[CategoryRecommendationResultRequest] = Field(min_length=1, max_length=CATEGORY_RECOMMENDATION_BULK_MAX_SIZE)
+
+
+class CategoryRecommendationResultItemResponse(BaseModel):
+    request_id: Optional[str] = None
+    success: bool
+
+
+class CategoryRecommendationResultBatchResponse(BaseModel):
+    results: List[CategoryRecommendationResultItemResponse] 
\ No newline at end of file
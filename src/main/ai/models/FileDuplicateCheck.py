@@ -2,6 +2,11 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
+# 임베딩 한 개의 최대 차원 수
+FILE_EMBEDDING_MAX_DIMENSIONS = 4096
+# 파일 내용 해시 형식 (SHA-256, 소문자 16진수)
+FILE_CONTENT_HASH_PATTERN = r"^[0-9a-f]{64}$"
+
 
 class FileDuplicateCheckRequest(BaseModel):
     """파일 중복 검사 요청 모델"""
@@ -10,8 +15,10 @@ class FileDuplicateCheckRequest(BaseModel):
 
 
 class FileDuplicateCheckResponse(BaseModel):
-    """파일 중복 검사 응답 모델"""
+    """파일 중복 검사 응답 모델. 프록시에서 바로 판정한 경우에만 결과를 함께 반환합니다."""
     request_id: str
+    is_completed: Optional[bool] = None
+    is_duplicated: Optional[bool] = None
 
 
 class FileDuplicateCheckStatusResponse(BaseModel):
@@ -28,7 +35,32 @@ class FileDuplicateCheckResultRequest(BaseModel):
     is_duplicated: bool
 
 
+class FileDuplicateCheckResultBatchRequest(BaseModel):
+    """파일 중복 검사 결과 일괄 요청 모델"""
+    results: List[FileDuplicateCheckResultRequest] = Field(min_length=1, max_length=500)
+
+
+class FileDuplicateCheckResultItemResponse(BaseModel):
+    """파일 중복 검사 결과 일괄 요청의 항목별 응답 모델"""
+    request_id: str
+    success: bool
+    result: Optional[FileDuplicateCheckStatusResponse] = None
+
+
+class FileDuplicateCheckResultBatchResponse(BaseModel):
+    """파일 중복 검사 결과 일괄 응답 모델"""
+    results: List[FileDuplicateCheckResultItemResponse]
+
+
 class FileDuplicateCheckEmbeddingsRequest(BaseModel):
     """파일 임베딩 저장 요청 모델"""
     file_id: str
-    embeddings: List[float] 
\ No newline at end of file
+    embeddings: List[float] = Field(min_length=1, max_length=FILE_EMBEDDING_MAX_DIMENSIONS)
+    # 워커가 파일을 내려받으며 계산한 내용 해시. files에 해시가 없는 파일을 채울 때 사용
+    sha256: Optional[str] = Field(default=None, pattern=FILE_CONTENT_HASH_PATTERN)
+
+
+class FileEmbeddingResponse(BaseModel):
+    """파일 임베딩 저장 응답 모델"""
+    file_id: str
+    dimensions: int
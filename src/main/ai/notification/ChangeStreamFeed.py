@@ -0,0 +1,94 @@
+import asyncio
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from pymongo.errors import OperationFailure, PyMongoError
+
+from src.main.ai.notification.NotificationHub import NotificationHub
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 완료 상태로 바뀐 문서만 받도록 하는 change stream 파이프라인
+COMPLETED_CHANGES_PIPELINE = [
+    {
+        "$match": {
+            "operationType": {"$in": ["update", "replace"]},
+            "fullDocument.is_completed": True
+        }
+    }
+]
+
+
+class ChangeStreamFeed:
+    """MongoDB change stream을 구독해 완료된 작업을 NotificationHub에 발행합니다.
+
+    여러 인스턴스가 떠 있을 때 다른 인스턴스가 처리한 워커 결과도
+    이 인스턴스의 구독자에게 전달되도록 합니다.
+    handlers는 컬렉션 이름별로 변경된 문서를 (topic, event) 목록으로 바꾸는 함수입니다.
+    """
+
+    def __init__(
+        self,
+        db,
+        hub: NotificationHub,
+        handlers: Dict[str, Callable[[dict], Iterable[Tuple]]],
+        retry_interval: float = 5.0,
+    ):
+        self.db = db
+        self.hub = hub
+        self.handlers = handlers
+        self.retry_interval = retry_interval
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """컬렉션별 change stream 구독 태스크를 시작합니다."""
+        if self._tasks:
+            return
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._watch(collection_name, handler))
+            for collection_name, handler in self.handlers.items()
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def dispatch(self, collection_name: str, change: dict) -> int:
+        """change 이벤트 하나를 허브에 발행하고 발행한 이벤트 수를 반환합니다."""
+        document = change.get("fullDocument")
+        if not document:
+            return 0
+        published = 0
+        # 이 인스턴스가 이미 발행한 완료는 허브가 요청 _id로 걸러냄
+        for topic, event in self.handlers[collection_name](document):
+            self.hub.publish(topic, event, key=str(document["_id"]))
+            published += 1
+        return published
+
+    async def _watch(self, collection_name: str, handler):
+        collection = self.db.get_collection(collection_name)
+        resume_token: Optional[dict] = None
+        while True:
+            try:
+                async with await collection.watch(
+                    COMPLETED_CHANGES_PIPELINE,
+                    full_document="updateLookup",
+                    resume_after=resume_token
+                ) as stream:
+                    logger.info(f"change stream 구독 시작. collection: {collection_name}")
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        self.dispatch(collection_name, change)
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as e:
+                # 재개 토큰이 만료된 경우 등은 현재 시점부터 다시 구독
+                logger.error(f"change stream 오류. collection: {collection_name}, error: {e}")
+                resume_token = None
+                await asyncio.sleep(self.retry_interval)
+            except PyMongoError as e:
+                logger.error(f"change stream 오류. collection: {collection_name}, error: {e}")
+                await asyncio.sleep(self.retry_interval)
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Hashable, Optional
+
+from src.main.config.cache import TTLCache
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+def category_recommendation_topic(request_id: str) -> tuple:
+    """카테고리 추천 요청 하나의 완료 이벤트 토픽"""
+    return ("category_recommendation", str(request_id))
+
+
+def file_duplicate_check_topic(file_id: str, user_id: str) -> tuple:
+    """파일 하나에 대한 사용자의 중복 검사 완료 이벤트 토픽"""
+    return ("file_duplicate_check", str(file_id), str(user_id))
+
+
+def user_jobs_topic(user_id: str) -> tuple:
+    """사용자의 모든 AI 작업 완료 이벤트 토픽"""
+    return ("user_jobs", str(user_id))
+
+
+class Subscription:
+    """NotificationHub 토픽 구독. 받은 이벤트는 내부 큐에 쌓입니다."""
+
+    def __init__(self, hub: "NotificationHub", topic: Hashable, max_queue_size: int):
+        self.hub = hub
+        self.topic = topic
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.closed = False
+        # 큐가 가득 차 버려진 이벤트 수
+        self.dropped = 0
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """다음 이벤트를 기다립니다. timeout이 지나면 None을 반환합니다."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.hub.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class NotificationHub:
+    """토픽별 구독자에게 이벤트를 전달하는 프로세스 내 알림 허브
+
+    워커 결과 콜백이 처리되면 이벤트를 발행하고, SSE 등 대기 중인 요청이 이를 받아
+    폴링 없이 응답합니다. 이벤트 루프 안에서만 사용합니다.
+    같은 완료를 로컬 처리와 change stream이 모두 발행하므로, key를 준 이벤트는
+    dedupe_ttl 동안 같은 (topic, key)를 한 번만 전달합니다.
+    """
+
+    def __init__(self, max_queue_size: int = 100, dedupe_ttl: float = 60, dedupe_max_size: int = 10000):
+        self.max_queue_size = max_queue_size
+        self._subscriptions: dict = defaultdict(set)
+        self._recent = TTLCache(dedupe_max_size, dedupe_ttl)
+
+        # 지표
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.duplicates = 0
+
+    def subscribe(self, topic: Hashable, max_queue_size: Optional[int] = None) -> Subscription:
+        """토픽을 구독합니다. 사용이 끝나면 close()를 호출해야 합니다."""
+        subscription = Subscription(self, topic, max_queue_size or self.max_queue_size)
+        self._subscriptions[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscriptions.get(subscription.topic)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.topic]
+
+    def publish(self, topic: Hashable, event: Any, key: Optional[Hashable] = None) -> int:
+        """토픽 구독자 모두에게 이벤트를 전달하고 전달한 구독자 수를 반환합니다.
+
+        구독자의 큐가 가득 차 있으면 해당 구독자에게는 이벤트를 버립니다.
+        key(예: 작업 요청 ID)를 주면 최근에 같은 (topic, key)로 발행한 이벤트는 다시 전달하지 않고 0을 반환합니다.
+        """
+        if key is not None:
+            if self._recent.get((topic, key)) is not None:
+                self.duplicates += 1
+                return 0
+            self._recent.set((topic, key), True)
+        self.published += 1
+        delivered = 0
+        for subscription in list(self._subscriptions.get(topic, ())):
+            try:
+                subscription.queue.put_nowait(event)
+                delivered += 1
+            except asyncio.QueueFull:
+                subscription.dropped += 1
+                self.dropped += 1
+                logger.warning(f"구독자 큐가 가득 차 이벤트를 버립니다. topic: {topic}")
+        self.delivered += delivered
+        return delivered
+
+    def stats(self) -> dict:
+        """현재 지표를 반환합니다."""
+        return {
+            "topics": len(self._subscriptions),
+            "subscriptions": sum(len(subscriptions) for subscriptions in self._subscriptions.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "duplicates": self.duplicates,
+        }
@@ -0,0 +1,2 @@
+from src.main.ai.notification.NotificationHub import NotificationHub, Subscription
+from src.main.ai.notification.ChangeStreamFeed import ChangeStreamFeed
@@ -2,9 +2,23 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 
 from src.main.ai.di.dependencies import get_category_recommendation_service, get_file_duplicate_check_service
-from src.main.ai.models.CategoryRecommendation import CategoryRecommendationResultRequest, CategoryRecommendationStatusResponse
+from src.main.ai.models.CategoryRecommendation import (
+    CategoryRecommendationResultRequest,
+    CategoryRecommendationResultBatchRequest,
+    CategoryRecommendationResultBatchResponse,
+    CategoryRecommendationStatusResponse
+)
 from src.main.ai.service.CategoryRecommendationService import CategoryRecommendationService
-from src.main.ai.models.FileDuplicateCheck import FileDuplicateCheckStatusResponse, FileDuplicateCheckEmbeddingsRequest, FileDuplicateCheckRequest, FileDuplicateCheckResponse, FileDuplicateCheckResultRequest
+from src.main.ai.models.FileDuplicateCheck import (
+    FileDuplicateCheckStatusResponse,
+    FileDuplicateCheckEmbeddingsRequest,
+    FileDuplicateCheckRequest,
+    FileDuplicateCheckResponse,
+    FileDuplicateCheckResultRequest,
+    FileDuplicateCheckResultBatchRequest,
+    FileDuplicateCheckResultBatchResponse,
+    FileEmbeddingResponse
+)
 from src.main.ai.service.FileDuplicateCheckService import FileDuplicateCheckService
 
 
@@ -19,7 +33,7 @@ async def update_category_recommendation_result(
     request: CategoryRecommendationResultRequest,
     service: CategoryRecommendationService = Depends(get_category_recommendation_service)
 ):
-    result = service.update_recommendation_result(request.request_id, request)
+    result = await service.update_recommendation_result(request.request_id, request)
     
     if not result:
         return JSONResponse(
@@ -32,21 +46,34 @@ async def update_category_recommendation_result(
     return {"success": True}
 
 
-@router.post("/file-duplicate-checks", response_model=FileDuplicateCheckResponse)
+@router.post("/category-recommendation-results/batch", response_model=CategoryRecommendationResultBatchResponse)
+async def update_category_recommendation_results(
+    request: CategoryRecommendationResultBatchRequest,
+    service: CategoryRecommendationService = Depends(get_category_recommendation_service)
+):
+    """
+    여러 추천 카테고리 결과 일괄 기록. 항목별 성공 여부를 요청 순서대로 반환합니다.
+    """
+    return await service.update_recommendation_results(request)
+
+
+@router.post("/file-duplicate-checks", response_model=FileDuplicateCheckResponse, response_model_exclude_none=True)
 async def create_file_duplicate_check(
     request: FileDuplicateCheckRequest,
     service: FileDuplicateCheckService = Depends(get_file_duplicate_check_service)
 ):
-    result = service.create_duplicate_check_request(request)
+    result = await service.create_duplicate_check_request(request)
     return result
 
 
-@router.post("/file-duplicate-check-embeddings", response_model=dict)
+@router.post("/file-duplicate-check-results", response_model=dict)
+# 기존 워커 호환을 위한 경로. 임베딩 저장은 /file-embeddings를 사용합니다.
+@router.post("/file-duplicate-check-embeddings", response_model=dict, deprecated=True)
 async def update_file_duplicate_check_result(
     request: FileDuplicateCheckResultRequest,
     service: FileDuplicateCheckService = Depends(get_file_duplicate_check_service)
 ):
-    result = service.update_duplicate_check_result(request.request_id, request.is_duplicated)
+    result = await service.update_duplicate_check_result(request.request_id, request.is_duplicated)
     
     if not result:
         return JSONResponse(
@@ -59,7 +86,7 @@ async def update_file_duplicate_check_result(
         )
     
     # 요청 정보 조회
-    check = service.repository.get_duplicate_check_by_id(request.request_id)
+    check = await service.repository.get_duplicate_check_by_id(request.request_id)
     
     return {
         "request_id": request.request_id,
@@ -67,3 +94,25 @@ async def update_file_duplicate_check_result(
         "is_completed": check["is_completed"],
         "is_duplicated": check["is_duplicated"]
     }
+
+
+@router.post("/file-duplicate-check-results/batch", response_model=FileDuplicateCheckResultBatchResponse)
+async def update_file_duplicate_check_results(
+    request: FileDuplicateCheckResultBatchRequest,
+    service: FileDuplicateCheckService = Depends(get_file_duplicate_check_service)
+):
+    """
+    여러 파일 중복 검사 결과 일괄 기록. 항목별 결과를 요청 순서대로 반환합니다.
+    """
+    return await service.update_duplicate_check_results(request)
+
+
+@router.post("/file-embeddings", response_model=FileEmbeddingResponse)
+async def save_file_embedding(
+    request: FileDuplicateCheckEmbeddingsRequest,
+    service: FileDuplicateCheckService = Depends(get_file_duplicate_check_service)
+):
+    """
+    파일 임베딩 저장. float32 바이너리로 저장하며 이미 있으면 덮어씁니다.
+    """
+    return await service.save_file_embedding(request)
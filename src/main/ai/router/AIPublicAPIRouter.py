@@ -1,13 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from dotenv import load_dotenv
+from typing import Dict, List, Optional
+import os
+import asyncio
 import uuid
 
 from src.main.auth.dependencies import get_current_user
-from src.main.ai.di.dependencies import get_category_recommendation_service, get_file_duplicate_check_service
-from src.main.ai.models.CategoryRecommendation import CategoryRecommendationRequest, CategoryRecommendationResponse, CategoryRecommendationStatusResponse
+from src.main.ai.di.dependencies import (
+    get_category_recommendation_service,
+    get_file_duplicate_check_service,
+    get_notification_hub
+)
+from src.main.ai.models.CategoryRecommendation import (
+    CategoryRecommendationRequest,
+    CategoryRecommendationResponse,
+    CategoryRecommendationBulkRequest,
+    CategoryRecommendationBulkResponse,
+    CategoryRecommendationStatusResponse
+)
 from src.main.ai.service.CategoryRecommendationService import CategoryRecommendationService
 from src.main.ai.models.FileDuplicateCheck import FileDuplicateCheckStatusResponse
 from src.main.ai.service.FileDuplicateCheckService import FileDuplicateCheckService
+from src.main.ai.models.AIJobEvent import AIPendingJobsEvent, AIJobEventsDroppedEvent
+from src.main.ai.notification.NotificationHub import NotificationHub, Subscription, user_jobs_topic
+
+load_dotenv()
+
+# SSE 연결 설정 (환경 변수로 조정 가능)
+SSE_KEEPALIVE_INTERVAL = float(os.getenv("SSE_KEEPALIVE_INTERVAL", "15"))
+SSE_MAX_DURATION = float(os.getenv("SSE_MAX_DURATION", "300"))
+
+# long polling 최대 대기 시간(초)
+LONG_POLL_MAX_WAIT = float(os.getenv("LONG_POLL_MAX_WAIT", "30"))
 
+# 일괄 상태 조회 시 한 번에 조회할 수 있는 최대 ID 수
+STATUS_LOOKUP_MAX_SIZE = 500
+
+# 사용자 작업 WebSocket 설정
+# 전송 대기 이벤트가 WS_MAX_QUEUE_SIZE를 넘으면 버리고, 한 메시지 전송이 WS_SEND_TIMEOUT을 넘으면 연결을 닫습니다.
+WS_MAX_QUEUE_SIZE = int(os.getenv("WS_MAX_QUEUE_SIZE", "100"))
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "10"))
+WS_PENDING_JOBS_LIMIT = int(os.getenv("WS_PENDING_JOBS_LIMIT", "100"))
 
 router = APIRouter(
     prefix="/ai",
@@ -24,7 +59,35 @@ async def create_category_recommendation_request(
     """
     업로드한 파일에 따른 추천 카테고리 요청
     """
-    return service.create_recommendation_request(request, user_id)
+    return await service.create_recommendation_request(request, user_id)
+
+
+@router.post("/category-recommendations/bulk", response_model=CategoryRecommendationBulkResponse)
+async def create_category_recommendation_requests(
+    request: CategoryRecommendationBulkRequest,
+    user_id: uuid.UUID = Depends(get_current_user),
+    service: CategoryRecommendationService = Depends(get_category_recommendation_service)
+):
+    """
+    업로드한 여러 파일에 따른 추천 카테고리 일괄 요청
+    
+    request_ids는 file_ids와 같은 순서로 반환됩니다.
+    """
+    return await service.create_recommendation_requests(request, user_id)
+
+
+@router.get("/category-recommendations/statuses", response_model=Dict[str, CategoryRecommendationStatusResponse])
+async def get_category_recommendation_statuses(
+    request_ids: List[str] = Query(min_length=1, max_length=STATUS_LOOKUP_MAX_SIZE),
+    user_id: uuid.UUID = Depends(get_current_user),
+    service: CategoryRecommendationService = Depends(get_category_recommendation_service)
+):
+    """
+    여러 추천 카테고리 요청의 상태 일괄 조회
+    
+    request_id별 상태를 반환하며, 존재하지 않는 ID는 결과에서 빠집니다.
+    """
+    return await service.get_recommendation_statuses(request_ids, user_id)
 
 
 @router.get("/category-recommendations/{request_id}", response_model=CategoryRecommendationStatusResponse)
@@ -36,7 +99,7 @@ async def get_category_recommendation_status(
     """
     업로드한 파일에 따른 추천 카테고리 조회
     """
-    result = service.get_recommendation_status(request_id, user_id)
+    result = await service.get_recommendation_status(request_id, user_id)
     
     if not result:
         raise HTTPException(
@@ -47,16 +110,102 @@ async def get_category_recommendation_status(
     return result
 
 
+def format_sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def stream_recommendation_status(
+    request: Request,
+    current: CategoryRecommendationStatusResponse,
+    subscription: Optional[Subscription]
+):
+    """현재 상태를 보낸 뒤 완료 알림이 오면 보내고 스트림을 닫습니다.
+
+    프록시가 연결을 끊지 않도록 주기적으로 keep-alive 주석을 보내며,
+    SSE_MAX_DURATION이 지나면 timeout 이벤트를 보내고 닫습니다. 클라이언트는 재연결하면 됩니다.
+    """
+    try:
+        yield format_sse("status", current.model_dump_json())
+        if subscription is None:
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + SSE_MAX_DURATION
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                yield format_sse("timeout", "{}")
+                return
+
+            event = await subscription.get(timeout=min(SSE_KEEPALIVE_INTERVAL, remaining))
+            if await request.is_disconnected():
+                return
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+
+            yield format_sse("status", event.model_dump_json())
+            if event.is_completed:
+                return
+    finally:
+        if subscription is not None:
+            subscription.close()
+
+
+@router.get("/category-recommendations/{request_id}/events")
+async def stream_category_recommendation_status(
+    request_id: str,
+    request: Request,
+    user_id: uuid.UUID = Depends(get_current_user),
+    service: CategoryRecommendationService = Depends(get_category_recommendation_service)
+):
+    """
+    추천 카테고리 완료 이벤트 구독 (Server-Sent Events)
+    """
+    current, subscription = await service.subscribe_recommendation_status(request_id, user_id)
+
+    if not current:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="요청을 찾을 수 없습니다. 존재하지 않는 ID입니다."
+        )
+
+    return StreamingResponse(
+        stream_recommendation_status(request, current, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # 스트림이 시작되기 전에 연결이 끊겨도 구독이 남지 않도록 정리
+        background=BackgroundTask(subscription.close) if subscription is not None else None
+    )
+
+
+@router.get("/file-duplicate-checks/statuses", response_model=Dict[str, FileDuplicateCheckStatusResponse])
+async def get_file_duplicate_check_statuses(
+    file_ids: List[str] = Query(min_length=1, max_length=STATUS_LOOKUP_MAX_SIZE),
+    user_id: uuid.UUID = Depends(get_current_user),
+    service: FileDuplicateCheckService = Depends(get_file_duplicate_check_service)
+):
+    """
+    여러 파일의 중복 검사 결과 일괄 조회
+    
+    file_id별 상태를 반환하며, 요청이 없는 파일은 결과에서 빠집니다.
+    """
+    return await service.get_duplicate_check_statuses(file_ids, str(user_id))
+
+
 @router.get("/file-duplicate-checks", response_model=FileDuplicateCheckStatusResponse)
 async def get_file_duplicate_check_status(
     file_id: str,
+    wait: float = Query(0, ge=0, le=LONG_POLL_MAX_WAIT, description="검사가 끝날 때까지 기다릴 최대 시간(초)"),
     user_id: uuid.UUID = Depends(get_current_user),
     service: FileDuplicateCheckService = Depends(get_file_duplicate_check_service)
 ):
     """
     파일 중복 검사 결과 조회
+    
+    wait를 지정하면 검사가 끝나거나 wait초가 지날 때까지 응답을 보류합니다 (long polling).
     """
-    result = service.get_duplicate_check_status(file_id, str(user_id))
+    result = await service.get_duplicate_check_status(file_id, str(user_id), wait=wait)
     
     if not result:
         raise HTTPException(
@@ -65,3 +214,65 @@ async def get_file_duplicate_check_status(
         )
         
     return result
+
+
+async def receive_until_disconnect(websocket: WebSocket):
+    """클라이언트가 연결을 끊을 때까지 수신 메시지를 버립니다."""
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+async def send_user_job_events(websocket: WebSocket, subscription: Subscription):
+    """구독한 작업 완료 이벤트를 전송합니다.
+
+    수신이 느린 클라이언트 때문에 이벤트가 버려지면 events_dropped 이벤트로 알려
+    클라이언트가 진행 중인 작업을 다시 조회하도록 합니다.
+    """
+    reported_dropped = 0
+    while True:
+        event = await subscription.get()
+        if subscription.dropped > reported_dropped:
+            dropped_event = AIJobEventsDroppedEvent(count=subscription.dropped - reported_dropped)
+            reported_dropped = subscription.dropped
+            await asyncio.wait_for(websocket.send_text(dropped_event.model_dump_json()), WS_SEND_TIMEOUT)
+        await asyncio.wait_for(websocket.send_text(event.model_dump_json()), WS_SEND_TIMEOUT)
+
+
+@router.websocket("/jobs/ws")
+async def stream_user_job_events(
+    websocket: WebSocket,
+    user_id: uuid.UUID = Depends(get_current_user),
+    category_service: CategoryRecommendationService = Depends(get_category_recommendation_service),
+    file_service: FileDuplicateCheckService = Depends(get_file_duplicate_check_service),
+    hub: NotificationHub = Depends(get_notification_hub)
+):
+    """
+    사용자의 진행 중인 카테고리 추천, 파일 중복 검사 완료 이벤트 구독 (WebSocket)
+    """
+    await websocket.accept()
+    # 진행 중인 작업 조회 전에 구독해 그 사이에 완료된 작업도 전달
+    with hub.subscribe(user_jobs_topic(user_id), max_queue_size=WS_MAX_QUEUE_SIZE) as subscription:
+        pending = AIPendingJobsEvent(
+            category_recommendations=await category_service.get_pending_recommendations(
+                user_id, WS_PENDING_JOBS_LIMIT
+            ),
+            file_duplicate_checks=await file_service.get_pending_duplicate_checks(
+                str(user_id), WS_PENDING_JOBS_LIMIT
+            )
+        )
+        await websocket.send_text(pending.model_dump_json())
+
+        receiver = asyncio.create_task(receive_until_disconnect(websocket))
+        sender = asyncio.create_task(send_user_job_events(websocket, subscription))
+        try:
+            done, _ = await asyncio.wait({receiver, sender}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            receiver.cancel()
+            sender.cancel()
+            await asyncio.wait({receiver, sender})
+
+        if sender in done and isinstance(sender.exception(), asyncio.TimeoutError):
+            # 전송이 막힌 클라이언트는 연결을 닫고 재연결 시 다시 조회하도록 함
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
@@ -1,64 +1,262 @@
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 import uuid
 from bson import ObjectId
 
 from src.main.ai.data.CategoryRecommendationRepository import CategoryRecommendationRepository
 from src.main.ai.data.CategoryRecommendationQueue import CategoryRecommendationQueue
+from src.main.ai.data.OutboxRepository import OutboxRepository
+from src.main.ai.data.OutboxRelay import OutboxRelay
+from src.main.ai.notification.NotificationHub import (
+    NotificationHub,
+    Subscription,
+    category_recommendation_topic,
+    user_jobs_topic
+)
+from src.main.ai.models.AIJobEvent import AIJobCompletedEvent, AI_JOB_CATEGORY_RECOMMENDATION
+from src.main.config.cache import StatusCache, get_status_ttl
 from src.main.ai.models.CategoryRecommendation import (
     CategoryRecommendationRequest,
     CategoryRecommendationResponse,
+    CategoryRecommendationBulkRequest,
+    CategoryRecommendationBulkResponse,
     CategoryRecommendationStatusResponse,
-    CategoryRecommendationResultRequest
+    CategoryRecommendationResultRequest,
+    CategoryRecommendationResultBatchRequest,
+    CategoryRecommendationResultItemResponse,
+    CategoryRecommendationResultBatchResponse
 )
 
 
 class CategoryRecommendationService:
-    def __init__(self, repository: CategoryRecommendationRepository, queue: CategoryRecommendationQueue):
+    def __init__(
+        self,
+        repository: CategoryRecommendationRepository,
+        queue: CategoryRecommendationQueue,
+        outbox: OutboxRepository,
+        relay: Optional[OutboxRelay] = None,
+        hub: Optional[NotificationHub] = None,
+        cache: Optional[StatusCache] = None
+    ):
         self.repository = repository
         self.queue = queue
+        self.outbox = outbox
+        self.relay = relay
+        self.hub = hub
+        self.cache = cache
+
+    @staticmethod
+    def cache_key(request_id: str, user_id: str) -> tuple:
+        return ("category_recommendation", str(request_id), str(user_id))
 
-    def create_recommendation_request(self, request: CategoryRecommendationRequest, user_id: uuid.UUID) -> CategoryRecommendationResponse:
-        # MongoDB에 저장 - ObjectId 자동 생성
-        document = self.repository.create_recommendation_request(
-            file_id=request.file_id,
-            user_id=str(user_id)
+    @staticmethod
+    def to_status_response(document: dict) -> CategoryRecommendationStatusResponse:
+        return CategoryRecommendationStatusResponse(
+            request_id=str(document["_id"]),
+            is_completed=document["is_completed"],
+            predicted_category=document.get("predicted_category")
         )
+
+    @staticmethod
+    def completion_events(document: dict) -> List[Tuple]:
+        """완료된 추천 문서로부터 발행할 (topic, event) 목록을 만듭니다."""
+        status_response = CategoryRecommendationService.to_status_response(document)
+        events = [(category_recommendation_topic(document["_id"]), status_response)]
+        if document.get("user_id"):
+            events.append((
+                user_jobs_topic(document["user_id"]),
+                AIJobCompletedEvent(type=AI_JOB_CATEGORY_RECOMMENDATION, result=status_response)
+            ))
+        return events
+
+    async def create_recommendation_request(self, request: CategoryRecommendationRequest, user_id: uuid.UUID) -> CategoryRecommendationResponse:
+        async def create(session) -> str:
+            # MongoDB에 저장 - ObjectId 자동 생성
+            document = await self.repository.create_recommendation_request(
+                file_id=request.file_id,
+                user_id=str(user_id),
+                session=session
+            )
+            
+            # request_id는 MongoDB의 _id를 문자열로 변환
+            request_id = str(document["_id"])
+            
+            # 같은 트랜잭션에서 아웃박스에 메시지 저장
+            entry = self.queue.build_message_entry(
+                request_id=request_id,
+                file_id=request.file_id,
+                user_id=str(user_id)
+            )
+            await self.outbox.add_messages([entry], session=session)
+            return request_id
         
-        # request_id는 MongoDB의 _id를 문자열로 변환
-        request_id = str(document["_id"])
+        request_id = await self.outbox.run_in_transaction(create)
         
-        # 메시지 발행
-        self.queue.send_message(
-            request_id=request_id,
-            file_id=request.file_id,
-            user_id=str(user_id)
-        )
+        # 메시지 발행은 아웃박스 릴레이가 담당
+        if self.relay is not None:
+            self.relay.notify()
         
         return CategoryRecommendationResponse(request_id=request_id)
 
-    def get_recommendation_status(self, request_id: str, user_id: uuid.UUID) -> Optional[CategoryRecommendationStatusResponse]:
-        result = self.repository.get_recommendation_by_id(request_id, str(user_id))
+    async def create_recommendation_requests(
+        self,
+        request: CategoryRecommendationBulkRequest,
+        user_id: uuid.UUID
+    ) -> CategoryRecommendationBulkResponse:
+        async def create(session) -> List[str]:
+            # 요청 문서와 아웃박스 메시지를 각각 insert_many 한 번으로 저장
+            documents = await self.repository.create_recommendation_requests(
+                file_ids=request.file_ids,
+                user_id=str(user_id),
+                session=session
+            )
+            entries = [
+                self.queue.build_message_entry(
+                    request_id=str(document["_id"]),
+                    file_id=document["file_id"],
+                    user_id=str(user_id)
+                )
+                for document in documents
+            ]
+            await self.outbox.add_messages(entries, session=session)
+            return [str(document["_id"]) for document in documents]
+        
+        request_ids = await self.outbox.run_in_transaction(create)
+        
+        # 아웃박스 릴레이가 SendMessageBatch로 10개씩 묶어 발행
+        if self.relay is not None:
+            self.relay.notify()
+        
+        return CategoryRecommendationBulkResponse(request_ids=request_ids)
+
+    async def get_recommendation_status(
+        self,
+        request_id: str,
+        user_id: uuid.UUID,
+        allow_pending_cache: bool = True
+    ) -> Optional[CategoryRecommendationStatusResponse]:
+        key = self.cache_key(request_id, user_id)
+        if self.cache is not None:
+            cached = await self.cache.get(key)
+            if cached is not None and (cached["is_completed"] or allow_pending_cache):
+                return CategoryRecommendationStatusResponse(**cached)
+        
+        result = await self.repository.get_recommendation_by_id(request_id, str(user_id))
         
         if not result:
             return None
             
-        return CategoryRecommendationStatusResponse(
-            request_id=str(result["_id"]),
-            is_completed=result["is_completed"],
-            predicted_category=result.get("predicted_category")
-        )
+        response = self.to_status_response(result)
+        await self._cache_status(key, response)
+        return response
 
-    def update_recommendation_result(self, request_id: str, result: CategoryRecommendationResultRequest) -> Optional[CategoryRecommendationStatusResponse]:
-        updated = self.repository.update_recommendation_result(
+    async def get_recommendation_statuses(
+        self,
+        request_ids: List[str],
+        user_id: uuid.UUID
+    ) -> Dict[str, CategoryRecommendationStatusResponse]:
+        """여러 요청의 상태를 조회합니다. 캐시에 없는 요청만 $in 쿼리 한 번으로 조회하며, 없는 요청은 결과에서 빠집니다."""
+        request_ids = list(dict.fromkeys(request_ids))
+        statuses: Dict[str, CategoryRecommendationStatusResponse] = {}
+        missing = request_ids
+        if self.cache is not None:
+            cached = await self.cache.get_many([self.cache_key(request_id, user_id) for request_id in request_ids])
+            missing = []
+            for request_id, value in zip(request_ids, cached):
+                if value is None:
+                    missing.append(request_id)
+                else:
+                    statuses[request_id] = CategoryRecommendationStatusResponse(**value)
+        
+        if missing:
+            documents = await self.repository.get_recommendations_by_ids(missing, str(user_id))
+            responses = [self.to_status_response(document) for document in documents]
+            if self.cache is not None:
+                await self.cache.set_many([
+                    (self.cache_key(response.request_id, user_id), response.model_dump(), get_status_ttl(response.is_completed))
+                    for response in responses
+                ])
+            statuses.update({response.request_id: response for response in responses})
+        
+        # 요청한 순서대로 반환
+        return {request_id: statuses[request_id] for request_id in request_ids if request_id in statuses}
+
+    async def _cache_status(self, key: tuple, response: CategoryRecommendationStatusResponse):
+        if self.cache is not None:
+            await self.cache.set(key, response.model_dump(), get_status_ttl(response.is_completed))
+
+    async def get_pending_recommendations(self, user_id: uuid.UUID, limit: int) -> List[CategoryRecommendationStatusResponse]:
+        documents = await self.repository.get_pending_recommendations(str(user_id), limit)
+        return [self.to_status_response(document) for document in documents]
+
+    async def subscribe_recommendation_status(
+        self,
+        request_id: str,
+        user_id: uuid.UUID
+    ) -> Tuple[Optional[CategoryRecommendationStatusResponse], Optional[Subscription]]:
+        """완료 알림을 구독한 뒤 현재 상태를 조회합니다.
+
+        조회 전에 구독하므로 조회와 구독 사이에 완료되더라도 알림을 놓치지 않습니다.
+        요청이 없거나 이미 완료된 경우 구독은 None입니다.
+        """
+        subscription = None
+        if self.hub is not None:
+            subscription = self.hub.subscribe(category_recommendation_topic(request_id))
+        try:
+            # 캐시된 진행 중 상태는 이미 지나간 완료 알림을 놓칠 수 있으므로 사용하지 않음
+            current = await self.get_recommendation_status(request_id, user_id, allow_pending_cache=False)
+        except BaseException:
+            if subscription is not None:
+                subscription.close()
+            raise
+
+        if subscription is not None and (current is None or current.is_completed):
+            subscription.close()
+            subscription = None
+        return current, subscription
+
+    async def update_recommendation_result(self, request_id: str, result: CategoryRecommendationResultRequest) -> Optional[CategoryRecommendationStatusResponse]:
+        updated = await self.repository.update_recommendation_result(
             request_id=request_id,
             predicted_category=result.predicted_category
         )
         
         if not updated:
             return None
+        
+        return await self._publish_completion(updated)
+
+    async def update_recommendation_results(
+        self,
+        request: CategoryRecommendationResultBatchRequest
+    ) -> CategoryRecommendationResultBatchResponse:
+        """여러 워커 결과를 한 번에 기록하고 항목별 성공 여부를 요청 순서대로 반환합니다."""
+        updated_documents = await self.repository.update_recommendation_results([
+            (result.request_id, result.predicted_category)
+            for result in request.results
+            if result.request_id
+        ])
+        
+        updated_ids = set()
+        for document in updated_documents:
+            await self._publish_completion(document)
+            updated_ids.add(str(document["_id"]))
+        
+        return CategoryRecommendationResultBatchResponse(results=[
+            CategoryRecommendationResultItemResponse(
+                request_id=result.request_id,
+                success=result.request_id in updated_ids
+            )
+            for result in request.results
+        ])
+
+    async def _publish_completion(self, document: dict) -> CategoryRecommendationStatusResponse:
+        # 이후 조회가 MongoDB를 거치지 않도록 캐시에 기록
+        response = self.to_status_response(document)
+        await self._cache_status(self.cache_key(document["_id"], document["user_id"]), response)
+        
+        # 완료를 기다리는 구독자(SSE 등)에게 알림
+        if self.hub is not None:
+            for topic, event in self.completion_events(document):
+                self.hub.publish(topic, event, key=str(document["_id"]))
             
-        return CategoryRecommendationStatusResponse(
-            request_id=str(updated["_id"]),
-            is_completed=updated["is_completed"],
-            predicted_category=updated.get("predicted_category")
-        ) 
\ No newline at end of file
+        return response
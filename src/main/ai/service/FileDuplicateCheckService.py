@@ -1,4 +1,5 @@
 from fastapi import HTTPException, status
+from typing import Dict, List, Tuple
 from bson import ObjectId
 import json
 import logging
@@ -8,71 +9,154 @@ from src.main.ai.models.FileDuplicateCheck import (
     FileDuplicateCheckResponse,
     FileDuplicateCheckStatusResponse,
     FileDuplicateCheckResultRequest,
-    FileDuplicateCheckEmbeddingsRequest
+    FileDuplicateCheckResultBatchRequest,
+    FileDuplicateCheckResultItemResponse,
+    FileDuplicateCheckResultBatchResponse,
+    FileDuplicateCheckEmbeddingsRequest,
+    FileEmbeddingResponse
 )
+from src.main.ai.data.FileDuplicateCheckRepository import CONTENT_HASH_FIELD
+from src.main.ai.models.AIJobEvent import AIJobCompletedEvent, AI_JOB_FILE_DUPLICATE_CHECK
+from src.main.ai.notification.NotificationHub import file_duplicate_check_topic, user_jobs_topic
+from src.main.config.cache import get_status_ttl
 
 # 로거 설정
 logger = logging.getLogger(__name__)
 
 
 class FileDuplicateCheckService:
-    def __init__(self, repository, sqs_service):
+    def __init__(self, repository, sqs_service, outbox, relay=None, hub=None, cache=None, similarity=None):
         self.repository = repository
         self.sqs_service = sqs_service
+        self.outbox = outbox
+        self.relay = relay
+        self.hub = hub
+        self.cache = cache
+        self.similarity = similarity
     
-    def create_duplicate_check_request(self, request: FileDuplicateCheckRequest) -> FileDuplicateCheckResponse:
+    @staticmethod
+    def cache_key(file_id: str, user_id: str) -> tuple:
+        return ("file_duplicate_check", str(file_id), str(user_id))
+    
+    @staticmethod
+    def to_status_response(check: dict) -> FileDuplicateCheckStatusResponse:
+        return FileDuplicateCheckStatusResponse(
+            request_id=str(check["_id"]),
+            file_id=check["file_id"],
+            is_completed=check["is_completed"],
+            is_duplicated=check["is_duplicated"]
+        )
+    
+    @staticmethod
+    def completion_events(check: dict) -> List[Tuple]:
+        """완료된 중복 검사 문서로부터 발행할 (topic, event) 목록을 만듭니다."""
+        status_response = FileDuplicateCheckService.to_status_response(check)
+        return [
+            (file_duplicate_check_topic(check["file_id"], check["user_id"]), status_response),
+            (
+                user_jobs_topic(check["user_id"]),
+                AIJobCompletedEvent(type=AI_JOB_FILE_DUPLICATE_CHECK, result=status_response)
+            )
+        ]
+    
+    async def create_duplicate_check_request(self, request: FileDuplicateCheckRequest) -> FileDuplicateCheckResponse:
         """
-        파일 중복 검사 요청을 생성하고 SQS에 메시지를 발송합니다.
+        파일 중복 검사 요청을 생성하고 SQS로 보낼 메시지를 아웃박스에 저장합니다.
         """
         # 1. 파일 존재 여부 확인
-        file = self.repository.get_file_by_id(request.file_id)
+        file = await self.repository.get_file_by_id(request.file_id)
         if not file:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="파일을 찾을 수 없습니다. 존재하지 않는 ID입니다."
             )
         
-        # 2. 중복 검사 결과가 있는지 확인
-        existing_check = self.repository.get_duplicate_check_by_file_id(request.file_id, request.user_id)
-        if existing_check:
-            logger.info(f"이미 중복 검사 요청이 존재합니다. request_id: {str(existing_check['_id'])}, file_id: {request.file_id}, user_id: {request.user_id}")
+        # 내용이 같은 파일이 이미 있으면 워커를 거치지 않고 중복으로 판정
+        content_hash = file.get(CONTENT_HASH_FIELD)
+        if content_hash:
+            identical = await self.repository.find_file_by_content_hash(content_hash, request.file_id)
+            if identical is not None:
+                logger.info(f"내용이 같은 파일이 있습니다. file_id: {request.file_id}, identical_file_id: {identical['_id']}")
+                return await self._create_completed_check(request, True)
+        
+        # 파일 임베딩이 이미 있으면 워커를 거치지 않고 유사도 엔진으로 바로 판정
+        if self.similarity is not None:
+            decision = await self.similarity.find_duplicate(request.file_id)
+            if decision is not None:
+                logger.info(f"유사도 엔진으로 판정했습니다. file_id: {request.file_id}, score: {decision[1]}")
+                return await self._create_completed_check(request, decision[0] is not None)
+        
+        async def create(session):
+            # 2. 중복 검사 요청 생성 (이미 존재하면 생성하지 않음)
+            result = await self.repository.create_duplicate_check_request(
+                file_id=request.file_id,
+                user_id=request.user_id,
+                session=session
+            )
+            if not result:
+                return None
+            
+            # 3. 같은 트랜잭션에서 아웃박스에 SQS 메시지 저장
+            message_id = str(result["_id"])
+            logger.info(f"아웃박스 메시지 저장: request_id: {message_id}, user_id: {request.user_id}, s3_bucket: {file['s3_bucket']}, s3_key: {file['s3_key']}")
+            entry = self.sqs_service.build_message_entry(
+                request_id=message_id,
+                user_id=request.user_id,
+                s3_bucket=file["s3_bucket"],
+                s3_key=file["s3_key"]
+            )
+            await self.outbox.add_messages([entry], session=session)
+            return result
+        
+        result = await self.outbox.run_in_transaction(create)
+        if not result:
+            logger.info(f"이미 중복 검사 요청이 존재합니다. file_id: {request.file_id}, user_id: {request.user_id}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="이미 중복 검사 요청이 존재합니다."
             )
         
-        # 3. 중복 검사 요청 생성
-        result = self.repository.create_duplicate_check_request(
-            file_id=request.file_id,
-            user_id=request.user_id
-        )
-        
-        # 4. SQS에 메시지 발송
-        file_data = {
-            "s3_bucket": file["s3_bucket"],
-            "s3_key": file["s3_key"]
-        }
-        
-        message_id = str(result["_id"])
-        logger.info(f"SQS 메시지 발송 준비: request_id: {message_id}, user_id: {request.user_id}, s3_bucket: {file['s3_bucket']}, s3_key: {file['s3_key']}")
+        # 메시지 발행은 아웃박스 릴레이가 담당
+        if self.relay is not None:
+            self.relay.notify()
         
-        response = self.sqs_service.send_message(
-            request_id=message_id,
-            user_id=request.user_id,
-            s3_bucket=file["s3_bucket"],
-            s3_key=file["s3_key"]
-        )
-        logger.info(f"SQS 메시지 발송 응답: {response}")
-        
-        # 5. 요청 ID 응답
+        # 4. 요청 ID 응답
         return FileDuplicateCheckResponse(request_id=str(result["_id"]))
     
-    def get_duplicate_check_status(self, file_id: str, user_id: str) -> FileDuplicateCheckStatusResponse:
+    async def get_duplicate_check_status(self, file_id: str, user_id: str, wait: float = 0) -> FileDuplicateCheckStatusResponse:
         """
         파일 중복 검사 상태를 조회합니다.
+        
+        wait(초)가 주어지면 검사가 끝나지 않은 경우 결과가 기록되거나 wait가 지날 때까지 기다립니다.
         """
+        # 조회와 대기 사이에 완료되더라도 알림을 놓치지 않도록 조회 전에 구독
+        subscription = None
+        if wait > 0 and self.hub is not None:
+            subscription = self.hub.subscribe(file_duplicate_check_topic(file_id, user_id))
+        
+        try:
+            # 1~3. 중복 검사 요청 상태 조회
+            # 대기하는 경우 캐시된 진행 중 상태는 이미 지나간 완료 알림을 놓칠 수 있으므로 사용하지 않음
+            current = await self._load_status(file_id, user_id, allow_pending_cache=subscription is None)
+            if not current or current.is_completed or subscription is None:
+                return current
+            
+            # 4. 완료되지 않았으면 결과가 기록될 때까지 대기
+            completed = await subscription.get(timeout=wait)
+            return completed or current
+        finally:
+            if subscription is not None:
+                subscription.close()
+    
+    async def _load_status(self, file_id: str, user_id: str, allow_pending_cache: bool = True):
+        key = self.cache_key(file_id, user_id)
+        if self.cache is not None:
+            cached = await self.cache.get(key)
+            if cached is not None and (cached["is_completed"] or allow_pending_cache):
+                return FileDuplicateCheckStatusResponse(**cached)
+        
         # 1. 중복 검사 요청 조회
-        check = self.repository.get_duplicate_check_by_file_id(file_id, user_id)
+        check = await self.repository.get_duplicate_check_by_file_id(file_id, user_id)
         
         # 2. 요청이 없으면 None 반환
         if not check:
@@ -81,19 +165,58 @@ class FileDuplicateCheckService:
         
         # 3. 요청이 있으면 상태 반환
         logger.info(f"중복 검사 요청을 찾았습니다. request_id: {str(check['_id'])}, is_completed: {check['is_completed']}")
-        return FileDuplicateCheckStatusResponse(
-            request_id=str(check["_id"]),
-            file_id=check["file_id"],
-            is_completed=check["is_completed"],
-            is_duplicated=check["is_duplicated"]
-        )
+        response = self.to_status_response(check)
+        await self._cache_status(key, response)
+        return response
     
-    def update_duplicate_check_result(self, request_id: str, is_duplicated: bool) -> bool:
+    async def get_duplicate_check_statuses(self, file_ids: List[str], user_id: str) -> Dict[str, FileDuplicateCheckStatusResponse]:
+        """
+        여러 파일의 중복 검사 상태를 조회합니다.
+        
+        캐시에 없는 파일만 $in 쿼리 한 번으로 조회하며, 요청이 없는 파일은 결과에서 빠집니다.
+        """
+        file_ids = list(dict.fromkeys(file_ids))
+        statuses: Dict[str, FileDuplicateCheckStatusResponse] = {}
+        missing = file_ids
+        if self.cache is not None:
+            cached = await self.cache.get_many([self.cache_key(file_id, user_id) for file_id in file_ids])
+            missing = []
+            for file_id, value in zip(file_ids, cached):
+                if value is None:
+                    missing.append(file_id)
+                else:
+                    statuses[file_id] = FileDuplicateCheckStatusResponse(**value)
+        
+        if missing:
+            checks = await self.repository.get_duplicate_checks_by_file_ids(missing, user_id)
+            responses = [self.to_status_response(check) for check in checks]
+            if self.cache is not None:
+                await self.cache.set_many([
+                    (self.cache_key(response.file_id, user_id), response.model_dump(), get_status_ttl(response.is_completed))
+                    for response in responses
+                ])
+            statuses.update({response.file_id: response for response in responses})
+        
+        # 요청한 순서대로 반환
+        return {file_id: statuses[file_id] for file_id in file_ids if file_id in statuses}
+    
+    async def _cache_status(self, key: tuple, response: FileDuplicateCheckStatusResponse):
+        if self.cache is not None:
+            await self.cache.set(key, response.model_dump(), get_status_ttl(response.is_completed))
+    
+    async def get_pending_duplicate_checks(self, user_id: str, limit: int) -> List[FileDuplicateCheckStatusResponse]:
+        """
+        사용자의 완료되지 않은 중복 검사 요청 상태 목록을 조회합니다.
+        """
+        checks = await self.repository.get_pending_duplicate_checks(user_id, limit)
+        return [self.to_status_response(check) for check in checks]
+    
+    async def update_duplicate_check_result(self, request_id: str, is_duplicated: bool) -> bool:
         """
         파일 중복 검사 결과를 업데이트합니다.
         """
         # 1. 중복 검사 요청 조회
-        check = self.repository.get_duplicate_check_by_id(request_id)
+        check = await self.repository.get_duplicate_check_by_id(request_id)
         
         # 2. 요청이 없으면 False 반환
         if not check:
@@ -102,16 +225,109 @@ class FileDuplicateCheckService:
         
         # 3. 파일 중복 상태 업데이트
         logger.info(f"파일 중복 상태 업데이트 시작. file_id: {check['file_id']}, is_duplicated: {is_duplicated}")
-        file_result = self.repository.update_file_duplicate_status(check["file_id"], is_duplicated)
+        file_result = await self.repository.update_file_duplicate_status(check["file_id"], is_duplicated)
         
         # 4. 중복 검사 결과 업데이트
         logger.info(f"중복 검사 결과 업데이트 시작. request_id: {request_id}, is_duplicated: {is_duplicated}")
-        result = self.repository.update_duplicate_check_result(
+        result = await self.repository.update_duplicate_check_result(
             request_id=request_id,
             is_duplicated=is_duplicated
         )
         
-        # 5. 업데이트 성공 여부 반환
+        # 5. 이후 조회가 MongoDB를 거치지 않도록 캐시에 기록하고, 결과를 기다리는 요청(long polling 등)에 알림
+        if result is not None:
+            await self._publish_completion(result)
+        
+        # 6. 업데이트 성공 여부 반환
         is_success = result is not None
         logger.info(f"중복 검사 결과 업데이트 결과: {is_success}")
-        return is_success 
\ No newline at end of file
+        return is_success
+    
+    async def update_duplicate_check_results(self, request: FileDuplicateCheckResultBatchRequest) -> FileDuplicateCheckResultBatchResponse:
+        """
+        여러 파일 중복 검사 결과를 한 번에 업데이트하고 항목별 결과를 요청 순서대로 반환합니다.
+        """
+        # 1. 중복 검사 요청을 $in 쿼리 한 번으로 조회
+        checks = await self.repository.get_duplicate_checks_by_ids([result.request_id for result in request.results])
+        checks_by_id = {str(check["_id"]): check for check in checks}
+        
+        # 2. 존재하는 요청만 files, file_duplicate_checks에 각각 bulk_write 한 번으로 기록
+        found = [
+            (checks_by_id[result.request_id], result.is_duplicated)
+            for result in request.results
+            if result.request_id in checks_by_id
+        ]
+        failed_ids = await self.repository.update_duplicate_check_results(found)
+        logger.info(f"중복 검사 결과 일괄 업데이트. 요청: {len(request.results)}, 기록: {len(found) - len(failed_ids)}")
+        
+        # 3. 기록된 결과를 캐시에 기록하고 알림
+        completed = {}
+        for check, is_duplicated in found:
+            if check["_id"] in failed_ids:
+                continue
+            document = {**check, "is_completed": True, "is_duplicated": is_duplicated}
+            completed[str(check["_id"])] = await self._publish_completion(document)
+        
+        # 4. 항목별 결과 반환
+        return FileDuplicateCheckResultBatchResponse(results=[
+            FileDuplicateCheckResultItemResponse(
+                request_id=result.request_id,
+                success=result.request_id in completed,
+                result=completed.get(result.request_id)
+            )
+            for result in request.results
+        ])
+    
+    async def save_file_embedding(self, request: FileDuplicateCheckEmbeddingsRequest) -> FileEmbeddingResponse:
+        """
+        워커가 계산한 파일 임베딩을 저장합니다.
+        """
+        # 1. 파일 존재 여부 확인
+        file = await self.repository.get_file_by_id(request.file_id)
+        if not file:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="파일을 찾을 수 없습니다. 존재하지 않는 ID입니다."
+            )
+        
+        # 2. float32 바이너리로 저장하고 이후 중복 검사에서 바로 판정할 수 있도록 유사도 인덱스에 추가
+        await self.repository.save_file_embedding(request.file_id, request.embeddings)
+        if self.similarity is not None:
+            await self.similarity.add(request.file_id, request.embeddings)
+        
+        # 3. 워커가 계산한 내용 해시가 있으면 이후 같은 파일은 해시로 바로 판정
+        if request.sha256 and file.get(CONTENT_HASH_FIELD) != request.sha256:
+            await self.repository.save_file_content_hash(request.file_id, request.sha256)
+        logger.info(f"파일 임베딩 저장. file_id: {request.file_id}, dimensions: {len(request.embeddings)}")
+        
+        return FileEmbeddingResponse(file_id=request.file_id, dimensions=len(request.embeddings))
+    
+    async def _create_completed_check(self, request: FileDuplicateCheckRequest, is_duplicated: bool) -> FileDuplicateCheckResponse:
+        result = await self.repository.create_duplicate_check_request(
+            file_id=request.file_id,
+            user_id=request.user_id,
+            is_duplicated=is_duplicated
+        )
+        if not result:
+            logger.info(f"이미 중복 검사 요청이 존재합니다. file_id: {request.file_id}, user_id: {request.user_id}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="이미 중복 검사 요청이 존재합니다."
+            )
+        
+        logger.info(f"워커 없이 중복 검사 완료. file_id: {request.file_id}, is_duplicated: {is_duplicated}")
+        await self.repository.update_file_duplicate_status(request.file_id, is_duplicated)
+        await self._publish_completion(result)
+        return FileDuplicateCheckResponse(
+            request_id=str(result["_id"]),
+            is_completed=True,
+            is_duplicated=is_duplicated
+        )
+    
+    async def _publish_completion(self, check: dict) -> FileDuplicateCheckStatusResponse:
+        response = self.to_status_response(check)
+        await self._cache_status(self.cache_key(check["file_id"], check["user_id"]), response)
+        if self.hub is not None:
+            for topic, event in self.completion_events(check):
+                self.hub.publish(topic, event, key=str(check["_id"]))
+        return response 
\ No newline at end of file
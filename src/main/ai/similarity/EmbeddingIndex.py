@@ -0,0 +1,209 @@
+import numpy as np
+from bson.binary import Binary, BinaryVectorDtype, VECTOR_SUBTYPE
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# BSON Binary vector 헤더 (dtype 1바이트 + padding 1바이트)
+BINARY_VECTOR_HEADER_SIZE = 2
+
+
+def embedding_to_array(embedding) -> np.ndarray:
+    """file_embeddings 문서의 임베딩을 float32 배열로 변환합니다.
+
+    float32 BSON Binary vector는 복사 없이 버퍼를 그대로 읽고,
+    float 배열로 저장된 기존 문서는 float32로 변환합니다.
+    """
+    if (
+        isinstance(embedding, Binary)
+        and embedding.subtype == VECTOR_SUBTYPE
+        and embedding[:1] == BinaryVectorDtype.FLOAT32.value
+    ):
+        return np.frombuffer(embedding, dtype="<f4", offset=BINARY_VECTOR_HEADER_SIZE)
+    return np.asarray(embedding, dtype=np.float32)
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """행 벡터를 단위 길이로 정규화한 float32 배열을 반환합니다. 영벡터는 그대로 둡니다."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수가 높은 순으로 최대 k개의 행 번호를 반환합니다. 전체 정렬 대신 argpartition을 사용합니다."""
+    k = min(k, scores.shape[0])
+    if k < scores.shape[0]:
+        rows = np.argpartition(-scores, k - 1)[:k]
+    else:
+        rows = np.arange(scores.shape[0])
+    return rows[np.argsort(-scores[rows], kind="stable")]
+
+
+class ExactIndex:
+    """정규화된 임베딩을 연속된 float32 행렬에 보관하고 전수 비교로 검색하는 인덱스
+
+    검색은 행렬-벡터 곱 한 번으로 모든 벡터와의 코사인 유사도를 계산합니다.
+    행렬은 용량을 두 배씩 늘려 추가 비용을 분할 상환합니다. 이벤트 루프 안에서만 사용합니다.
+    """
+
+    def __init__(self, dimensions: Optional[int] = None, initial_capacity: int = 1024):
+        self.dimensions = dimensions
+        self.initial_capacity = initial_capacity
+        self._vectors: Optional[np.ndarray] = None
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        # 마지막으로 동기화한 file_embeddings의 updated_at. 메모리 인덱스는 시작할 때마다 전체를 다시 읽음
+        self.synced_at = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, file_id: str) -> bool:
+        return file_id in self._rows
+
+    @property
+    def ids(self) -> List[str]:
+        """vectors의 행 순서와 같은 file_id 목록"""
+        return list(self._ids)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """저장된 벡터 행렬 (복사하지 않은 view)"""
+        if self._vectors is None:
+            return np.empty((0, self.dimensions or 0), dtype=np.float32)
+        return self._vectors[:len(self._ids)]
+
+    def add(self, file_id: str, vector):
+        """벡터 하나를 추가합니다. 이미 있는 file_id면 벡터를 교체합니다."""
+        self.add_many([file_id], np.asarray(vector, dtype=np.float32).reshape(1, -1))
+
+    def add_many(self, file_ids: Iterable[str], vectors: np.ndarray):
+        """(N, dimensions) 행렬을 한 번에 추가합니다."""
+        file_ids = list(file_ids)
+        vectors = normalize(vectors)
+        if vectors.ndim != 2 or vectors.shape[0] != len(file_ids):
+            raise ValueError("file_ids와 vectors의 개수가 맞지 않습니다.")
+        if self.dimensions is None:
+            self.dimensions = vectors.shape[1]
+        if vectors.shape[1] != self.dimensions:
+            raise ValueError(f"임베딩 차원이 맞지 않습니다. expected: {self.dimensions}, actual: {vectors.shape[1]}")
+
+        new_positions: Dict[str, int] = {}
+        new_vectors = []
+        for file_id, vector in zip(file_ids, vectors):
+            row = self._rows.get(file_id)
+            if row is not None:
+                self._vectors[row] = vector
+            elif file_id in new_positions:
+                new_vectors[new_positions[file_id]] = vector
+            else:
+                new_positions[file_id] = len(new_vectors)
+                new_vectors.append(vector)
+        if not new_vectors:
+            return
+        new_ids = list(new_positions)
+
+        start = len(self._ids)
+        self._reserve(start + len(new_ids))
+        self._vectors[start:start + len(new_ids)] = new_vectors
+        for offset, file_id in enumerate(new_ids):
+            self._rows[file_id] = start + offset
+        self._ids.extend(new_ids)
+
+    def iter_vectors(self, batch_size: int = 65536) -> Iterator[Tuple[List[str], np.ndarray]]:
+        """저장된 (file_id 목록, 벡터 행렬 복사본)을 batch_size개씩 반환합니다.
+
+        순회를 시작할 때 있던 file_id만 반환하며, 그 사이 제거된 것은 건너뛰고 교체된 것은 새 벡터를 반환합니다.
+        """
+        file_ids = list(self._ids)
+        for start in range(0, len(file_ids), batch_size):
+            chunk = [file_id for file_id in file_ids[start:start + batch_size] if file_id in self._rows]
+            if chunk:
+                yield chunk, self._vectors[[self._rows[file_id] for file_id in chunk]]
+
+    def sample(self, size: int, seed: int = 0) -> np.ndarray:
+        """저장된 벡터 중 최대 size개를 무작위로 골라 복사본으로 반환합니다.
+
+        학습용 표본이므로 다른 스레드에서 호출하는 동안 교체/삭제된 행이 섞여도 됩니다.
+        """
+        count = len(self._ids)
+        vectors = self._vectors
+        if vectors is None or count == 0:
+            return np.empty((0, self.dimensions or 0), dtype=np.float32)
+        if count <= size:
+            return vectors[:count].copy()
+        return vectors[np.sort(np.random.default_rng(seed).choice(count, size, replace=False))]
+
+    def remove(self, file_id: str) -> bool:
+        """벡터를 제거합니다. 마지막 행을 빈 자리로 옮겨 행렬을 연속으로 유지합니다."""
+        row = self._rows.pop(file_id, None)
+        if row is None:
+            return False
+        last = len(self._ids) - 1
+        if row != last:
+            last_id = self._ids[last]
+            self._vectors[row] = self._vectors[last]
+            self._ids[row] = last_id
+            self._rows[last_id] = row
+        self._ids.pop()
+        return True
+
+    def get(self, file_id: str) -> Optional[np.ndarray]:
+        """저장된 정규화 벡터를 반환합니다. 없으면 None을 반환합니다."""
+        row = self._rows.get(file_id)
+        if row is None:
+            return None
+        return self._vectors[row]
+
+    def search(self, query, k: int = 1, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """query와 코사인 유사도가 높은 순으로 최대 k개의 (file_id, 유사도)를 반환합니다."""
+        if not self._ids or k <= 0:
+            return []
+        query = normalize(query).reshape(-1)
+        scores = self.vectors @ query
+        if exclude is not None and exclude in self._rows:
+            scores[self._rows[exclude]] = -np.inf
+        rows = top_k_rows(scores, k)
+        return [(self._ids[row], float(scores[row])) for row in rows if np.isfinite(scores[row])]
+
+    async def restore(self):
+        # 다시 만들 구조가 없음
+        pass
+
+    def needs_training(self) -> bool:
+        # 학습할 구조가 없음
+        return False
+
+    async def train(self):
+        pass
+
+    def needs_compaction(self) -> bool:
+        # 제거 시 행렬을 바로 채우므로 정리할 행이 없음
+        return False
+
+    async def compact(self):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def stats(self) -> dict:
+        """현재 지표를 반환합니다."""
+        return {
+            "type": "exact",
+            "size": len(self._ids),
+            "dimensions": self.dimensions,
+            "memory_bytes": 0 if self._vectors is None else self._vectors.nbytes,
+        }
+
+    def _reserve(self, size: int):
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2, self.initial_capacity)
+        vectors = np.empty((new_capacity, self.dimensions), dtype=np.float32)
+        if self._vectors is not None:
+            vectors[:len(self._ids)] = self._vectors[:len(self._ids)]
+        self._vectors = vectors
@@ -0,0 +1,390 @@
+import asyncio
+import logging
+import os
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.main.ai.similarity.EmbeddingIndex import ExactIndex, normalize
+from src.main.ai.similarity.MemmapIndex import MemmapIndex
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 대표 벡터 할당 시 한 번에 계산하는 행 수 (임시 행렬 크기 제한)
+ASSIGN_CHUNK_ROWS = 65536
+# 목록별 ExactIndex의 처음 용량
+LIST_INITIAL_CAPACITY = 16
+# 학습/복원 시 저장된 벡터를 한 번에 읽어 목록에 나누는 행 수
+RESTORE_CHUNK_ROWS = 8192
+# vector_index 디렉터리에 저장하는 대표 벡터 파일
+STATE_FILE_NAME = "ivf.npy"
+
+
+def assign_clusters(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """정규화된 벡터마다 코사인 유사도가 가장 높은 대표 벡터 번호를 반환합니다."""
+    assignments = np.empty(vectors.shape[0], dtype=np.int64)
+    for start in range(0, vectors.shape[0], ASSIGN_CHUNK_ROWS):
+        chunk = vectors[start:start + ASSIGN_CHUNK_ROWS]
+        assignments[start:start + chunk.shape[0]] = np.argmax(chunk @ centroids.T, axis=1)
+    return assignments
+
+
+def train_kmeans(vectors: np.ndarray, clusters: int, iterations: int = 20, seed: int = 0) -> np.ndarray:
+    """정규화된 벡터로 구면(spherical) k-means를 학습해 (clusters, dimensions) 대표 벡터를 반환합니다."""
+    rng = np.random.default_rng(seed)
+    clusters = min(clusters, vectors.shape[0])
+    centroids = vectors[rng.choice(vectors.shape[0], clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = assign_clusters(vectors, centroids)
+        # 할당별로 정렬한 뒤 구간 합으로 클러스터별 합계를 한 번에 계산
+        order = np.argsort(assignments, kind="stable")
+        counts = np.bincount(assignments, minlength=clusters)
+        sums = np.zeros_like(centroids)
+        present = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[present]
+        sums[present] = np.add.reduceat(vectors[order], starts, axis=0)
+        # 빈 클러스터는 임의의 벡터로 다시 시작
+        empty = np.flatnonzero(counts == 0)
+        if empty.size:
+            sums[empty] = vectors[rng.choice(vectors.shape[0], empty.size, replace=False)]
+        centroids = normalize(sums)
+    return centroids
+
+
+class IVFIndex:
+    """k-means 대표 벡터로 공간을 나눠 일부 목록만 검색하는 근사 최근접 이웃 인덱스 (IVF)
+
+    학습 전에는 ExactIndex 하나에 모두 보관해 전수 비교하고, train_size개가 모이면(needs_training)
+    train()이 별도 스레드에서 표본으로 nlist개의 대표 벡터를 학습해 각 벡터를 가장 가까운 대표 벡터의 목록(ExactIndex)으로 나눕니다.
+    검색은 질의와 가까운 nprobe개 목록만 비교하므로 nprobe를 키우면 재현율이, 줄이면 속도가 좋아집니다.
+    vector_index(예: 디스크의 MemmapIndex)를 주면 벡터를 그곳에도 저장하고 동기화 시각은 그것의 것을 사용하며,
+    restore()가 vector_index에 남아 있는 벡터로 목록을 다시 만들어 재시작 후 전체를 다시 읽지 않습니다.
+    vector_index가 MemmapIndex면 대표 벡터를 같은 디렉터리에 저장해 재시작 시 다시 학습하지 않습니다.
+    ExactIndex와 같은 인터페이스를 제공하며 이벤트 루프 안에서만 사용합니다.
+    """
+
+    def __init__(
+        self,
+        nlist: int = 256,
+        nprobe: int = 8,
+        train_size: Optional[int] = None,
+        kmeans_iterations: int = 20,
+        max_train_points: Optional[int] = None,
+        vector_index=None,
+        seed: int = 0,
+    ):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        # k-means가 안정적으로 학습되도록 목록당 충분한 벡터가 모인 뒤 학습
+        self.train_size = train_size if train_size is not None else nlist * 39
+        self.kmeans_iterations = kmeans_iterations
+        self.max_train_points = max_train_points if max_train_points is not None else nlist * 256
+        self.seed = seed
+        self.vector_index = vector_index
+        self.dimensions: Optional[int] = None
+        self.state_path = os.path.join(vector_index.path, STATE_FILE_NAME) if isinstance(vector_index, MemmapIndex) else None
+        self._synced_at = None
+
+        self.centroids: Optional[np.ndarray] = None
+        self._lists: List[ExactIndex] = [ExactIndex()]
+        self._list_of: Dict[str, int] = {}
+        # 학습 중 추가/삭제된 file_id. 학습 결과를 적용할 때 다시 반영
+        self._training = False
+        self._dirty: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._list_of)
+
+    def __contains__(self, file_id: str) -> bool:
+        return file_id in self._list_of
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def synced_at(self):
+        if self.vector_index is not None:
+            return self.vector_index.synced_at
+        return self._synced_at
+
+    @synced_at.setter
+    def synced_at(self, value):
+        if self.vector_index is not None:
+            self.vector_index.synced_at = value
+        self._synced_at = value
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """저장된 벡터 행렬 (복사본, 목록 순서)"""
+        matrices = [index.vectors for index in self._lists if len(index)]
+        if not matrices:
+            return np.empty((0, self.dimensions or 0), dtype=np.float32)
+        return np.concatenate(matrices)
+
+    def add(self, file_id: str, vector):
+        """벡터 하나를 추가합니다. 이미 있는 file_id면 벡터를 교체합니다."""
+        self.add_many([file_id], np.asarray(vector, dtype=np.float32).reshape(1, -1))
+
+    def add_many(self, file_ids: Iterable[str], vectors: np.ndarray):
+        """(N, dimensions) 행렬을 가장 가까운 대표 벡터의 목록에 추가합니다."""
+        file_ids = list(file_ids)
+        vectors = normalize(vectors)
+        if self.vector_index is not None:
+            self.vector_index.add_many(file_ids, vectors)
+        self._add_to_lists(file_ids, vectors)
+
+    def _add_to_lists(self, file_ids: List[str], vectors: np.ndarray, assignments: Optional[np.ndarray] = None):
+        if vectors.ndim != 2 or vectors.shape[0] != len(file_ids):
+            raise ValueError("file_ids와 vectors의 개수가 맞지 않습니다.")
+        if self.dimensions is None:
+            self.dimensions = vectors.shape[1]
+        if vectors.shape[1] != self.dimensions:
+            raise ValueError(f"임베딩 차원이 맞지 않습니다. expected: {self.dimensions}, actual: {vectors.shape[1]}")
+        if not file_ids:
+            return
+
+        # 같은 배치 안에서 중복된 file_id는 마지막 벡터만 사용
+        positions = {file_id: position for position, file_id in enumerate(file_ids)}
+        file_ids = list(positions)
+        vectors = vectors[list(positions.values())]
+        if self._training:
+            self._dirty.update(file_ids)
+
+        if assignments is not None:
+            assignments = assignments[list(positions.values())]
+        elif self.is_trained:
+            assignments = assign_clusters(vectors, self.centroids)
+        else:
+            assignments = np.zeros(len(file_ids), dtype=np.int64)
+        for file_id, assignment in zip(file_ids, assignments):
+            previous = self._list_of.get(file_id)
+            if previous is not None and previous != assignment:
+                self._lists[previous].remove(file_id)
+        for assignment in np.unique(assignments):
+            members = np.flatnonzero(assignments == assignment)
+            self._lists[assignment].add_many([file_ids[member] for member in members], vectors[members])
+            for member in members:
+                self._list_of[file_ids[member]] = int(assignment)
+
+    def remove(self, file_id: str) -> bool:
+        if self._training:
+            self._dirty.add(file_id)
+        if self.vector_index is not None:
+            self.vector_index.remove(file_id)
+        assignment = self._list_of.pop(file_id, None)
+        if assignment is None:
+            return False
+        return self._lists[assignment].remove(file_id)
+
+    def get(self, file_id: str) -> Optional[np.ndarray]:
+        """저장된 정규화 벡터를 반환합니다. 없으면 None을 반환합니다."""
+        assignment = self._list_of.get(file_id)
+        if assignment is None:
+            return None
+        return self._lists[assignment].get(file_id)
+
+    def search(
+        self,
+        query,
+        k: int = 1,
+        exclude: Optional[str] = None,
+        nprobe: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """query와 가까운 nprobe개 목록에서 코사인 유사도가 높은 순으로 최대 k개의 (file_id, 유사도)를 반환합니다."""
+        if not self._list_of or k <= 0:
+            return []
+        query = normalize(query).reshape(-1)
+        if not self.is_trained:
+            return self._lists[0].search(query, k, exclude)
+
+        nprobe = min(nprobe or self.nprobe, len(self._lists))
+        centroid_scores = self.centroids @ query
+        probes = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        matches: List[Tuple[str, float]] = []
+        for probe in probes:
+            matches.extend(self._lists[probe].search(query, k, exclude))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches[:k]
+
+    async def restore(self):
+        """vector_index에 남아 있는 벡터로 목록을 다시 만듭니다.
+
+        저장된 대표 벡터가 있으면 다시 학습하지 않고, RESTORE_CHUNK_ROWS개씩 읽어 별도 스레드에서 목록을 정합니다.
+        그동안 add()/remove()로 바뀐 벡터는 바뀐 내용을 유지합니다.
+        """
+        if self.vector_index is None:
+            return
+        await self.vector_index.restore()
+        if self._training:
+            return
+        if not self.is_trained and self.state_path is not None and os.path.exists(self.state_path):
+            centroids = await asyncio.to_thread(self._read_state)
+            if centroids is not None and not self.is_trained:
+                self._use_centroids(centroids)
+        self._training = True
+        self._dirty = set()
+        try:
+            for file_ids, vectors in self.vector_index.iter_vectors(RESTORE_CHUNK_ROWS):
+                assignments = await asyncio.to_thread(self._assign, vectors)
+                # 나누는 동안 추가/교체되었거나 삭제된 벡터는 제외
+                positions = [
+                    position for position, file_id in enumerate(file_ids)
+                    if file_id not in self._dirty and file_id not in self._list_of
+                ]
+                if positions:
+                    self._add_to_lists([file_ids[position] for position in positions], vectors[positions], assignments[positions])
+            logger.info(f"IVF 인덱스 복원 완료. size: {len(self)}, trained: {self.is_trained}")
+        finally:
+            self._training = False
+            self._dirty = set()
+
+    def needs_training(self) -> bool:
+        """학습 전이고 train_size개 이상 모였으면 True"""
+        return not self.is_trained and not self._training and len(self) >= self.train_size
+
+    async def train(self):
+        """저장된 벡터의 표본으로 대표 벡터를 (다시) 학습하고 모든 벡터를 목록에 다시 나눕니다.
+
+        표본 추출, k-means, 목록 배정은 별도 스레드에서 수행하고 벡터는 RESTORE_CHUNK_ROWS개씩 읽으므로
+        그동안에도 기존 목록으로 검색하고 추가/삭제를 받습니다.
+        학습이 끝나면 루프에서 새 목록으로 바꾸고, 학습 중 바뀐 벡터를 다시 반영합니다.
+        """
+        if self._training or not self._list_of:
+            return
+        self._training = True
+        self._dirty = set()
+        try:
+            sample = await asyncio.to_thread(self._sample)
+            centroids = await asyncio.to_thread(train_kmeans, sample, self.nlist, self.kmeans_iterations, self.seed)
+            # 목록이 많으므로 처음 용량을 작게 잡고 필요할 때 늘림
+            lists = [
+                ExactIndex(self.dimensions, initial_capacity=LIST_INITIAL_CAPACITY)
+                for _ in range(centroids.shape[0])
+            ]
+            list_of: Dict[str, int] = {}
+            for file_ids, vectors in self._iter_stored():
+                assignments = await asyncio.to_thread(assign_clusters, vectors, centroids)
+                # 학습 중 바뀐 벡터는 _apply에서 현재 값으로 다시 넣음
+                for assignment in np.unique(assignments):
+                    members = [
+                        member for member in np.flatnonzero(assignments == assignment)
+                        if file_ids[member] not in self._dirty and file_ids[member] not in list_of
+                    ]
+                    if not members:
+                        continue
+                    lists[assignment].add_many([file_ids[member] for member in members], vectors[members])
+                    for member in members:
+                        list_of[file_ids[member]] = int(assignment)
+            self._apply(centroids, lists, list_of)
+            logger.info(f"IVF 인덱스 학습 완료. size: {len(self)}, nlist: {centroids.shape[0]}")
+        finally:
+            self._training = False
+            self._dirty = set()
+        self._save()
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        if not self.is_trained:
+            return np.zeros(vectors.shape[0], dtype=np.int64)
+        return assign_clusters(vectors, self.centroids)
+
+    def _sample(self) -> np.ndarray:
+        """학습에 쓸 최대 max_train_points개의 표본. 목록별로 크기에 비례해 고릅니다."""
+        if self.vector_index is not None:
+            return self.vector_index.sample(self.max_train_points, self.seed)
+        total = len(self)
+        return np.concatenate([
+            index.sample(-(-self.max_train_points * len(index) // total), self.seed)
+            for index in list(self._lists) if len(index)
+        ])
+
+    def _iter_stored(self):
+        if self.vector_index is not None:
+            yield from self.vector_index.iter_vectors(RESTORE_CHUNK_ROWS)
+            return
+        for index in list(self._lists):
+            yield from index.iter_vectors(RESTORE_CHUNK_ROWS)
+
+    def _apply(self, centroids: np.ndarray, lists: List[ExactIndex], list_of: Dict[str, int]):
+        # 학습 중 바뀐 벡터는 현재 값으로 다시 넣고, 삭제된 것은 빼고 바꿈
+        dirty = {file_id: self.get(file_id) for file_id in self._dirty}
+        for file_id in dirty:
+            assignment = list_of.pop(file_id, None)
+            if assignment is not None:
+                lists[assignment].remove(file_id)
+        self.centroids = centroids
+        self._lists = lists
+        self._list_of = list_of
+        self._training = False
+        present = [(file_id, vector) for file_id, vector in dirty.items() if vector is not None]
+        if present:
+            self._add_to_lists([file_id for file_id, _ in present], np.stack([vector.copy() for _, vector in present]))
+
+    def _use_centroids(self, centroids: np.ndarray):
+        """저장된 대표 벡터로 빈 목록을 만들고, 그 전에 추가된 벡터를 다시 나눕니다."""
+        previous = [(index.ids, index.vectors.copy()) for index in self._lists if len(index)]
+        if self.dimensions is None:
+            self.dimensions = centroids.shape[1]
+        self.centroids = centroids
+        self._lists = [
+            ExactIndex(self.dimensions, initial_capacity=LIST_INITIAL_CAPACITY)
+            for _ in range(centroids.shape[0])
+        ]
+        self._list_of = {}
+        for file_ids, vectors in previous:
+            self._add_to_lists(file_ids, vectors)
+
+    def _save(self):
+        if self.state_path is None or not self.is_trained:
+            return
+        # 임시 파일에 쓰고 교체해 중간에 멈춰도 이전 대표 벡터가 남도록 함
+        temp_path = self.state_path + ".tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                np.save(f, self.centroids)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            logger.warning(f"IVF 대표 벡터 저장 실패. path: {self.state_path}, error: {e}")
+
+    def _read_state(self) -> Optional[np.ndarray]:
+        try:
+            centroids = np.load(self.state_path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"IVF 대표 벡터를 읽지 못해 다시 학습합니다. path: {self.state_path}, error: {e}")
+            return None
+        if centroids.ndim != 2 or centroids.shape[1] != self.vector_index.dimensions:
+            logger.warning(f"IVF 대표 벡터의 차원이 달라 다시 학습합니다. path: {self.state_path}")
+            return None
+        return centroids
+
+    def needs_compaction(self) -> bool:
+        return self.vector_index is not None and self.vector_index.needs_compaction()
+
+    async def compact(self):
+        if self.vector_index is not None:
+            await self.vector_index.compact()
+
+    def flush(self):
+        if self.vector_index is not None:
+            self.vector_index.flush()
+
+    def close(self):
+        if self.vector_index is not None:
+            self.vector_index.close()
+
+    def stats(self) -> dict:
+        """현재 지표를 반환합니다."""
+        sizes = [len(index) for index in self._lists]
+        return {
+            "type": "ivf",
+            "size": len(self._list_of),
+            "dimensions": self.dimensions,
+            "trained": self.is_trained,
+            "nlist": len(self._lists),
+            "nprobe": self.nprobe,
+            "max_list_size": max(sizes),
+            "memory_bytes": sum(index.stats()["memory_bytes"] for index in self._lists),
+            "vectors": None if self.vector_index is None else self.vector_index.stats(),
+        }
@@ -0,0 +1,361 @@
+import asyncio
+import logging
+import math
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.main.ai.similarity.EmbeddingIndex import ExactIndex, normalize, top_k_rows
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 밴드 키를 uint64 하나로 만들기 위한 밴드당 최대 비트 수
+MAX_ROWS_PER_BAND = 64
+# 정렬된 버킷 배열에 합치지 않고 직접 비교하는 최근 추가 행의 최대 수
+MERGE_ROWS = 4096
+# 복원 시 한 번에 읽어 해시하는 행 수
+RESTORE_CHUNK_ROWS = 8192
+
+
+def collision_probability(similarity: float, rows: int, bands: int) -> float:
+    """코사인 유사도가 similarity인 두 벡터가 bands개 밴드 중 하나 이상에서 같은 버킷에 들어갈 확률
+
+    무작위 초평면 하나에서 두 벡터의 비트가 같을 확률은 1 - 각도 / pi이고,
+    rows개 비트가 모두 같아야 한 밴드에서 만나므로 1 - (1 - p^rows)^bands입니다.
+    """
+    bit_probability = 1 - math.acos(max(-1.0, min(1.0, similarity))) / math.pi
+    return 1 - (1 - bit_probability ** rows) ** bands
+
+
+def bands_for_false_negative_rate(similarity: float, rows: int, false_negative_rate: float) -> int:
+    """유사도가 similarity 이상인 벡터를 후보에서 놓칠 확률이 false_negative_rate 이하가 되는 최소 밴드 수"""
+    bit_probability = 1 - math.acos(max(-1.0, min(1.0, similarity))) / math.pi
+    band_miss = 1 - bit_probability ** rows
+    if band_miss <= 0:
+        return 1
+    return max(1, math.ceil(math.log(false_negative_rate) / math.log(band_miss)))
+
+
+def sort_buckets(signatures: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(N, bands) 밴드 키를 밴드별로 정렬한 (bands, N) 키 배열과 각 키의 행 번호 배열을 반환합니다."""
+    order = np.argsort(signatures, axis=0, kind="stable")
+    keys = np.take_along_axis(signatures, order, axis=0)
+    return np.ascontiguousarray(keys.T), np.ascontiguousarray(order.T, dtype=np.int32)
+
+
+class SimHasher:
+    """무작위 초평면 부호로 만든 SimHash 비트를 rows개씩 묶어 밴드별 버킷 키(uint64)를 계산합니다."""
+
+    def __init__(self, dimensions: int, bands: int, rows: int, seed: int = 0):
+        if not 0 < rows <= MAX_ROWS_PER_BAND:
+            raise ValueError(f"rows는 1 이상 {MAX_ROWS_PER_BAND} 이하여야 합니다.")
+        self.dimensions = dimensions
+        self.bands = bands
+        self.rows = rows
+        rng = np.random.default_rng(seed)
+        self.hyperplanes = rng.standard_normal((bands * rows, dimensions)).astype(np.float32)
+        self._weights = np.left_shift(np.uint64(1), np.arange(rows, dtype=np.uint64))
+
+    def band_keys(self, vectors: np.ndarray) -> np.ndarray:
+        """(N, dimensions) 벡터의 (N, bands) uint64 밴드 키를 반환합니다."""
+        bits = (vectors @ self.hyperplanes.T > 0).reshape(vectors.shape[0], self.bands, self.rows)
+        return (bits.astype(np.uint64) * self._weights).sum(axis=2, dtype=np.uint64)
+
+
+class LSHIndex:
+    """SimHash 밴드 버킷으로 후보를 고른 뒤 후보만 정확한 코사인 유사도로 비교하는 인덱스
+
+    파일마다 밴드 키를 (N, bands) uint64 행렬의 한 행으로 두고, 밴드별로 정렬한 키 배열과 행 번호 배열을
+    버킷으로 사용하므로 후보 조회는 bands번의 이진 탐색입니다. 최근 추가한 MERGE_ROWS개 이하의 행은
+    정렬 배열에 합치기 전까지 직접 비교하고, 교체/삭제된 행은 compact()가 정리합니다.
+    rows를 늘리면 후보가 줄어 빨라지고, bands를 늘리면 유사한 벡터를 놓칠 확률(false negative)이 줄어듭니다.
+    bands_for_false_negative_rate()로 중복 판정 기준 유사도에서의 놓침 확률에 맞춰 bands를 정할 수 있습니다.
+    원본 벡터는 vector_index(기본 ExactIndex, 예: 디스크의 MemmapIndex)에 저장하며,
+    restore()가 vector_index에 남아 있는 벡터로 버킷을 다시 만듭니다.
+    ExactIndex와 같은 인터페이스를 제공하며 이벤트 루프 안에서만 사용합니다.
+    """
+
+    # 기본값은 유사도 0.95에서 놓침 확률 약 1%, 무관한(유사도 0) 벡터가 후보가 될 확률 약 0.04%
+    def __init__(
+        self,
+        bands: int = 23,
+        rows: int = 16,
+        vector_index=None,
+        seed: int = 0,
+        initial_capacity: int = 1024,
+        compact_ratio: float = 0.2,
+        compact_min_rows: int = 1024,
+    ):
+        self.bands = bands
+        self.rows = rows
+        self.seed = seed
+        self.vector_index = vector_index if vector_index is not None else ExactIndex()
+        self.initial_capacity = initial_capacity
+        self.compact_ratio = compact_ratio
+        self.compact_min_rows = compact_min_rows
+        self.hasher: Optional[SimHasher] = None
+
+        # 행 번호별 file_id와 밴드 키. 교체/삭제된 행은 _alive만 끄고 압축 시 정리
+        self._signatures = np.empty((0, bands), dtype=np.uint64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        # [0, _merged) 행의 밴드별 정렬 키와 행 번호. 이후 행은 _signatures를 직접 비교
+        self._bucket_keys = np.empty((bands, 0), dtype=np.uint64)
+        self._bucket_rows = np.empty((bands, 0), dtype=np.int32)
+        self._merged = 0
+        # 별도 스레드에서 버킷을 만드는 동안에는 정렬 배열에 합치지 않음
+        self._building = False
+
+        # 지표
+        self.searches = 0
+        self.candidates = 0
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, file_id: str) -> bool:
+        return file_id in self._rows
+
+    @property
+    def dimensions(self) -> Optional[int]:
+        return self.vector_index.dimensions
+
+    @property
+    def synced_at(self):
+        return self.vector_index.synced_at
+
+    @synced_at.setter
+    def synced_at(self, value):
+        self.vector_index.synced_at = value
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self.vector_index.vectors
+
+    @property
+    def dead_rows(self) -> int:
+        """교체/삭제되어 압축 시 정리될 행 수"""
+        return len(self._ids) - len(self._rows)
+
+    def add(self, file_id: str, vector):
+        """벡터 하나를 추가합니다. 이미 있는 file_id면 벡터를 교체합니다."""
+        self.add_many([file_id], np.asarray(vector, dtype=np.float32).reshape(1, -1))
+
+    def add_many(self, file_ids: Iterable[str], vectors: np.ndarray):
+        """(N, dimensions) 행렬을 저장하고 밴드 버킷에 넣습니다."""
+        file_ids = list(file_ids)
+        vectors = normalize(vectors)
+        # 차원 검사는 vector_index가 수행
+        self.vector_index.add_many(file_ids, vectors)
+        if file_ids:
+            self._append(file_ids, self._hasher(vectors.shape[1]).band_keys(vectors))
+
+    def remove(self, file_id: str) -> bool:
+        row = self._rows.pop(file_id, None)
+        if row is not None:
+            self._alive[row] = False
+        return self.vector_index.remove(file_id)
+
+    def get(self, file_id: str) -> Optional[np.ndarray]:
+        """저장된 정규화 벡터를 반환합니다. 없으면 None을 반환합니다."""
+        return self.vector_index.get(file_id)
+
+    def candidates_for(self, query) -> Set[str]:
+        """query와 한 밴드 이상에서 같은 버킷에 있는 file_id 집합을 반환합니다."""
+        return {self._ids[row] for row in self._candidate_rows(query)}
+
+    def search(self, query, k: int = 1, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """후보 중 query와 코사인 유사도가 높은 순으로 최대 k개의 (file_id, 유사도)를 반환합니다.
+
+        후보에 들지 못한 벡터는 유사하더라도 반환하지 않습니다.
+        """
+        if not self._rows or k <= 0:
+            return []
+        query = normalize(query).reshape(-1)
+        rows = self._candidate_rows(query)
+        if exclude is not None and exclude in self._rows:
+            rows = rows[rows != self._rows[exclude]]
+        self.searches += 1
+        self.candidates += len(rows)
+        if not len(rows):
+            return []
+
+        file_ids = [self._ids[row] for row in rows]
+        scores = np.stack([self.vector_index.get(file_id) for file_id in file_ids]) @ query
+        top_rows = top_k_rows(scores, k)
+        return [(file_ids[row], float(scores[row])) for row in top_rows]
+
+    async def restore(self):
+        """vector_index에 남아 있는 벡터로 밴드 버킷을 다시 만듭니다.
+
+        RESTORE_CHUNK_ROWS개씩 읽어 별도 스레드에서 해시하고, 마지막에 정렬된 버킷 배열을 별도 스레드에서 만듭니다.
+        그동안 add()/remove()로 바뀐 벡터는 바뀐 내용을 유지합니다.
+        """
+        await self.vector_index.restore()
+        if self._building:
+            return
+        self._building = True
+        try:
+            for file_ids, vectors in self.vector_index.iter_vectors(RESTORE_CHUNK_ROWS):
+                keys = await asyncio.to_thread(self._hasher(vectors.shape[1]).band_keys, vectors)
+                # 해시하는 동안 추가/교체되었거나 삭제된 벡터는 제외
+                positions = [
+                    position for position, file_id in enumerate(file_ids)
+                    if file_id not in self._rows and file_id in self.vector_index
+                ]
+                if positions:
+                    self._append([file_ids[position] for position in positions], keys[positions])
+            count = len(self._ids)
+            # 기존 행은 바뀌지 않고 새 행은 count 이후에 추가되므로 루프 밖에서 읽어도 안전
+            self._bucket_keys, self._bucket_rows = await asyncio.to_thread(sort_buckets, self._signatures[:count])
+            self._merged = count
+        finally:
+            self._building = False
+        self._merge_if_needed()
+        logger.info(f"LSH 인덱스 복원 완료. size: {len(self)}")
+
+    def needs_training(self) -> bool:
+        # 초평면은 학습하지 않음
+        return False
+
+    async def train(self):
+        pass
+
+    def needs_compaction(self) -> bool:
+        return self.vector_index.needs_compaction() or self._needs_compaction()
+
+    async def compact(self):
+        """vector_index를 압축하고, 정리할 행이 많으면 살아 있는 행만 남겨 버킷을 다시 만듭니다.
+
+        버킷은 현재 행까지의 스냅숏으로 별도 스레드에서 만들고, 그동안 바뀐 행은 끝난 뒤 반영합니다.
+        """
+        if self.vector_index.needs_compaction():
+            await self.vector_index.compact()
+        if not self._needs_compaction() or self._building:
+            return
+        self._building = True
+        try:
+            snapshot = len(self._ids)
+            live_rows = np.flatnonzero(self._alive[:snapshot])
+            signatures, bucket_keys, bucket_rows = await asyncio.to_thread(
+                self._compacted_buckets, self._signatures, live_rows
+            )
+            self._switch_rows(live_rows, snapshot, signatures, bucket_keys, bucket_rows)
+        finally:
+            self._building = False
+        self._merge_if_needed()
+        logger.info(f"LSH 인덱스 압축 완료. rows: {len(self._ids)}")
+
+    def flush(self):
+        self.vector_index.flush()
+
+    def close(self):
+        self.vector_index.close()
+
+    def stats(self) -> dict:
+        """현재 지표를 반환합니다."""
+        return {
+            "type": "lsh",
+            "size": len(self._rows),
+            "rows": len(self._ids),
+            "dead_rows": self.dead_rows,
+            "dimensions": self.dimensions,
+            "bands": self.bands,
+            "rows_per_band": self.rows,
+            "memory_bytes": (
+                self._signatures.nbytes + self._alive.nbytes + self._bucket_keys.nbytes + self._bucket_rows.nbytes
+            ),
+            "mean_candidates": self.candidates / self.searches if self.searches else 0.0,
+            "vectors": self.vector_index.stats(),
+        }
+
+    def _hasher(self, dimensions: int) -> SimHasher:
+        if self.hasher is None:
+            self.hasher = SimHasher(dimensions, self.bands, self.rows, self.seed)
+        return self.hasher
+
+    def _candidate_rows(self, query) -> np.ndarray:
+        """query와 한 밴드 이상에서 키가 같은 살아 있는 행 번호를 반환합니다."""
+        if self.hasher is None:
+            return np.empty(0, dtype=np.int64)
+        keys = self.hasher.band_keys(normalize(query).reshape(1, -1))[0]
+        found = []
+        for band, key in enumerate(keys):
+            bucket = self._bucket_keys[band]
+            left = np.searchsorted(bucket, key, side="left")
+            right = np.searchsorted(bucket, key, side="right")
+            if left < right:
+                found.append(self._bucket_rows[band, left:right])
+        count = len(self._ids)
+        if count > self._merged:
+            found.append(self._merged + np.flatnonzero((self._signatures[self._merged:count] == keys).any(axis=1)))
+        if not found:
+            return np.empty(0, dtype=np.int64)
+        rows = np.unique(np.concatenate(found))
+        return rows[self._alive[rows]]
+
+    def _append(self, file_ids: List[str], keys: np.ndarray):
+        start = len(self._ids)
+        self._reserve(start + len(file_ids))
+        self._signatures[start:start + len(file_ids)] = keys
+        for offset, file_id in enumerate(file_ids):
+            previous = self._rows.get(file_id)
+            if previous is not None:
+                self._alive[previous] = False
+            self._rows[file_id] = start + offset
+            self._alive[start + offset] = True
+        self._ids.extend(file_ids)
+        self._merge_if_needed()
+
+    def _merge_if_needed(self):
+        """직접 비교하는 최근 행이 MERGE_ROWS개를 넘으면 정렬된 버킷 배열에 삽입합니다."""
+        count = len(self._ids)
+        if self._building or count - self._merged < MERGE_ROWS:
+            return
+        new_keys, new_rows = sort_buckets(self._signatures[self._merged:count])
+        bucket_keys = np.empty((self.bands, count), dtype=np.uint64)
+        bucket_rows = np.empty((self.bands, count), dtype=np.int32)
+        for band in range(self.bands):
+            positions = np.searchsorted(self._bucket_keys[band], new_keys[band])
+            bucket_keys[band] = np.insert(self._bucket_keys[band], positions, new_keys[band])
+            bucket_rows[band] = np.insert(self._bucket_rows[band], positions, new_rows[band] + self._merged)
+        self._bucket_keys, self._bucket_rows = bucket_keys, bucket_rows
+        self._merged = count
+
+    def _needs_compaction(self) -> bool:
+        dead_rows = self.dead_rows
+        return dead_rows >= self.compact_min_rows and dead_rows >= self.compact_ratio * len(self._ids)
+
+    @staticmethod
+    def _compacted_buckets(signatures: np.ndarray, live_rows: np.ndarray):
+        signatures = signatures[live_rows]
+        return (signatures, *sort_buckets(signatures))
+
+    def _switch_rows(self, live_rows: np.ndarray, snapshot: int, signatures, bucket_keys, bucket_rows):
+        old_ids, old_alive, old_signatures = self._ids, self._alive, self._signatures
+        self._ids = [old_ids[row] for row in live_rows]
+        self._rows = {file_id: row for row, file_id in enumerate(self._ids)}
+        self._signatures = signatures
+        self._alive = np.ones(len(live_rows), dtype=bool)
+        self._bucket_keys, self._bucket_rows = bucket_keys, bucket_rows
+        self._merged = len(live_rows)
+
+        # 압축하는 동안 삭제되거나 교체된 행을 반영한 뒤 새로 추가된 행을 옮김
+        for row in np.flatnonzero(~old_alive[live_rows]):
+            self._alive[row] = False
+            del self._rows[self._ids[row]]
+        pending = [row for row in range(snapshot, len(old_ids)) if old_alive[row]]
+        if pending:
+            self._append([old_ids[row] for row in pending], old_signatures[pending])
+
+    def _reserve(self, size: int):
+        capacity = self._signatures.shape[0]
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2, self.initial_capacity)
+        signatures = np.empty((new_capacity, self.bands), dtype=np.uint64)
+        signatures[:len(self._ids)] = self._signatures[:len(self._ids)]
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:len(self._alive)] = self._alive
+        self._signatures, self._alive = signatures, alive
@@ -0,0 +1,364 @@
+import asyncio
+import json
+import logging
+import os
+import numpy as np
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from src.main.ai.similarity.EmbeddingIndex import normalize, top_k_rows
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+META_FILE_NAME = "meta.json"
+FORMAT_VERSION = 1
+# 압축 시 한 번에 복사하는 행 수
+COMPACT_CHUNK_ROWS = 65536
+
+
+class MemmapIndex:
+    """디스크의 float32 행렬을 numpy.memmap으로 열어 사용하는 임베딩 인덱스
+
+    path 디렉터리에 다음 파일을 둡니다.
+    - vectors.<generation>.f32: 정규화된 임베딩 행렬 (행 우선 float32)
+    - ids.<generation>.log: 행 순서대로 추가(+file_id)와 삭제(-file_id)를 기록한 ID 로그
+    - meta.json: 현재 세대, 차원, 마지막 동기화 시각
+
+    시작 시 행렬을 읽지 않고 매핑만 하므로 기동이 빠르고, 실제로 접근한 페이지만 메모리에 올라옵니다.
+    새 벡터는 파일 끝에 추가하고, 교체/삭제된 행은 compact()가 새 세대 파일로 옮기며 정리합니다.
+    ExactIndex와 같은 인터페이스를 제공하며 이벤트 루프 안에서만 사용합니다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        initial_capacity: int = 1024,
+        compact_ratio: float = 0.2,
+        compact_min_rows: int = 1024,
+    ):
+        self.path = path
+        self.initial_capacity = initial_capacity
+        self.compact_ratio = compact_ratio
+        self.compact_min_rows = compact_min_rows
+        self.dimensions: Optional[int] = None
+        self.synced_at: Optional[datetime] = None
+        self.generation = 0
+
+        self._vectors: Optional[np.memmap] = None
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._log = None
+        self._compacting = False
+
+        # 지표
+        self.compactions = 0
+
+        os.makedirs(path, exist_ok=True)
+        self._read_meta()
+        self._open_generation()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, file_id: str) -> bool:
+        return file_id in self._rows
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """살아 있는 벡터 행렬 (복사본)"""
+        if self._vectors is None:
+            return np.empty((0, self.dimensions or 0), dtype=np.float32)
+        count = len(self._ids)
+        return np.asarray(self._vectors[:count][self._alive[:count]])
+
+    @property
+    def ids(self) -> List[str]:
+        """살아 있는 file_id 목록 (vectors와 같은 순서)"""
+        return [file_id for row, file_id in enumerate(self._ids) if self._alive[row]]
+
+    @property
+    def row_count(self) -> int:
+        """현재 세대에 기록된 행 수 (교체/삭제된 행 포함). 이후 추가되는 행은 이 번호부터 시작합니다."""
+        return len(self._ids)
+
+    @property
+    def dead_rows(self) -> int:
+        """교체/삭제되어 압축 시 정리될 행 수"""
+        return len(self._ids) - len(self._rows)
+
+    def add(self, file_id: str, vector):
+        """벡터 하나를 추가합니다. 이미 있는 file_id면 새 행을 추가하고 기존 행은 정리 대상으로 둡니다."""
+        self.add_many([file_id], np.asarray(vector, dtype=np.float32).reshape(1, -1))
+
+    def add_many(self, file_ids: Iterable[str], vectors: np.ndarray):
+        """(N, dimensions) 행렬을 파일 끝에 한 번에 추가합니다."""
+        file_ids = list(file_ids)
+        vectors = normalize(vectors)
+        if vectors.ndim != 2 or vectors.shape[0] != len(file_ids):
+            raise ValueError("file_ids와 vectors의 개수가 맞지 않습니다.")
+        if self.dimensions is None:
+            self.dimensions = vectors.shape[1]
+            self._write_meta()
+        if vectors.shape[1] != self.dimensions:
+            raise ValueError(f"임베딩 차원이 맞지 않습니다. expected: {self.dimensions}, actual: {vectors.shape[1]}")
+        if not file_ids:
+            return
+
+        # 같은 배치 안에서 중복된 file_id는 마지막 벡터만 사용
+        positions = {file_id: position for position, file_id in enumerate(file_ids)}
+        file_ids = list(positions)
+        vectors = vectors[list(positions.values())]
+
+        # 벡터를 먼저 기록한 뒤 ID 로그에 추가해, 중간에 멈춰도 로그에 있는 행은 항상 벡터가 있도록 함
+        start = len(self._ids)
+        self._reserve(start + len(file_ids))
+        self._vectors[start:start + len(file_ids)] = vectors
+        for offset, file_id in enumerate(file_ids):
+            previous = self._rows.get(file_id)
+            if previous is not None:
+                self._alive[previous] = False
+            self._rows[file_id] = start + offset
+            self._alive[start + offset] = True
+        self._ids.extend(file_ids)
+        self._log.write("".join(f"+{file_id}\n" for file_id in file_ids))
+        self._log.flush()
+
+    def iter_vectors(self, batch_size: int = 65536, start_row: int = 0) -> Iterator[Tuple[List[str], np.ndarray]]:
+        """start_row 이후의 살아 있는 (file_id 목록, 벡터 행렬 복사본)을 행 순서대로 batch_size개씩 반환합니다.
+
+        순회를 시작할 때까지의 행만 반환하며, 그 사이 교체/삭제된 행은 건너뜁니다. 압축 중에는 사용하지 않습니다.
+        """
+        count = len(self._ids)
+        for start in range(start_row, count, batch_size):
+            rows = start + np.flatnonzero(self._alive[start:min(start + batch_size, count)])
+            if len(rows):
+                yield [self._ids[row] for row in rows], np.asarray(self._vectors[rows])
+
+    def sample(self, size: int, seed: int = 0) -> np.ndarray:
+        """살아 있는 벡터 중 최대 size개를 무작위로 골라 복사본으로 반환합니다.
+
+        학습용 표본이므로 다른 스레드에서 호출하는 동안 교체/삭제된 행이 섞여도 됩니다.
+        """
+        count = len(self._ids)
+        live_rows = np.flatnonzero(self._alive[:count])
+        vectors = self._vectors
+        if vectors is None or not len(live_rows):
+            return np.empty((0, self.dimensions or 0), dtype=np.float32)
+        if len(live_rows) > size:
+            live_rows = np.sort(np.random.default_rng(seed).choice(live_rows, size, replace=False))
+        return np.asarray(vectors[live_rows])
+
+    def remove(self, file_id: str) -> bool:
+        """벡터를 제거합니다. 행은 압축 시 정리됩니다."""
+        row = self._rows.pop(file_id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._log.write(f"-{file_id}\n")
+        self._log.flush()
+        return True
+
+    def get(self, file_id: str) -> Optional[np.ndarray]:
+        """저장된 정규화 벡터를 반환합니다. 없으면 None을 반환합니다."""
+        row = self._rows.get(file_id)
+        if row is None:
+            return None
+        return self._vectors[row]
+
+    def search(self, query, k: int = 1, exclude: Optional[str] = None) -> List[Tuple[str, float]]:
+        """query와 코사인 유사도가 높은 순으로 최대 k개의 (file_id, 유사도)를 반환합니다."""
+        if not self._rows or k <= 0:
+            return []
+        count = len(self._ids)
+        query = normalize(query).reshape(-1)
+        scores = self._vectors[:count] @ query
+        scores[~self._alive[:count]] = -np.inf
+        if exclude is not None and exclude in self._rows:
+            scores[self._rows[exclude]] = -np.inf
+        rows = top_k_rows(scores, k)
+        return [(self._ids[row], float(scores[row])) for row in rows if np.isfinite(scores[row])]
+
+    async def restore(self):
+        # 시작 시 매핑만 하므로 다시 만들 구조가 없음
+        pass
+
+    def needs_training(self) -> bool:
+        # 학습할 구조가 없음
+        return False
+
+    async def train(self):
+        pass
+
+    def needs_compaction(self) -> bool:
+        """정리할 행이 compact_min_rows 이상이고 전체의 compact_ratio 이상이면 True"""
+        dead_rows = self.dead_rows
+        return dead_rows >= self.compact_min_rows and dead_rows >= self.compact_ratio * len(self._ids)
+
+    async def compact(self):
+        """살아 있는 행만 새 세대 파일로 옮깁니다.
+
+        현재 행까지의 스냅숏을 별도 스레드에서 복사하는 동안에도 추가/삭제를 받을 수 있으며,
+        복사가 끝나면 그 사이의 변경을 새 세대에 반영하고 meta.json을 교체합니다.
+        """
+        if self._compacting or self._vectors is None:
+            return
+        self._compacting = True
+        try:
+            snapshot = len(self._ids)
+            live_rows = np.flatnonzero(self._alive[:snapshot])
+            file_ids = [self._ids[row] for row in live_rows]
+            generation = self.generation + 1
+            # 스냅숏 이전 행은 바뀌지 않으므로 루프 밖에서 읽어도 안전
+            await asyncio.to_thread(self._write_generation, generation, self._vectors, live_rows, file_ids)
+            self._switch_generation(generation, live_rows, snapshot)
+            self.compactions += 1
+            logger.info(f"임베딩 인덱스 압축 완료. generation: {generation}, rows: {len(self._ids)}")
+        finally:
+            self._compacting = False
+
+    def flush(self):
+        """매핑된 벡터, ID 로그, 메타 정보를 디스크에 기록합니다."""
+        if self._vectors is not None:
+            self._vectors.flush()
+        if self._log is not None:
+            self._log.flush()
+        self._write_meta()
+
+    def close(self):
+        self.flush()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        self._vectors = None
+
+    def stats(self) -> dict:
+        """현재 지표를 반환합니다."""
+        return {
+            "type": "memmap",
+            "size": len(self._rows),
+            "rows": len(self._ids),
+            "dead_rows": self.dead_rows,
+            "dimensions": self.dimensions,
+            "generation": self.generation,
+            "file_bytes": 0 if self._vectors is None else self._vectors.nbytes,
+            "compactions": self.compactions,
+        }
+
+    def _vectors_path(self, generation: int) -> str:
+        return os.path.join(self.path, f"vectors.{generation}.f32")
+
+    def _ids_path(self, generation: int) -> str:
+        return os.path.join(self.path, f"ids.{generation}.log")
+
+    def _read_meta(self):
+        meta_path = os.path.join(self.path, META_FILE_NAME)
+        if not os.path.exists(meta_path):
+            return
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 임베딩 인덱스 형식입니다. version: {meta.get('version')}")
+        self.generation = meta["generation"]
+        self.dimensions = meta["dimensions"]
+        self.synced_at = datetime.fromisoformat(meta["synced_at"]) if meta.get("synced_at") else None
+
+    def _write_meta(self):
+        meta = {
+            "version": FORMAT_VERSION,
+            "generation": self.generation,
+            "dimensions": self.dimensions,
+            "synced_at": self.synced_at.isoformat() if self.synced_at else None,
+        }
+        # 임시 파일에 쓰고 교체해 중간에 멈춰도 이전 메타 정보가 남도록 함
+        meta_path = os.path.join(self.path, META_FILE_NAME)
+        temp_path = meta_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, meta_path)
+
+    def _open_generation(self):
+        """현재 세대의 ID 로그를 재생하고 벡터 파일을 매핑합니다."""
+        ids: List[str] = []
+        rows: Dict[str, int] = {}
+        alive: List[bool] = []
+        ids_path = self._ids_path(self.generation)
+        if os.path.exists(ids_path):
+            with open(ids_path, encoding="utf-8") as f:
+                for line in f:
+                    # 기록 도중 멈춰 잘린 마지막 줄은 무시
+                    if not line.endswith("\n"):
+                        break
+                    operation, file_id = line[0], line[1:-1]
+                    previous = rows.pop(file_id, None)
+                    if previous is not None:
+                        alive[previous] = False
+                    if operation == "+":
+                        rows[file_id] = len(ids)
+                        ids.append(file_id)
+                        alive.append(True)
+
+        self._vectors = None
+        capacity = 0
+        vectors_path = self._vectors_path(self.generation)
+        if self.dimensions and os.path.exists(vectors_path):
+            capacity = os.path.getsize(vectors_path) // (self.dimensions * 4)
+            if capacity:
+                self._vectors = np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimensions))
+
+        self._ids = ids
+        self._rows = rows
+        self._alive = np.zeros(max(capacity, len(ids)), dtype=bool)
+        self._alive[:len(alive)] = alive
+        self._log = open(ids_path, "a", encoding="utf-8")
+
+    def _reserve(self, size: int):
+        capacity = 0 if self._vectors is None else self._vectors.shape[0]
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2, self.initial_capacity)
+        vectors_path = self._vectors_path(self.generation)
+        with open(vectors_path, "ab") as f:
+            f.truncate(new_capacity * self.dimensions * 4)
+        self._vectors = np.memmap(vectors_path, dtype=np.float32, mode="r+", shape=(new_capacity, self.dimensions))
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:len(self._alive)] = self._alive
+        self._alive = alive
+
+    def _write_generation(self, generation: int, vectors: np.ndarray, live_rows: np.ndarray, file_ids: List[str]):
+        with open(self._vectors_path(generation), "wb") as f:
+            for start in range(0, len(live_rows), COMPACT_CHUNK_ROWS):
+                f.write(np.ascontiguousarray(vectors[live_rows[start:start + COMPACT_CHUNK_ROWS]]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        with open(self._ids_path(generation), "w", encoding="utf-8") as f:
+            f.write("".join(f"+{file_id}\n" for file_id in file_ids))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _switch_generation(self, generation: int, live_rows: np.ndarray, snapshot: int):
+        old_generation = self.generation
+        old_vectors, old_ids, old_alive = self._vectors, self._ids, self._alive
+        self._log.close()
+
+        self.generation = generation
+        self._open_generation()
+
+        # 복사하는 동안 삭제되거나 교체된 행을 반영한 뒤 새로 추가된 행을 옮김
+        for row in live_rows:
+            if not old_alive[row]:
+                self.remove(old_ids[row])
+        pending = [row for row in range(snapshot, len(old_ids)) if old_alive[row]]
+        if pending:
+            self.add_many([old_ids[row] for row in pending], np.asarray(old_vectors[pending]))
+
+        self._write_meta()
+        del old_vectors
+        for path in (self._vectors_path(old_generation), self._ids_path(old_generation)):
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"이전 세대 파일 삭제 실패. path: {path}, error: {e}")
@@ -0,0 +1,527 @@
+import asyncio
+import logging
+import os
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.main.ai.similarity.EmbeddingIndex import ExactIndex, normalize, top_k_rows
+from src.main.ai.similarity.MemmapIndex import MemmapIndex
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 코드북 할당 시 한 번에 계산하는 행 수 (임시 행렬 크기 제한)
+ENCODE_CHUNK_ROWS = 65536
+# 학습/복원 시 원본 벡터를 한 번에 읽어 인코딩하는 행 수
+RESTORE_CHUNK_ROWS = 8192
+# rerank_index 디렉터리에 저장하는 코드북과 코드 파일
+STATE_FILE_NAME = "pq.npz"
+
+
+def _assign_nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """벡터마다 유클리드 거리가 가장 가까운 centroid 번호를 반환합니다."""
+    # ||x - c||^2 = ||x||^2 - 2x·c + ||c||^2 에서 x마다 같은 ||x||^2는 생략
+    centroid_norms = np.einsum("ij,ij->i", centroids, centroids)
+    assignments = np.empty(vectors.shape[0], dtype=np.int64)
+    for start in range(0, vectors.shape[0], ENCODE_CHUNK_ROWS):
+        chunk = vectors[start:start + ENCODE_CHUNK_ROWS]
+        distances = centroid_norms - 2 * (chunk @ centroids.T)
+        assignments[start:start + chunk.shape[0]] = np.argmin(distances, axis=1)
+    return assignments
+
+
+def _train_subspace(vectors: np.ndarray, clusters: int, iterations: int, rng) -> np.ndarray:
+    """부분 공간 하나의 코드북을 유클리드 k-means로 학습합니다."""
+    centroids = vectors[rng.choice(vectors.shape[0], clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = _assign_nearest(vectors, centroids)
+        counts = np.bincount(assignments, minlength=clusters)
+        # 부분 벡터의 차원이 작으므로 차원별 bincount로 클러스터별 합계를 계산
+        sums = np.stack(
+            [np.bincount(assignments, weights=vectors[:, dimension], minlength=clusters) for dimension in range(vectors.shape[1])],
+            axis=1
+        )
+        present = counts > 0
+        centroids[present] = sums[present] / counts[present, None]
+        # 빈 클러스터는 임의의 벡터로 다시 시작
+        empty = np.flatnonzero(~present)
+        if empty.size:
+            centroids[empty] = vectors[rng.choice(vectors.shape[0], empty.size, replace=False)]
+    return centroids
+
+
+class ProductQuantizer:
+    """벡터를 subvector_dimensions 크기의 부분 벡터로 나누고 부분마다 코드북 번호(uint8) 하나로 압축합니다.
+
+    float32 벡터 하나가 4 * dimensions 바이트에서 dimensions / subvector_dimensions 바이트가 되므로
+    subvector_dimensions가 4면 16배, 8이면 32배 작아집니다. 부분 벡터가 클수록 근사 오차도 커집니다.
+    차원이 subvector_dimensions로 나누어떨어지지 않으면 0으로 채워 맞춥니다.
+    """
+
+    def __init__(self, subvector_dimensions: int = 4, codebook_size: int = 256):
+        if not 1 < codebook_size <= 256:
+            raise ValueError("codebook_size는 2 이상 256 이하여야 합니다.")
+        self.subvector_dimensions = subvector_dimensions
+        self.codebook_size = codebook_size
+        self.dimensions: Optional[int] = None
+        # (subvectors, codebook_size, subvector_dimensions)
+        self.codebooks: Optional[np.ndarray] = None
+
+    @property
+    def subvectors(self) -> int:
+        return -(-self.dimensions // self.subvector_dimensions)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.codebooks is not None
+
+    def train(self, vectors: np.ndarray, iterations: int = 20, seed: int = 0):
+        """부분 공간별 코드북을 학습합니다."""
+        self.dimensions = vectors.shape[1]
+        subvectors = self._split(vectors)
+        # 학습 데이터가 codebook_size보다 적으면 데이터 수만큼만 사용
+        clusters = min(self.codebook_size, vectors.shape[0])
+        rng = np.random.default_rng(seed)
+        codebooks = np.zeros((self.subvectors, clusters, self.subvector_dimensions), dtype=np.float32)
+        for subspace in range(self.subvectors):
+            codebooks[subspace] = _train_subspace(subvectors[subspace], clusters, iterations, rng)
+        self.codebooks = codebooks
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """(N, dimensions) 벡터를 (subvectors, N) uint8 코드로 압축합니다."""
+        subvectors = self._split(vectors)
+        codes = np.empty((self.subvectors, vectors.shape[0]), dtype=np.uint8)
+        for subspace in range(self.subvectors):
+            codes[subspace] = _assign_nearest(subvectors[subspace], self.codebooks[subspace])
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """(subvectors, N) 코드를 근사 벡터 (N, dimensions)로 복원합니다."""
+        parts = [self.codebooks[subspace][codes[subspace]] for subspace in range(self.subvectors)]
+        return np.concatenate(parts, axis=1)[:, :self.dimensions]
+
+    def lookup_table(self, query: np.ndarray) -> np.ndarray:
+        """질의의 부분 벡터와 각 코드북 항목의 내적 (subvectors, codebook_size) 표를 반환합니다."""
+        subvectors = self._split(query.reshape(1, -1))[:, 0, :]
+        return np.einsum("skd,sd->sk", self.codebooks, subvectors).astype(np.float32)
+
+    def scores(self, table: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """lookup_table과 코드로 근사 내적(asymmetric distance)을 계산합니다. 벡터를 복원하지 않습니다."""
+        scores = np.zeros(codes.shape[1], dtype=np.float32)
+        for subspace in range(codes.shape[0]):
+            scores += table[subspace].take(codes[subspace])
+        return scores
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        """(N, dimensions) 벡터를 (subvectors, N, subvector_dimensions)로 나눕니다."""
+        padded = self.subvectors * self.subvector_dimensions
+        if vectors.shape[1] < padded:
+            vectors = np.pad(vectors, ((0, 0), (0, padded - vectors.shape[1])))
+        return vectors.reshape(vectors.shape[0], self.subvectors, self.subvector_dimensions).transpose(1, 0, 2)
+
+
+class PQIndex:
+    """ProductQuantizer 코드만 메모리에 두는 압축 임베딩 인덱스
+
+    학습 전에는 원본 벡터(rerank_index, 없으면 메모리의 ExactIndex)로 전수 비교하고, train_size개가 모이면(needs_training)
+    train()이 표본으로 코드북을 학습하고 원본 벡터를 나눠 읽어 코드로 바꿉니다. 학습과 인코딩은 별도 스레드에서 수행합니다.
+    검색은 질의별 lookup table로 근사 유사도를 계산합니다.
+    rerank_index(예: 디스크의 MemmapIndex)를 주면 원본 벡터를 그곳에 함께 저장하고,
+    근사 유사도 상위 k * rerank_factor개를 원본 벡터로 다시 계산해 정확한 유사도로 반환합니다.
+    rerank_index가 없으면 반환하는 유사도는 양자화 오차가 있는 근사값이므로 중복 판정 기준과 비교하는 데 쓰지 않습니다.
+    이때 동기화 시각은 rerank_index의 것을 사용합니다. rerank_index가 MemmapIndex면 코드북과 코드를 같은 디렉터리에 저장하고,
+    restore()가 이를 읽어 재시작 시 다시 학습하지 않고 저장 이후 추가/교체된 행만 인코딩합니다.
+    ExactIndex와 같은 인터페이스를 제공하며 이벤트 루프 안에서만 사용합니다.
+    """
+
+    def __init__(
+        self,
+        subvector_dimensions: int = 4,
+        codebook_size: int = 256,
+        train_size: Optional[int] = None,
+        kmeans_iterations: int = 20,
+        max_train_points: int = 65536,
+        rerank_index=None,
+        rerank_factor: int = 10,
+        initial_capacity: int = 1024,
+        seed: int = 0,
+    ):
+        self.quantizer = ProductQuantizer(subvector_dimensions, codebook_size)
+        self.train_size = train_size if train_size is not None else codebook_size * 40
+        self.kmeans_iterations = kmeans_iterations
+        self.max_train_points = max_train_points
+        self.rerank_index = rerank_index
+        self.rerank_factor = rerank_factor
+        self.initial_capacity = initial_capacity
+        self.seed = seed
+        self.dimensions: Optional[int] = rerank_index.dimensions if rerank_index is not None else None
+        self.state_path = os.path.join(rerank_index.path, STATE_FILE_NAME) if isinstance(rerank_index, MemmapIndex) else None
+        self._synced_at = None
+
+        # rerank_index가 없을 때 학습 전 원본 벡터 보관
+        self._pending: Optional[ExactIndex] = ExactIndex() if rerank_index is None else None
+        # (subvectors, capacity) uint8. 부분 공간별로 연속되어 lookup이 빠름
+        self._codes: Optional[np.ndarray] = None
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        # 학습/복원 중 추가/삭제된 file_id. 학습 결과를 적용할 때 다시 반영
+        self._training = False
+        self._dirty: Set[str] = set()
+
+    def __len__(self) -> int:
+        if not self.is_trained:
+            return len(self._originals)
+        return len(self._ids)
+
+    def __contains__(self, file_id: str) -> bool:
+        if not self.is_trained:
+            return file_id in self._originals
+        return file_id in self._rows
+
+    @property
+    def is_trained(self) -> bool:
+        return self.quantizer.is_trained
+
+    @property
+    def _originals(self):
+        """학습 전 원본 벡터를 보관하는 인덱스"""
+        return self._pending if self._pending is not None else self.rerank_index
+
+    @property
+    def synced_at(self):
+        if self.rerank_index is not None:
+            return self.rerank_index.synced_at
+        return self._synced_at
+
+    @synced_at.setter
+    def synced_at(self, value):
+        if self.rerank_index is not None:
+            self.rerank_index.synced_at = value
+        self._synced_at = value
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """저장된 벡터 행렬. 학습 후에는 코드에서 복원한 근사 벡터입니다."""
+        if not self.is_trained:
+            return self._originals.vectors
+        return self.quantizer.decode(self._codes[:, :len(self._ids)])
+
+    def add(self, file_id: str, vector):
+        """벡터 하나를 추가합니다. 이미 있는 file_id면 벡터를 교체합니다."""
+        self.add_many([file_id], np.asarray(vector, dtype=np.float32).reshape(1, -1))
+
+    def add_many(self, file_ids: Iterable[str], vectors: np.ndarray):
+        """(N, dimensions) 행렬을 압축해 추가합니다."""
+        file_ids = list(file_ids)
+        vectors = normalize(vectors)
+        if vectors.ndim != 2 or vectors.shape[0] != len(file_ids):
+            raise ValueError("file_ids와 vectors의 개수가 맞지 않습니다.")
+        if self.dimensions is None:
+            self.dimensions = vectors.shape[1]
+        if vectors.shape[1] != self.dimensions:
+            raise ValueError(f"임베딩 차원이 맞지 않습니다. expected: {self.dimensions}, actual: {vectors.shape[1]}")
+        if not file_ids:
+            return
+        if self.rerank_index is not None:
+            self.rerank_index.add_many(file_ids, vectors)
+        self._add_codes(file_ids, vectors)
+
+    def _add_codes(self, file_ids: List[str], vectors: np.ndarray):
+        if self._training:
+            self._dirty.update(file_ids)
+        if not self.is_trained:
+            if self._pending is not None:
+                self._pending.add_many(file_ids, vectors)
+            return
+
+        # 같은 배치 안에서 중복된 file_id는 마지막 벡터만 사용
+        positions = {file_id: position for position, file_id in enumerate(file_ids)}
+        self._put_codes(list(positions), self.quantizer.encode(vectors[list(positions.values())]))
+
+    def _put_codes(self, file_ids: List[str], codes: np.ndarray):
+        new_ids = []
+        new_columns = []
+        for column, file_id in enumerate(file_ids):
+            row = self._rows.get(file_id)
+            if row is not None:
+                self._codes[:, row] = codes[:, column]
+            else:
+                new_ids.append(file_id)
+                new_columns.append(column)
+        if not new_ids:
+            return
+        start = len(self._ids)
+        self._reserve(start + len(new_ids))
+        self._codes[:, start:start + len(new_ids)] = codes[:, new_columns]
+        for offset, file_id in enumerate(new_ids):
+            self._rows[file_id] = start + offset
+        self._ids.extend(new_ids)
+
+    def remove(self, file_id: str) -> bool:
+        """벡터를 제거합니다. 마지막 코드를 빈 자리로 옮겨 코드 배열을 연속으로 유지합니다."""
+        removed = self.rerank_index.remove(file_id) if self.rerank_index is not None else False
+        if self._training:
+            self._dirty.add(file_id)
+        if not self.is_trained:
+            return self._pending.remove(file_id) if self._pending is not None else removed
+        row = self._rows.pop(file_id, None)
+        if row is None:
+            return removed
+        last = len(self._ids) - 1
+        if row != last:
+            last_id = self._ids[last]
+            self._codes[:, row] = self._codes[:, last]
+            self._ids[row] = last_id
+            self._rows[last_id] = row
+        self._ids.pop()
+        return True
+
+    def get(self, file_id: str) -> Optional[np.ndarray]:
+        """저장된 벡터를 반환합니다. rerank_index가 없으면 학습 후에는 코드에서 복원한 근사 벡터입니다."""
+        if self.rerank_index is not None:
+            return self.rerank_index.get(file_id)
+        if not self.is_trained:
+            return self._pending.get(file_id)
+        row = self._rows.get(file_id)
+        if row is None:
+            return None
+        return self.quantizer.decode(self._codes[:, row:row + 1])[0]
+
+    def search(
+        self,
+        query,
+        k: int = 1,
+        exclude: Optional[str] = None,
+        rerank: Optional[bool] = None,
+    ) -> List[Tuple[str, float]]:
+        """query와 유사도가 높은 순으로 최대 k개의 (file_id, 유사도)를 반환합니다.
+
+        rerank가 True(rerank_index가 있으면 기본값)면 반환하는 유사도는 원본 벡터로 계산한 값이고,
+        False면 코드로 계산한 근사 유사도입니다.
+        """
+        if k <= 0:
+            return []
+        query = normalize(query).reshape(-1)
+        if not self.is_trained:
+            return self._originals.search(query, k, exclude)
+        if not self._ids:
+            return []
+
+        rerank = self.rerank_index is not None if rerank is None else rerank
+        count = len(self._ids)
+        scores = self.quantizer.scores(self.quantizer.lookup_table(query), self._codes[:, :count])
+        if exclude is not None and exclude in self._rows:
+            scores[self._rows[exclude]] = -np.inf
+        candidates = top_k_rows(scores, k * self.rerank_factor if rerank else k)
+        candidates = [row for row in candidates if np.isfinite(scores[row])]
+        if not rerank:
+            return [(self._ids[row], float(scores[row])) for row in candidates]
+
+        matches = []
+        for row in candidates:
+            vector = self.rerank_index.get(self._ids[row])
+            if vector is not None:
+                matches.append((self._ids[row], float(np.dot(vector, query))))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches[:k]
+
+    async def restore(self):
+        """저장된 코드북과 코드를 읽어 다시 학습하지 않고 코드를 복원합니다.
+
+        저장 이후 rerank_index에 추가/교체된 행은 RESTORE_CHUNK_ROWS개씩 별도 스레드에서 인코딩합니다.
+        저장 후 rerank_index가 압축되어 세대가 바뀌었으면 코드북만 사용해 모든 행을 다시 인코딩합니다.
+        """
+        if self.rerank_index is not None:
+            await self.rerank_index.restore()
+        if self.state_path is None or self.is_trained or self._training or not os.path.exists(self.state_path):
+            return
+        # 읽는 동안 추가/교체된 벡터는 rerank_index의 새 행이므로 아래에서 함께 인코딩
+        state = await asyncio.to_thread(self._read_state)
+        if state is None or self.is_trained or self._training:
+            return
+        self._training = True
+        self._dirty = set()
+        try:
+            quantizer, file_ids, codes, generation, row_count = state
+            start_row = row_count if generation == self.rerank_index.generation else 0
+            # 저장 이후 삭제된 코드는 버리고, 교체된 코드는 start_row 이후 행에서 다시 인코딩
+            keep = [
+                column for column, file_id in enumerate(file_ids)
+                if start_row and file_id in self.rerank_index
+            ]
+            self.quantizer = quantizer
+            self._set_codes([file_ids[column] for column in keep], codes[:, keep])
+            for chunk_ids, vectors in self.rerank_index.iter_vectors(RESTORE_CHUNK_ROWS, start_row=start_row):
+                chunk_codes = await asyncio.to_thread(quantizer.encode, vectors)
+                # 인코딩하는 동안 추가/교체되었거나 삭제된 벡터는 제외
+                columns = [column for column, file_id in enumerate(chunk_ids) if file_id not in self._dirty]
+                self._put_codes([chunk_ids[column] for column in columns], chunk_codes[:, columns])
+            logger.info(f"PQ 인덱스 복원 완료. size: {len(self._ids)}, restored: {len(keep)}")
+        finally:
+            self._training = False
+            self._dirty = set()
+        await self._save()
+
+    def needs_training(self) -> bool:
+        """학습 전이고 train_size개 이상 모였으면 True"""
+        return not self.is_trained and not self._training and len(self._originals) >= self.train_size
+
+    async def train(self):
+        """원본 벡터의 표본으로 코드북을 학습하고 원본 벡터를 RESTORE_CHUNK_ROWS개씩 읽어 모두 코드로 바꿉니다.
+
+        표본 추출, 학습, 인코딩은 별도 스레드에서 수행하므로 그동안에도 원본 벡터로 검색하고 추가/삭제를 받습니다.
+        끝나면 루프에서 코드로 바꾸고, 학습 중 바뀐 벡터는 현재 값으로 다시 인코딩합니다.
+        """
+        originals = self._originals
+        if self.is_trained or self._training or not len(originals):
+            return
+        self._training = True
+        self._dirty = set()
+        try:
+            sample = await asyncio.to_thread(originals.sample, self.max_train_points, self.seed)
+            quantizer = await asyncio.to_thread(self._fit, sample)
+            file_ids: List[str] = []
+            codes = [np.empty((quantizer.subvectors, 0), dtype=np.uint8)]
+            for chunk_ids, vectors in originals.iter_vectors(RESTORE_CHUNK_ROWS):
+                codes.append(await asyncio.to_thread(quantizer.encode, vectors))
+                file_ids.extend(chunk_ids)
+            self._apply(file_ids, quantizer, np.concatenate(codes, axis=1))
+            logger.info(f"PQ 인덱스 학습 완료. size: {len(self._ids)}, subvectors: {quantizer.subvectors}")
+        finally:
+            self._training = False
+            self._dirty = set()
+        await self._save()
+
+    def _fit(self, sample: np.ndarray) -> ProductQuantizer:
+        quantizer = ProductQuantizer(self.quantizer.subvector_dimensions, self.quantizer.codebook_size)
+        quantizer.train(sample, self.kmeans_iterations, self.seed)
+        return quantizer
+
+    def _apply(self, file_ids: List[str], quantizer: ProductQuantizer, codes: np.ndarray):
+        # 학습 중 바뀐 벡터는 원본 벡터를 버리기 전에 현재 값을 읽어 둠
+        dirty = {file_id: self.get(file_id) for file_id in self._dirty}
+        dirty = {file_id: np.array(vector) for file_id, vector in dirty.items() if vector is not None}
+        keep = [column for column, file_id in enumerate(file_ids) if file_id not in self._dirty]
+
+        self.quantizer = quantizer
+        self._set_codes([file_ids[column] for column in keep], codes[:, keep])
+        # 원본 벡터는 rerank_index에만 남김
+        self._pending = None
+        self._training = False
+        if dirty:
+            self._add_codes(list(dirty), np.stack(list(dirty.values())))
+
+    def _set_codes(self, file_ids: List[str], codes: np.ndarray):
+        self._codes = None
+        self._ids = []
+        self._rows = {}
+        self._reserve(len(file_ids))
+        self._codes[:, :len(file_ids)] = codes
+        self._ids = list(file_ids)
+        self._rows = {file_id: row for row, file_id in enumerate(self._ids)}
+
+    def needs_compaction(self) -> bool:
+        return self.rerank_index is not None and self.rerank_index.needs_compaction()
+
+    async def compact(self):
+        if self.rerank_index is not None:
+            await self.rerank_index.compact()
+            # 압축으로 세대가 바뀌었으므로 다음 복원에서 전체를 다시 인코딩하지 않도록 저장
+            await self._save()
+
+    def flush(self):
+        if self.rerank_index is not None:
+            self.rerank_index.flush()
+
+    def close(self):
+        if self.state_path is not None and self.is_trained and not self._training:
+            self._write_state(*self._state_snapshot())
+        if self.rerank_index is not None:
+            self.rerank_index.close()
+
+    def stats(self) -> dict:
+        """현재 지표를 반환합니다."""
+        if not self.is_trained:
+            memory_bytes = self._pending.stats()["memory_bytes"] if self._pending is not None else 0
+        else:
+            memory_bytes = self._codes.nbytes + self.quantizer.codebooks.nbytes
+        return {
+            "type": "pq",
+            "size": len(self),
+            "dimensions": self.dimensions,
+            "trained": self.is_trained,
+            "bytes_per_vector": self.quantizer.subvectors if self.is_trained else None,
+            "memory_bytes": memory_bytes,
+            "rerank": None if self.rerank_index is None else self.rerank_index.stats(),
+        }
+
+    async def _save(self):
+        """코드북과 코드를 state_path에 저장합니다. 저장하는 동안 추가된 행은 복원 시 다시 인코딩합니다."""
+        if self.state_path is None or not self.is_trained or self._training:
+            return
+        try:
+            await asyncio.to_thread(self._write_state, *self._state_snapshot())
+        except OSError as e:
+            logger.warning(f"PQ 인덱스 상태 저장 실패. path: {self.state_path}, error: {e}")
+
+    def _state_snapshot(self):
+        count = len(self._ids)
+        return (
+            self.quantizer.codebooks,
+            list(self._ids),
+            self._codes[:, :count].copy(),
+            self.rerank_index.generation,
+            self.rerank_index.row_count,
+        )
+
+    def _write_state(self, codebooks: np.ndarray, file_ids: List[str], codes: np.ndarray, generation: int, row_count: int):
+        # 임시 파일에 쓰고 교체해 중간에 멈춰도 이전 상태가 남도록 함
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(
+                f,
+                codebooks=codebooks,
+                ids=np.array([file_id.encode() for file_id in file_ids], dtype=bytes),
+                codes=codes,
+                dimensions=self.quantizer.dimensions,
+                generation=generation,
+                rows=row_count,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.state_path)
+
+    def _read_state(self):
+        try:
+            with np.load(self.state_path) as state:
+                codebooks = state["codebooks"]
+                file_ids = [file_id.decode() for file_id in state["ids"].tolist()]
+                codes = state["codes"]
+                dimensions = int(state["dimensions"])
+                generation = int(state["generation"])
+                row_count = int(state["rows"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"PQ 인덱스 상태를 읽지 못해 다시 학습합니다. path: {self.state_path}, error: {e}")
+            return None
+        quantizer = ProductQuantizer(self.quantizer.subvector_dimensions, self.quantizer.codebook_size)
+        quantizer.dimensions = dimensions
+        if (
+            dimensions != self.rerank_index.dimensions
+            or codebooks.shape[0] != quantizer.subvectors
+            or codebooks.shape[1] > quantizer.codebook_size
+            or codebooks.shape[2] != quantizer.subvector_dimensions
+        ):
+            logger.warning(f"PQ 인덱스 설정이 바뀌어 다시 학습합니다. path: {self.state_path}")
+            return None
+        quantizer.codebooks = codebooks
+        return quantizer, file_ids, codes, generation, row_count
+
+    def _reserve(self, size: int):
+        capacity = 0 if self._codes is None else self._codes.shape[1]
+        if self._codes is not None and size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2, self.initial_capacity)
+        codes = np.zeros((self.quantizer.subvectors, new_capacity), dtype=np.uint8)
+        if self._codes is not None:
+            codes[:, :len(self._ids)] = self._codes[:, :len(self._ids)]
+        self._codes = codes
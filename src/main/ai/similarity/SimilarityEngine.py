@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import numpy as np
+from typing import List, Optional, Set, Tuple
+
+from src.main.ai.similarity.EmbeddingIndex import ExactIndex, embedding_to_array, normalize
+from src.main.config.similarity import (
+    SIMILARITY_DUPLICATE_THRESHOLD,
+    SIMILARITY_LOAD_BATCH_SIZE,
+    SIMILARITY_SYNC_INTERVAL
+)
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+
+class SimilarityEngine:
+    """file_embeddings의 임베딩으로 파일의 중복 여부를 프록시 안에서 판정합니다.
+
+    시작 시 load()로 저장된 임베딩을 인덱스에 읽어 두고, 새로 저장되는 임베딩은 add()로 추가합니다.
+    load()가 끝나기 전에는 판정하지 않으므로(ready가 False) 호출 측은 워커 경로를 사용해야 합니다.
+    start()로 시작한 태스크는 sync_interval마다 다른 인스턴스가 저장한 임베딩을 읽어 오고,
+    필요하면 인덱스를 학습하거나 압축합니다. 학습과 압축은 별도 스레드에서 수행해 이벤트 루프를 막지 않습니다.
+    검색(O(N·d) 전수 비교일 수 있음)도 별도 스레드에서 수행하며, 인덱스를 바꾸는 작업(add, load, 학습, 압축)은
+    진행 중인 검색이 끝난 뒤 루프에서 수행합니다. 학습/압축 중에는 판정하지 않고 워커 경로로 보냅니다.
+    """
+
+    def __init__(
+        self,
+        index=None,
+        threshold: float = SIMILARITY_DUPLICATE_THRESHOLD,
+        sync_interval: float = SIMILARITY_SYNC_INTERVAL,
+    ):
+        self.index = index if index is not None else ExactIndex()
+        self.threshold = threshold
+        self.sync_interval = sync_interval
+        self.ready = False
+        self._task: Optional[asyncio.Task] = None
+        # 별도 스레드에서 진행 중인 검색과 학습/압축 여부
+        self._searches: Set[asyncio.Future] = set()
+        self._maintaining = False
+
+        # 지표
+        self.checks = 0
+        self.duplicates = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, repository):
+        """현재 이벤트 루프에서 적재와 동기화 태스크를 시작합니다."""
+        if self.is_running:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(repository))
+
+    async def stop(self):
+        """태스크를 멈추고 인덱스를 닫습니다."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._maintaining = True
+        await self._wait_for_searches()
+        self.index.close()
+
+    async def load(self, repository, batch_size: int = SIMILARITY_LOAD_BATCH_SIZE):
+        """마지막 동기화 이후 저장된 임베딩을 batch_size 단위로 인덱스에 추가합니다.
+
+        디스크 인덱스처럼 이전 내용이 남아 있는 인덱스는 바뀐 임베딩만 읽습니다.
+        처음 적재할 때는 먼저 인덱스가 디스크에 남아 있는 벡터로 검색 구조를 다시 만들도록 합니다.
+        """
+        if not self.ready:
+            await self.index.restore()
+        synced_at = self.index.synced_at
+        file_ids: List[str] = []
+        vectors: List[np.ndarray] = []
+        loaded = 0
+        async for document in repository.find_file_embeddings(batch_size, updated_after=synced_at):
+            file_id = str(document["file_id"])
+            updated_at = document.get("updated_at")
+            if updated_at is not None:
+                # 경계 시각의 문서는 다시 조회되므로 이미 있는 것은 건너뜀
+                if synced_at is not None and updated_at <= synced_at and file_id in self.index:
+                    continue
+                if self.index.synced_at is None or updated_at > self.index.synced_at:
+                    self.index.synced_at = updated_at
+            vector = embedding_to_array(document["embedding"])
+            # 이 인스턴스가 add()로 이미 넣은 임베딩은 다시 추가하지 않음 (디스크 인덱스에 같은 행이 두 번 기록되지 않도록)
+            if self._is_indexed(file_id, vector):
+                continue
+            file_ids.append(file_id)
+            vectors.append(vector)
+            if len(file_ids) >= batch_size:
+                await self._wait_for_searches()
+                loaded += self._add_batch(file_ids, vectors)
+                file_ids, vectors = [], []
+                # 대량 적재 중에도 다른 요청을 처리하도록 이벤트 루프에 양보
+                await asyncio.sleep(0)
+        if file_ids:
+            await self._wait_for_searches()
+            loaded += self._add_batch(file_ids, vectors)
+        if not self.ready:
+            self.ready = True
+            logger.info(f"유사도 인덱스 적재 완료. size: {len(self.index)}, loaded: {loaded}")
+        return loaded
+
+    async def add(self, file_id: str, embedding) -> bool:
+        """임베딩 하나를 인덱스에 추가하거나 교체합니다.
+
+        인덱스와 차원이 다른 임베딩은 추가하지 않고 False를 반환합니다. 이 파일은 워커 경로로 판정됩니다.
+        """
+        await self._wait_for_searches()
+        try:
+            self.index.add(str(file_id), embedding_to_array(embedding))
+        except ValueError as e:
+            logger.warning(f"임베딩을 유사도 인덱스에 추가하지 않습니다. file_id: {file_id}, error: {e}")
+            return False
+        return True
+
+    async def find_duplicate(self, file_id: str) -> Optional[Tuple[Optional[str], float]]:
+        """인덱스에 있는 파일의 중복 여부를 판정합니다.
+
+        판정할 수 없으면(적재 전, 학습/압축 중이거나 파일 임베딩이 없으면) None을 반환하고,
+        판정하면 (가장 유사한 다른 파일 ID, 유사도)를 반환합니다.
+        가장 유사한 파일의 유사도가 threshold 미만이면 파일 ID는 None입니다.
+        """
+        if not self.ready or self._maintaining:
+            return None
+        vector = self.index.get(str(file_id))
+        if vector is None:
+            return None
+
+        self.checks += 1
+        # 요청이 취소되어도 스레드의 검색은 계속되므로 끝날 때까지 _searches에 남김
+        search = asyncio.ensure_future(asyncio.to_thread(self.index.search, np.array(vector), 1, str(file_id)))
+        self._searches.add(search)
+        search.add_done_callback(self._searches.discard)
+        matches = await asyncio.shield(search)
+        if not matches or matches[0][1] < self.threshold:
+            return None, matches[0][1] if matches else 0.0
+        self.duplicates += 1
+        return matches[0]
+
+    def stats(self) -> dict:
+        """현재 지표를 반환합니다."""
+        return {
+            "ready": self.ready,
+            "threshold": self.threshold,
+            "checks": self.checks,
+            "duplicates": self.duplicates,
+            "index": self.index.stats(),
+        }
+
+    async def _run(self, repository):
+        while True:
+            try:
+                await self.load(repository)
+                if self.index.needs_training() or self.index.needs_compaction():
+                    await self._maintain()
+                self.index.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"유사도 인덱스 동기화 실패: {e}")
+            await asyncio.sleep(self.sync_interval)
+
+    async def _maintain(self):
+        # 학습/압축은 인덱스 구조를 바꾸므로 새 검색을 받지 않고 진행 중인 검색이 끝난 뒤 시작
+        self._maintaining = True
+        try:
+            await self._wait_for_searches()
+            if self.index.needs_training():
+                await self.index.train()
+            if self.index.needs_compaction():
+                await self.index.compact()
+        finally:
+            self._maintaining = False
+
+    async def _wait_for_searches(self):
+        """진행 중인 검색 스레드가 모두 끝날 때까지 기다립니다.
+
+        반환 후 다음 await 전까지는 새 검색이 시작되지 않으므로 그 사이에 인덱스를 바꿉니다.
+        """
+        while True:
+            pending = [search for search in self._searches if not search.done()]
+            if not pending:
+                return
+            await asyncio.wait(pending)
+
+    def _is_indexed(self, file_id: str, vector: np.ndarray) -> bool:
+        """file_id가 같은 벡터로 이미 인덱스에 있으면 True"""
+        stored = self.index.get(file_id)
+        if stored is None or stored.shape != vector.shape:
+            return False
+        # 저장 시 정규화를 반복하면 마지막 자리 오차가 생길 수 있으므로 허용 오차로 비교
+        return np.allclose(stored, normalize(vector), rtol=0, atol=1e-6)
+
+    def _add_batch(self, file_ids: List[str], vectors: List[np.ndarray]) -> int:
+        try:
+            self.index.add_many(file_ids, np.stack(vectors))
+        except ValueError as e:
+            # 차원이 다른 임베딩이 섞여 있으면 개별로 추가하고 맞지 않는 것은 건너뜀
+            logger.warning(f"유사도 인덱스 일괄 추가 실패, 개별 추가로 전환: {e}")
+            added = 0
+            for file_id, vector in zip(file_ids, vectors):
+                try:
+                    self.index.add(file_id, vector)
+                    added += 1
+                except ValueError as error:
+                    logger.warning(f"임베딩을 건너뜁니다. file_id: {file_id}, error: {error}")
+            return added
+        return len(file_ids)
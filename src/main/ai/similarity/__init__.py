@@ -0,0 +1,6 @@
+from src.main.ai.similarity.EmbeddingIndex import ExactIndex, embedding_to_array, normalize
+from src.main.ai.similarity.MemmapIndex import MemmapIndex
+from src.main.ai.similarity.IVFIndex import IVFIndex
+from src.main.ai.similarity.PQIndex import PQIndex, ProductQuantizer
+from src.main.ai.similarity.LSHIndex import LSHIndex, SimHasher
+from src.main.ai.similarity.SimilarityEngine import SimilarityEngine
@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import time
+import numpy as np
+from typing import List, Optional
+
+from src.main.ai.similarity.EmbeddingIndex import ExactIndex
+
+
+def generate_clustered_vectors(
+    size: int,
+    dimensions: int,
+    clusters: int = 100,
+    noise: float = 0.3,
+    seed: int = 0,
+) -> np.ndarray:
+    """임베딩처럼 몇 개의 방향에 모여 있는 (size, dimensions) float32 벡터를 생성합니다."""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimensions)).astype(np.float32)
+    members = rng.integers(0, clusters, size)
+    return centers[members] + noise * rng.standard_normal((size, dimensions)).astype(np.float32)
+
+
+def build_index(index, vectors: np.ndarray, batch_size: int = 10000):
+    """vectors를 "0", "1", ... file_id로 index에 추가하고 필요하면 학습합니다."""
+    for start in range(0, vectors.shape[0], batch_size):
+        chunk = vectors[start:start + batch_size]
+        index.add_many([str(row) for row in range(start, start + chunk.shape[0])], chunk)
+    if index.needs_training():
+        asyncio.run(index.train())
+    return index
+
+
+def measure(index, exact: ExactIndex, queries: np.ndarray, k: int = 10, **search_options) -> dict:
+    """exact 검색 결과 대비 index의 recall@k와 질의당 지연 시간(ms)을 측정합니다."""
+    latencies = []
+    hits = 0
+    for query in queries:
+        expected = {file_id for file_id, _ in exact.search(query, k)}
+        started = time.perf_counter()
+        result = index.search(query, k, **search_options)
+        latencies.append((time.perf_counter() - started) * 1000)
+        hits += len(expected & {file_id for file_id, _ in result})
+    latencies = np.array(latencies)
+    return {
+        "recall": hits / (len(queries) * k),
+        "mean_ms": float(latencies.mean()),
+        "p99_ms": float(np.percentile(latencies, 99)),
+    }
+
+
+def run(
+    index,
+    size: int = 100000,
+    dimensions: int = 384,
+    queries: int = 200,
+    k: int = 10,
+    nprobes: Optional[List[int]] = None,
+    seed: int = 0,
+) -> List[dict]:
+    """index와 전수 비교 ExactIndex를 같은 데이터로 만들고 nprobe별 recall과 지연 시간을 반환합니다."""
+    vectors = generate_clustered_vectors(size, dimensions, seed=seed)
+    rng = np.random.default_rng(seed + 1)
+    query_vectors = vectors[rng.choice(size, queries, replace=False)]
+    query_vectors = query_vectors + 0.1 * rng.standard_normal(query_vectors.shape).astype(np.float32)
+
+    exact = build_index(ExactIndex(), vectors)
+    build_index(index, vectors)
+
+    reports = [{"index": "exact", **measure(exact, exact, query_vectors, k)}]
+    for nprobe in nprobes or [None]:
+        options = {} if nprobe is None else {"nprobe": nprobe}
+        reports.append({"index": index.stats()["type"], **options, **measure(index, exact, query_vectors, k, **options)})
+    return reports
+
+
+def main(argv=None) -> int:
+    from src.main.ai.similarity.IVFIndex import IVFIndex
+    from src.main.ai.similarity.LSHIndex import LSHIndex
+    from src.main.ai.similarity.PQIndex import PQIndex
+
+    parser = argparse.ArgumentParser(description="근사 검색 인덱스의 recall과 지연 시간을 전수 비교와 비교합니다.")
+    parser.add_argument("--index", choices=["ivf", "pq", "lsh"], default="ivf")
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--dimensions", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=256)
+    parser.add_argument("--nprobe", type=lambda value: [int(item) for item in value.split(",")], default=[1, 4, 8, 16, 32])
+    parser.add_argument("--subvector-dimensions", type=int, default=4)
+    parser.add_argument("--rerank", action="store_true", help="pq: 원본 벡터로 상위 후보를 다시 계산")
+    parser.add_argument("--bands", type=int, default=23)
+    parser.add_argument("--rows", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    if args.index == "pq":
+        index = PQIndex(
+            subvector_dimensions=args.subvector_dimensions,
+            rerank_index=ExactIndex() if args.rerank else None
+        )
+        nprobes = None
+    elif args.index == "lsh":
+        index = LSHIndex(bands=args.bands, rows=args.rows)
+        nprobes = None
+    else:
+        index = IVFIndex(nlist=args.nlist)
+        nprobes = args.nprobe
+    for report in run(index, args.size, args.dimensions, args.queries, args.k, nprobes):
+        options = f" nprobe={report['nprobe']}" if "nprobe" in report else ""
+        print(
+            f"{report['index']}{options}: recall@{args.k}={report['recall']:.3f}, "
+            f"mean={report['mean_ms']:.2f}ms, p99={report['p99_ms']:.2f}ms"
+        )
+    stats = index.stats()
+    if "memory_bytes" in stats:
+        print(f"index memory: {stats['memory_bytes']} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    # python -m src.main.ai.similarity.benchmark --size 1000000 --nprobe 4,8,16
+    # python -m src.main.ai.similarity.benchmark --index pq --rerank -k 1
+    # python -m src.main.ai.similarity.benchmark --index lsh -k 1
+    raise SystemExit(main())
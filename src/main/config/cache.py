@@ -0,0 +1,260 @@
+import os
+import json
+import time
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 작업 상태 캐시 설정 (환경 변수로 조정 가능)
+STATUS_CACHE_ENABLED = os.getenv("STATUS_CACHE_ENABLED", "true").lower() == "true"
+# local: 태스크별 프로세스 내 캐시, redis: 여러 태스크가 공유하는 Redis 캐시
+STATUS_CACHE_BACKEND = os.getenv("STATUS_CACHE_BACKEND", "local").lower()
+STATUS_CACHE_REDIS_URL = os.getenv("STATUS_CACHE_REDIS_URL", "redis://localhost:6379/0")
+STATUS_CACHE_KEY_PREFIX = os.getenv("STATUS_CACHE_KEY_PREFIX", "ai-proxy:status:")
+STATUS_CACHE_MAX_SIZE = int(os.getenv("STATUS_CACHE_MAX_SIZE", "10000"))
+# 완료된 결과는 바뀌지 않으므로 길게, 진행 중인 결과는 폴링 폭주만 흡수하도록 짧게 유지
+STATUS_CACHE_COMPLETED_TTL = float(os.getenv("STATUS_CACHE_COMPLETED_TTL", "3600"))
+STATUS_CACHE_PENDING_TTL = float(os.getenv("STATUS_CACHE_PENDING_TTL", "1"))
+
+
+def get_status_ttl(is_completed: bool) -> float:
+    """작업 상태 캐시 TTL. 완료된 결과는 바뀌지 않으므로 오래, 진행 중인 결과는 짧게 캐시합니다."""
+    return STATUS_CACHE_COMPLETED_TTL if is_completed else STATUS_CACHE_PENDING_TTL
+
+
+class TTLCache:
+    """크기와 TTL로 항목을 내보내는 프로세스 내 LRU 캐시
+
+    max_size를 넘으면 가장 오래 사용하지 않은 항목부터 내보내고,
+    TTL이 지난 항목은 조회 시 제거합니다. 이벤트 루프 안에서만 사용합니다.
+    """
+
+    def __init__(self, max_size: int, default_ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+
+        # 지표
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시된 값을 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """값을 저장합니다. ttl을 주지 않으면 default_ttl을 사용합니다."""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        self._entries[key] = (value, self._clock() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def delete(self, key: Hashable):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """현재 지표를 반환합니다."""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class StatusCache(ABC):
+    """작업 상태 캐시 인터페이스
+
+    값은 JSON으로 직렬화할 수 있는 dict이며, 키는 문자열 튜플입니다.
+    캐시 오류는 요청을 실패시키지 않고 캐시 미스로 처리해야 합니다.
+    """
+
+    @abstractmethod
+    async def get(self, key: tuple) -> Optional[dict]:
+        pass
+
+    @abstractmethod
+    async def set(self, key: tuple, value: dict, ttl: float):
+        pass
+
+    @abstractmethod
+    async def delete(self, key: tuple):
+        pass
+
+    async def get_many(self, keys: List[tuple]) -> List[Optional[dict]]:
+        """여러 키를 조회합니다. 반환 순서는 keys와 같습니다."""
+        return [await self.get(key) for key in keys]
+
+    async def set_many(self, items: List[Tuple[tuple, dict, float]]):
+        """(key, value, ttl) 목록을 저장합니다."""
+        for key, value, ttl in items:
+            await self.set(key, value, ttl)
+
+    @abstractmethod
+    def stats(self) -> dict:
+        pass
+
+    async def close(self):
+        pass
+
+
+class LocalStatusCache(StatusCache):
+    """TTLCache를 사용하는 프로세스 내 상태 캐시"""
+
+    def __init__(self, max_size: int, default_ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.cache = TTLCache(max_size, default_ttl, clock)
+
+    async def get(self, key: tuple) -> Optional[dict]:
+        return self.cache.get(key)
+
+    async def set(self, key: tuple, value: dict, ttl: float):
+        self.cache.set(key, value, ttl)
+
+    async def delete(self, key: tuple):
+        self.cache.delete(key)
+
+    def stats(self) -> dict:
+        return {"backend": "local", **self.cache.stats()}
+
+    async def close(self):
+        self.cache.clear()
+
+
+class RedisStatusCache(StatusCache):
+    """Redis 프로토콜을 사용하는 공유 상태 캐시
+
+    client는 redis.asyncio.Redis와 같은 비동기 클라이언트입니다.
+    여러 태스크가 같은 Redis를 사용하면 한 태스크가 기록한 결과를 다른 태스크도 조회합니다.
+    """
+
+    def __init__(self, client, key_prefix: str = STATUS_CACHE_KEY_PREFIX):
+        self.client = client
+        self.key_prefix = key_prefix
+
+        # 지표
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def build_key(self, key: tuple) -> str:
+        return self.key_prefix + ":".join(str(part) for part in key)
+
+    async def get(self, key: tuple) -> Optional[dict]:
+        try:
+            raw = await self.client.get(self.build_key(key))
+        except Exception as e:
+            self._record_error("get", e)
+            self.misses += 1
+            return None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: tuple, value: dict, ttl: float):
+        if ttl <= 0:
+            return
+        try:
+            await self.client.set(self.build_key(key), json.dumps(value), px=int(ttl * 1000))
+        except Exception as e:
+            self._record_error("set", e)
+
+    async def delete(self, key: tuple):
+        try:
+            await self.client.delete(self.build_key(key))
+        except Exception as e:
+            self._record_error("delete", e)
+
+    async def get_many(self, keys: List[tuple]) -> List[Optional[dict]]:
+        # MGET 한 번으로 조회
+        if not keys:
+            return []
+        try:
+            raws = await self.client.mget([self.build_key(key) for key in keys])
+        except Exception as e:
+            self._record_error("get_many", e)
+            self.misses += len(keys)
+            return [None] * len(keys)
+        values = []
+        for raw in raws:
+            if raw is None:
+                self.misses += 1
+                values.append(None)
+            else:
+                self.hits += 1
+                values.append(json.loads(raw))
+        return values
+
+    async def set_many(self, items: List[Tuple[tuple, dict, float]]):
+        # 파이프라인 한 번으로 저장
+        items = [(key, value, ttl) for key, value, ttl in items if ttl > 0]
+        if not items:
+            return
+        try:
+            async with self.client.pipeline(transaction=False) as pipeline:
+                for key, value, ttl in items:
+                    pipeline.set(self.build_key(key), json.dumps(value), px=int(ttl * 1000))
+                await pipeline.execute()
+        except Exception as e:
+            self._record_error("set_many", e)
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+    async def close(self):
+        await self.client.aclose()
+
+    def _record_error(self, operation: str, error: Exception):
+        # 캐시 장애 시에도 MongoDB 조회로 응답할 수 있도록 요청을 실패시키지 않음
+        self.errors += 1
+        logger.warning(f"상태 캐시 {operation} 실패: {error}")
+
+
+def create_status_cache() -> StatusCache:
+    """STATUS_CACHE_BACKEND 설정에 따라 상태 캐시를 생성합니다."""
+    if STATUS_CACHE_BACKEND == "redis":
+        # redis 백엔드를 사용할 때만 필요한 의존성
+        from redis.asyncio import Redis
+
+        return RedisStatusCache(Redis.from_url(STATUS_CACHE_REDIS_URL))
+    return LocalStatusCache(STATUS_CACHE_MAX_SIZE, STATUS_CACHE_COMPLETED_TTL)
+
@@ -0,0 +1,214 @@
+import os
+import sys
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import PyMongoError
+
+load_dotenv()
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 시작 시 인덱스 생성 여부
+MONGODB_ENSURE_INDEXES = os.getenv("MONGODB_ENSURE_INDEXES", "true").lower() == "true"
+
+# 컬렉션별 인덱스 정의
+# category_recommendations의 (_id, user_id) 조회는 기본 _id 인덱스로 처리되므로 별도 인덱스를 두지 않습니다.
+# (user_id, is_completed) 인덱스는 사용자의 진행 중인 작업 조회에 사용됩니다.
+INDEXES: Dict[str, List[IndexModel]] = {
+    "category_recommendations": [
+        IndexModel([("user_id", ASCENDING), ("is_completed", ASCENDING)], name="user_id_1_is_completed_1"),
+    ],
+    "file_duplicate_checks": [
+        IndexModel(
+            [("file_id", ASCENDING), ("user_id", ASCENDING)],
+            name="file_id_1_user_id_1",
+            unique=True,
+        ),
+        IndexModel([("user_id", ASCENDING), ("is_completed", ASCENDING)], name="user_id_1_is_completed_1"),
+    ],
+    # 내용이 같은 파일을 찾을 때 사용. 해시가 없는 기존 파일은 인덱스에 넣지 않음
+    "files": [
+        IndexModel(
+            [("sha256", ASCENDING)],
+            name="sha256_1",
+            partialFilterExpression={"sha256": {"$exists": True}},
+        ),
+    ],
+    "file_embeddings": [
+        IndexModel([("file_id", ASCENDING)], name="file_id_1"),
+        # 유사도 인덱스가 마지막 동기화 이후 저장된 임베딩만 읽을 때 사용
+        IndexModel([("updated_at", ASCENDING)], name="updated_at_1"),
+    ],
+    "outbox": [
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_1_next_attempt_at_1"),
+    ],
+}
+
+# 없으면 서비스를 시작하지 않는 인덱스 (collection, name)
+# file_id_1_user_id_1은 같은 파일의 중복 검사 요청이 동시에 생성되는 것을 막는 유일한 장치입니다.
+REQUIRED_INDEXES = {("file_duplicate_checks", "file_id_1_user_id_1")}
+
+# 기존 데이터에 중복이 있어 유니크 인덱스 생성이 실패한 경우 아래 명령으로 정리한 뒤 다시 시작합니다.
+#   python -m src.main.config.indexes --remove-duplicates           # 삭제 대상만 출력
+#   python -m src.main.config.indexes --remove-duplicates --apply   # 삭제 후 인덱스 생성
+REMOVE_DUPLICATES_COMMAND = "python -m src.main.config.indexes --remove-duplicates"
+
+# 마지막 ensure_indexes 결과 (/health/metrics에 노출)
+_index_report: Optional[List[dict]] = None
+
+
+class IndexCreationError(RuntimeError):
+    """필수 인덱스를 생성하지 못했을 때 발생하는 예외"""
+
+
+async def ensure_indexes(db) -> List[dict]:
+    """정의된 인덱스를 생성하고 인덱스별 상태를 반환합니다.
+
+    이미 존재하는 인덱스는 건너뛰므로 여러 번 실행해도 안전합니다.
+    상태는 created, exists, failed 중 하나입니다.
+    """
+    report = []
+    for collection_name, models in INDEXES.items():
+        collection = db.get_collection(collection_name)
+        try:
+            existing = await collection.index_information()
+        except PyMongoError as e:
+            logger.error(f"인덱스 정보 조회 실패. collection: {collection_name}, error: {e}")
+            existing = {}
+
+        for model in models:
+            name = model.document["name"]
+            entry = {"collection": collection_name, "name": name}
+            if name in existing:
+                mismatch = _option_mismatch(model, existing[name]) if (collection_name, name) in REQUIRED_INDEXES else None
+                if mismatch:
+                    # 같은 이름의 다른 인덱스가 있으면 필수 조건(예: unique)을 보장할 수 없음
+                    entry["status"] = "failed"
+                    entry["error"] = f"같은 이름의 인덱스가 다른 옵션으로 존재합니다. {mismatch}"
+                else:
+                    entry["status"] = "exists"
+            else:
+                try:
+                    await collection.create_indexes([model])
+                    entry["status"] = "created"
+                except PyMongoError as e:
+                    entry["status"] = "failed"
+                    entry["error"] = str(e)
+
+            if entry["status"] == "failed":
+                logger.error(f"인덱스 생성 실패. collection: {collection_name}, name: {name}, error: {entry['error']}")
+            else:
+                logger.info(f"인덱스 상태. collection: {collection_name}, name: {name}, status: {entry['status']}")
+            report.append(entry)
+
+    global _index_report
+    _index_report = report
+    return report
+
+
+def _option_mismatch(model: IndexModel, info: dict) -> Optional[str]:
+    """이미 있는 인덱스 정보(index_information 항목)가 model과 키 또는 unique 옵션이 다르면 차이를 설명하는 문자열을 반환합니다."""
+    expected_key = list(model.document["key"].items())
+    actual_key = [tuple(field) for field in info.get("key", [])]
+    if actual_key != expected_key:
+        return f"key: expected {expected_key}, actual {actual_key}"
+    expected_unique = bool(model.document.get("unique", False))
+    actual_unique = bool(info.get("unique", False))
+    if actual_unique != expected_unique:
+        return f"unique: expected {expected_unique}, actual {actual_unique}"
+    return None
+
+
+def get_index_report() -> Optional[List[dict]]:
+    """마지막 ensure_indexes 결과를 반환합니다. 실행 전이면 None을 반환합니다."""
+    return _index_report
+
+
+def check_required_indexes(report: List[dict]):
+    """REQUIRED_INDEXES 중 생성에 실패한 인덱스가 있으면 IndexCreationError를 발생시킵니다."""
+    failed = [
+        entry for entry in report
+        if entry["status"] == "failed" and (entry["collection"], entry["name"]) in REQUIRED_INDEXES
+    ]
+    if failed:
+        names = ", ".join(f"{entry['collection']}.{entry['name']}" for entry in failed)
+        raise IndexCreationError(
+            f"필수 인덱스 생성 실패: {names}. "
+            f"기존 중복 문서를 '{REMOVE_DUPLICATES_COMMAND}'로 확인/정리한 뒤 다시 시작하세요. "
+            f"같은 이름의 인덱스가 다른 옵션으로 있으면 먼저 삭제해야 합니다."
+        )
+
+
+async def remove_duplicate_checks(db, apply: bool = False) -> List[dict]:
+    """file_duplicate_checks에서 (file_id, user_id)가 같은 문서를 하나만 남기고 삭제합니다.
+
+    완료된 요청을 우선으로, 그중 가장 최근에 생성된 문서를 남깁니다.
+    apply가 False이면 삭제하지 않고 그룹별 유지/삭제 대상 _id만 반환합니다.
+    """
+    collection = db.get_collection("file_duplicate_checks")
+    cursor = await collection.aggregate([
+        {"$sort": {"is_completed": DESCENDING, "created_at": DESCENDING}},
+        {"$group": {
+            "_id": {"file_id": "$file_id", "user_id": "$user_id"},
+            "ids": {"$push": "$_id"},
+            "count": {"$sum": 1},
+        }},
+        {"$match": {"count": {"$gt": 1}}},
+    ])
+    groups = await cursor.to_list()
+
+    duplicates = []
+    for group in groups:
+        duplicates.append({
+            "file_id": group["_id"]["file_id"],
+            "user_id": group["_id"]["user_id"],
+            "keep": group["ids"][0],
+            "remove": group["ids"][1:],
+        })
+
+    if apply and duplicates:
+        ids = [_id for duplicate in duplicates for _id in duplicate["remove"]]
+        result = await collection.delete_many({"_id": {"$in": ids}})
+        logger.info(f"중복 검사 요청 중복 문서 삭제 완료. groups: {len(duplicates)}, deleted: {result.deleted_count}")
+    return duplicates
+
+
+async def main(args: List[str]):
+    from src.main.config.mongodb import get_mongo_client, close_mongo_client
+
+    remove_duplicates = "--remove-duplicates" in args
+    apply = "--apply" in args
+    client = get_mongo_client()
+    try:
+        db = client.get_database()
+        if remove_duplicates:
+            duplicates = await remove_duplicate_checks(db, apply=apply)
+            for duplicate in duplicates:
+                action = "삭제" if apply else "삭제 대상"
+                print(
+                    f"file_id: {duplicate['file_id']}, user_id: {duplicate['user_id']}, "
+                    f"유지: {duplicate['keep']}, {action}: {duplicate['remove']}"
+                )
+            print(f"중복 그룹 {len(duplicates)}개")
+            if not apply:
+                # 확인만 하는 경우 인덱스는 만들지 않음
+                return 0
+        report = await ensure_indexes(db)
+    finally:
+        await close_mongo_client()
+
+    for entry in report:
+        line = f"{entry['collection']}.{entry['name']}: {entry['status']}"
+        if "error" in entry:
+            line += f" ({entry['error']})"
+        print(line)
+    return 1 if any(entry["status"] == "failed" for entry in report) else 0
+
+
+if __name__ == "__main__":
+    # python -m src.main.config.indexes [--remove-duplicates [--apply]]
+    raise SystemExit(asyncio.run(main(sys.argv[1:])))
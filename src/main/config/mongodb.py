@@ -1,11 +1,42 @@
 import os
+from typing import Optional
 from dotenv import load_dotenv
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient
 
 load_dotenv()
 
 MONGODB_URL = os.getenv("MONGODB_URL")
 
-def get_mongo_client():
-    client = MongoClient(MONGODB_URL + "?retryWrites=true")
-    return client
+# 커넥션 풀 설정 (환경 변수로 조정 가능)
+MONGODB_MAX_POOL_SIZE = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+MONGODB_MIN_POOL_SIZE = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+MONGODB_MAX_IDLE_TIME_MS = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "60000"))
+
+_client: Optional[AsyncMongoClient] = None
+
+
+def create_mongo_client() -> AsyncMongoClient:
+    """풀 설정이 적용된 새 AsyncMongoClient를 생성합니다."""
+    return AsyncMongoClient(
+        MONGODB_URL + "?retryWrites=true",
+        maxPoolSize=MONGODB_MAX_POOL_SIZE,
+        minPoolSize=MONGODB_MIN_POOL_SIZE,
+        maxIdleTimeMS=MONGODB_MAX_IDLE_TIME_MS,
+    )
+
+
+def get_mongo_client() -> AsyncMongoClient:
+    """프로세스 전역에서 공유하는 AsyncMongoClient를 반환합니다."""
+    global _client
+    if _client is None:
+        _client = create_mongo_client()
+    return _client
+
+
+async def close_mongo_client():
+    """공유 AsyncMongoClient를 닫습니다. 애플리케이션 종료 시 호출됩니다."""
+    global _client
+    if _client is not None:
+        client = _client
+        _client = None
+        await client.close()
@@ -0,0 +1,85 @@
+import os
+import logging
+from dotenv import load_dotenv
+from typing import Optional
+
+load_dotenv()
+
+# 로거 설정
+logger = logging.getLogger(__name__)
+
+# 프록시 내 유사도 검색 설정 (환경 변수로 조정 가능)
+# 활성화하면 시작 시 file_embeddings를 메모리로 읽어 임베딩이 있는 파일은 바로 중복 여부를 판정합니다.
+SIMILARITY_ENABLED = os.getenv("SIMILARITY_ENABLED", "false").lower() == "true"
+# 이 값 이상의 코사인 유사도를 가진 다른 파일이 있으면 중복으로 판정
+SIMILARITY_DUPLICATE_THRESHOLD = float(os.getenv("SIMILARITY_DUPLICATE_THRESHOLD", "0.95"))
+# 시작 시 file_embeddings를 읽어 인덱스에 추가하는 단위
+SIMILARITY_LOAD_BATCH_SIZE = int(os.getenv("SIMILARITY_LOAD_BATCH_SIZE", "1000"))
+# 다른 인스턴스가 저장한 임베딩을 읽어 오는 주기(초)
+SIMILARITY_SYNC_INTERVAL = float(os.getenv("SIMILARITY_SYNC_INTERVAL", "60"))
+# exact: 전수 비교, ivf: k-means 목록 중 일부만 비교하는 근사 검색, pq: 압축 코드로 비교하는 근사 검색,
+# lsh: SimHash 버킷으로 고른 후보만 비교하는 근사 검색
+SIMILARITY_INDEX_TYPE = os.getenv("SIMILARITY_INDEX_TYPE", "exact").lower()
+# exact 인덱스(ivf, pq, lsh는 원본 벡터)를 저장할 디렉터리.
+# 비어 있으면 메모리 인덱스를 사용하고 시작할 때마다 전체를 다시 읽음.
+# pq는 원본 벡터를 이곳에 두어야 메모리가 줄어들며, 비어 있으면 원본 벡터를 메모리에 보관해 재정렬에 사용.
+# ivf의 대표 벡터와 pq의 코드북/코드도 이곳에 저장해 재시작 시 다시 학습하지 않음
+SIMILARITY_INDEX_PATH = os.getenv("SIMILARITY_INDEX_PATH", "")
+# ivf 인덱스의 목록 수와 검색 시 비교할 목록 수 (nprobe를 키우면 재현율, 줄이면 속도가 좋아짐)
+SIMILARITY_IVF_NLIST = int(os.getenv("SIMILARITY_IVF_NLIST", "256"))
+SIMILARITY_IVF_NPROBE = int(os.getenv("SIMILARITY_IVF_NPROBE", "8"))
+# pq 인덱스의 부분 벡터 차원 (4: 16배, 8: 32배 압축)과 재정렬할 후보 배수
+SIMILARITY_PQ_SUBVECTOR_DIMENSIONS = int(os.getenv("SIMILARITY_PQ_SUBVECTOR_DIMENSIONS", "4"))
+SIMILARITY_PQ_RERANK_FACTOR = int(os.getenv("SIMILARITY_PQ_RERANK_FACTOR", "10"))
+# lsh 인덱스의 밴드당 비트 수와 중복 기준 유사도의 파일을 후보에서 놓칠 확률. 밴드 수는 둘로 계산
+SIMILARITY_LSH_ROWS = int(os.getenv("SIMILARITY_LSH_ROWS", "16"))
+SIMILARITY_LSH_FALSE_NEGATIVE_RATE = float(os.getenv("SIMILARITY_LSH_FALSE_NEGATIVE_RATE", "0.01"))
+# 교체/삭제된 행이 이 비율과 개수를 넘으면 디스크 인덱스를 압축
+SIMILARITY_COMPACT_RATIO = float(os.getenv("SIMILARITY_COMPACT_RATIO", "0.2"))
+SIMILARITY_COMPACT_MIN_ROWS = int(os.getenv("SIMILARITY_COMPACT_MIN_ROWS", "1024"))
+
+
+def create_embedding_index(path: Optional[str] = SIMILARITY_INDEX_PATH, index_type: str = SIMILARITY_INDEX_TYPE):
+    """SIMILARITY_INDEX_TYPE, SIMILARITY_INDEX_PATH 설정에 따라 임베딩 인덱스를 생성합니다."""
+    if path:
+        from src.main.ai.similarity.MemmapIndex import MemmapIndex
+
+        disk_index = MemmapIndex(
+            path,
+            compact_ratio=SIMILARITY_COMPACT_RATIO,
+            compact_min_rows=SIMILARITY_COMPACT_MIN_ROWS
+        )
+    else:
+        disk_index = None
+    if index_type == "ivf":
+        from src.main.ai.similarity.IVFIndex import IVFIndex
+
+        # 디스크 인덱스가 있으면 재시작 시 Mongo 대신 디스크에서 목록을 다시 만듦
+        return IVFIndex(nlist=SIMILARITY_IVF_NLIST, nprobe=SIMILARITY_IVF_NPROBE, vector_index=disk_index)
+    if index_type == "pq":
+        from src.main.ai.similarity.PQIndex import PQIndex
+
+        # 중복 판정은 원본 벡터로 다시 계산한 유사도로 해야 하므로 재정렬은 항상 사용.
+        # 경로가 없으면 원본 벡터를 메모리에 두므로 메모리는 줄지 않고 검색 후보만 줄어듦
+        if disk_index is None:
+            from src.main.ai.similarity.EmbeddingIndex import ExactIndex
+
+            logger.warning("SIMILARITY_INDEX_PATH 없이 pq 인덱스를 사용하면 원본 벡터를 메모리에 보관합니다.")
+            disk_index = ExactIndex()
+        return PQIndex(
+            subvector_dimensions=SIMILARITY_PQ_SUBVECTOR_DIMENSIONS,
+            rerank_index=disk_index,
+            rerank_factor=SIMILARITY_PQ_RERANK_FACTOR
+        )
+    if index_type == "lsh":
+        from src.main.ai.similarity.LSHIndex import LSHIndex, bands_for_false_negative_rate
+
+        bands = bands_for_false_negative_rate(
+            SIMILARITY_DUPLICATE_THRESHOLD, SIMILARITY_LSH_ROWS, SIMILARITY_LSH_FALSE_NEGATIVE_RATE
+        )
+        return LSHIndex(bands=bands, rows=SIMILARITY_LSH_ROWS, vector_index=disk_index)
+    if disk_index is not None:
+        return disk_index
+    from src.main.ai.similarity.EmbeddingIndex import ExactIndex
+
+    return ExactIndex()
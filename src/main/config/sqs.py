@@ -0,0 +1,88 @@
+import os
+import threading
+import boto3
+from botocore.config import Config
+from dotenv import load_dotenv
+
+from src.main.config.executor import BoundedExecutor
+
+load_dotenv()
+
+# SQS 클라이언트 설정 (환경 변수로 조정 가능)
+SQS_MAX_POOL_CONNECTIONS = int(os.getenv("SQS_MAX_POOL_CONNECTIONS", "50"))
+SQS_MAX_ATTEMPTS = int(os.getenv("SQS_MAX_ATTEMPTS", "3"))
+SQS_CONNECT_TIMEOUT = float(os.getenv("SQS_CONNECT_TIMEOUT", "2"))
+SQS_READ_TIMEOUT = float(os.getenv("SQS_READ_TIMEOUT", "5"))
+SQS_EXECUTOR_MAX_WORKERS = int(os.getenv("SQS_EXECUTOR_MAX_WORKERS", str(SQS_MAX_POOL_CONNECTIONS)))
+
+_sqs_client = None
+_sqs_client_lock = threading.Lock()
+_sqs_executor = None
+
+
+def get_sqs_config() -> Config:
+    """SQS 클라이언트에 적용할 botocore 설정을 반환합니다."""
+    return Config(
+        max_pool_connections=SQS_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=True,
+        connect_timeout=SQS_CONNECT_TIMEOUT,
+        read_timeout=SQS_READ_TIMEOUT,
+        retries={
+            "max_attempts": SQS_MAX_ATTEMPTS,
+            "mode": "standard",
+        },
+    )
+
+
+def create_sqs_client():
+    """환경에 맞는 자격 증명으로 새 SQS 클라이언트를 생성합니다."""
+    config = get_sqs_config()
+    if os.getenv('ENV') == 'local':
+        aws_profile = os.getenv('AWS_PROFILE', 'default')
+        session = boto3.Session(profile_name=aws_profile)
+        return session.client('sqs', config=config)
+    return boto3.client('sqs', region_name=os.getenv('AWS_REGION'), config=config)
+
+
+def get_sqs_client():
+    """프로세스 전역에서 공유하는 SQS 클라이언트를 반환합니다.
+
+    boto3 클라이언트는 스레드 안전하므로 한 번만 생성하여 재사용합니다.
+    """
+    global _sqs_client
+    if _sqs_client is None:
+        with _sqs_client_lock:
+            if _sqs_client is None:
+                _sqs_client = create_sqs_client()
+    return _sqs_client
+
+
+def close_sqs_client():
+    """공유 SQS 클라이언트를 닫습니다. 애플리케이션 종료 시 호출됩니다."""
+    global _sqs_client
+    with _sqs_client_lock:
+        if _sqs_client is not None:
+            _sqs_client.close()
+            _sqs_client = None
+
+
+def get_sqs_executor() -> BoundedExecutor:
+    """SQS 호출 전용 스레드 풀을 반환합니다.
+
+    boto3 호출은 블로킹이므로 이벤트 루프를 멈추지 않도록 이 풀에서 실행합니다.
+    """
+    global _sqs_executor
+    if _sqs_executor is None:
+        with _sqs_client_lock:
+            if _sqs_executor is None:
+                _sqs_executor = BoundedExecutor(SQS_EXECUTOR_MAX_WORKERS, name="sqs")
+    return _sqs_executor
+
+
+def close_sqs_executor():
+    """SQS 스레드 풀을 종료합니다. 진행 중인 호출이 끝날 때까지 기다립니다."""
+    global _sqs_executor
+    with _sqs_client_lock:
+        if _sqs_executor is not None:
+            _sqs_executor.shutdown(wait=True)
+            _sqs_executor = None
@@ -1,5 +1,15 @@
 from fastapi import APIRouter
 
+from src.main.config.sqs import get_sqs_executor
+from src.main.config.indexes import get_index_report
+from src.main.ai.di.dependencies import (
+    get_sqs_batch_publisher,
+    get_outbox_relay,
+    get_notification_hub,
+    get_status_cache,
+    get_optional_similarity_engine
+)
+
 
 router = APIRouter(
     prefix="/health",
@@ -9,3 +19,17 @@ router = APIRouter(
 @router.get("")
 async def health():
     return {"status": "ok"}
+
+
+@router.get("/metrics")
+async def metrics():
+    similarity = get_optional_similarity_engine()
+    return {
+        "sqs_executor": get_sqs_executor().stats(),
+        "sqs_batch_publisher": get_sqs_batch_publisher().stats(),
+        "outbox_relay": get_outbox_relay().stats(),
+        "notification_hub": get_notification_hub().stats(),
+        "status_cache": get_status_cache().stats(),
+        "similarity": similarity.stats() if similarity is not None else None,
+        "indexes": get_index_report(),
+    }
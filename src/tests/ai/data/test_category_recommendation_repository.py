@@ -1,7 +1,10 @@
+import asyncio
 import pytest
-from unittest.mock import MagicMock, patch, ANY
+from unittest.mock import AsyncMock, MagicMock, patch, ANY
 from bson import ObjectId
 from datetime import datetime, timezone
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
 from src.main.ai.data.CategoryRecommendationRepository import CategoryRecommendationRepository
 
 
@@ -10,7 +13,7 @@ class TestCategoryRecommendationRepository:
         # 목업 MongoDB 클라이언트 생성
         self.mock_client = MagicMock()
         self.mock_db = MagicMock()
-        self.mock_collection = MagicMock()
+        self.mock_collection = AsyncMock()
         
         # 클라이언트에서 DB와 컬렉션 반환하도록 설정
         self.mock_client.get_database.return_value = self.mock_db
@@ -40,7 +43,7 @@ class TestCategoryRecommendationRepository:
         self.mock_collection.insert_one.return_value = MagicMock(inserted_id=mock_id)
         
         # when
-        result = self.repository.create_recommendation_request(file_id, user_id)
+        result = asyncio.run(self.repository.create_recommendation_request(file_id, user_id))
         
         # then
         expected_doc = {
@@ -55,6 +58,23 @@ class TestCategoryRecommendationRepository:
         self.mock_collection.insert_one.assert_called_once()
         assert result == expected_doc
     
+    def test_create_recommendation_requests(self):
+        # given
+        file_ids = ["67dd86ac60a0a6d929904d47", "67dd86ac60a0a6d929904d48"]
+        user_id = "test-user-id"
+        mock_ids = [ObjectId("6123456789abcdef01234567"), ObjectId("6123456789abcdef01234568")]
+        self.mock_collection.insert_many.return_value = MagicMock(inserted_ids=mock_ids)
+        
+        # when
+        result = asyncio.run(self.repository.create_recommendation_requests(file_ids, user_id, session="test-session"))
+        
+        # then - insert_many 한 번으로 생성하고 file_ids 순서대로 반환
+        self.mock_collection.insert_many.assert_called_once()
+        assert self.mock_collection.insert_many.call_args.kwargs["session"] == "test-session"
+        assert [document["_id"] for document in result] == mock_ids
+        assert [document["file_id"] for document in result] == file_ids
+        assert all(document["is_completed"] is False for document in result)
+    
     def test_get_recommendation_by_id(self):
         # given
         request_id = "6123456789abcdef01234567"
@@ -70,7 +90,7 @@ class TestCategoryRecommendationRepository:
         self.mock_collection.find_one.return_value = expected_result
         
         # when
-        result = self.repository.get_recommendation_by_id(request_id, user_id)
+        result = asyncio.run(self.repository.get_recommendation_by_id(request_id, user_id))
         
         # then
         self.mock_collection.find_one.assert_called_once_with({
@@ -85,7 +105,7 @@ class TestCategoryRecommendationRepository:
         user_id = "test-user-id"
         
         # when
-        result = self.repository.get_recommendation_by_id(request_id, user_id)
+        result = asyncio.run(self.repository.get_recommendation_by_id(request_id, user_id))
         
         # then
         assert result is None
@@ -96,10 +116,7 @@ class TestCategoryRecommendationRepository:
         request_id = "6123456789abcdef01234567"
         predicted_category = "기술"
         
-        # MongoDB 응답 설정
-        update_result = MagicMock(modified_count=1)
-        self.mock_collection.update_one.return_value = update_result
-        
+        # MongoDB 응답 설정 - 업데이트 후 문서 반환
         expected_doc = {
             "_id": ObjectId(request_id),
             "file_id": "67dd86ac60a0a6d929904d47",
@@ -108,13 +125,13 @@ class TestCategoryRecommendationRepository:
             "predicted_category": predicted_category,
             "updated_at": datetime(2023, 1, 1, tzinfo=timezone.utc)
         }
-        self.mock_collection.find_one.return_value = expected_doc
+        self.mock_collection.find_one_and_update.return_value = expected_doc
         
         # when
-        result = self.repository.update_recommendation_result(request_id, predicted_category)
+        result = asyncio.run(self.repository.update_recommendation_result(request_id, predicted_category))
         
         # then
-        self.mock_collection.update_one.assert_called_once_with(
+        self.mock_collection.find_one_and_update.assert_called_once_with(
             {"_id": ObjectId(request_id)},
             {
                 "$set": {
@@ -122,9 +139,11 @@ class TestCategoryRecommendationRepository:
                     "predicted_category": predicted_category,
                     "updated_at": datetime(2023, 1, 1, tzinfo=timezone.utc)
                 }
-            }
+            },
+            return_document=ReturnDocument.AFTER
         )
-        self.mock_collection.find_one.assert_called_once_with({"_id": ObjectId(request_id)})
+        self.mock_collection.update_one.assert_not_called()
+        self.mock_collection.find_one.assert_not_called()
         assert result == expected_doc
     
     def test_update_recommendation_result_invalid_id(self):
@@ -133,26 +152,109 @@ class TestCategoryRecommendationRepository:
         predicted_category = "기술"
         
         # when
-        result = self.repository.update_recommendation_result(request_id, predicted_category)
+        result = asyncio.run(self.repository.update_recommendation_result(request_id, predicted_category))
         
         # then
         assert result is None
-        self.mock_collection.update_one.assert_not_called()
-        self.mock_collection.find_one.assert_not_called()
+        self.mock_collection.find_one_and_update.assert_not_called()
     
     def test_update_recommendation_result_not_found(self):
         # given
         request_id = "6123456789abcdef01234567"
         predicted_category = "기술"
         
-        # MongoDB 응답 설정 - modified_count가 0이면 업데이트된 문서가 없음
-        update_result = MagicMock(modified_count=0)
-        self.mock_collection.update_one.return_value = update_result
+        # MongoDB 응답 설정 - 일치하는 문서가 없으면 None
+        self.mock_collection.find_one_and_update.return_value = None
         
         # when
-        result = self.repository.update_recommendation_result(request_id, predicted_category)
+        result = asyncio.run(self.repository.update_recommendation_result(request_id, predicted_category))
         
         # then
-        self.mock_collection.update_one.assert_called_once()
-        self.mock_collection.find_one.assert_not_called()
-        assert result is None 
\ No newline at end of file
+        self.mock_collection.find_one_and_update.assert_called_once()
+        assert result is None
+    
+    def test_get_pending_recommendations(self):
+        # given
+        user_id = "12345678-1234-5678-1234-567812345678"
+        pending_document = {"_id": ObjectId("6123456789abcdef01234567"), "user_id": user_id, "is_completed": False}
+        cursor = MagicMock()
+        cursor.sort.return_value = cursor
+        cursor.limit.return_value = cursor
+        cursor.to_list = AsyncMock(return_value=[pending_document])
+        self.mock_collection.find = MagicMock(return_value=cursor)
+        
+        # when
+        result = asyncio.run(self.repository.get_pending_recommendations(user_id, 100))
+        
+        # then
+        self.mock_collection.find.assert_called_once_with({"user_id": user_id, "is_completed": False})
+        cursor.sort.assert_called_once_with("created_at", -1)
+        cursor.limit.assert_called_once_with(100)
+        assert result == [pending_document]
+    
+    def test_get_recommendations_by_ids(self):
+        # given
+        user_id = "test-user-id"
+        request_ids = ["6123456789abcdef01234567", "invalid-id"]
+        documents = [{"_id": ObjectId(request_ids[0]), "user_id": user_id, "is_completed": True}]
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=documents)
+        self.mock_collection.find = MagicMock(return_value=cursor)
+        
+        # when
+        result = asyncio.run(self.repository.get_recommendations_by_ids(request_ids, user_id))
+        
+        # then - 올바르지 않은 ID는 제외하고 $in 쿼리 한 번으로 조회
+        self.mock_collection.find.assert_called_once_with({
+            "_id": {"$in": [ObjectId(request_ids[0])]},
+            "user_id": user_id
+        })
+        assert result == documents
+    
+    def test_update_recommendation_results(self):
+        # given
+        first_id = "6123456789abcdef01234567"
+        second_id = "6123456789abcdef01234568"
+        updated_document = {"_id": ObjectId(first_id), "user_id": "test-user-id", "is_completed": True}
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[updated_document])
+        self.mock_collection.find = MagicMock(return_value=cursor)
+        
+        # when
+        result = asyncio.run(self.repository.update_recommendation_results([
+            (first_id, "기술"),
+            (second_id, "예술"),
+            ("invalid-id", "기술")
+        ]))
+        
+        # then - 올바른 ID만 unordered bulk_write 한 번으로 기록한 뒤 한 번에 다시 조회
+        self.mock_collection.bulk_write.assert_called_once()
+        operations = self.mock_collection.bulk_write.call_args.args[0]
+        assert len(operations) == 2
+        assert self.mock_collection.bulk_write.call_args.kwargs["ordered"] is False
+        self.mock_collection.find.assert_called_once_with({
+            "_id": {"$in": [ObjectId(first_id), ObjectId(second_id)]},
+            "is_completed": True
+        })
+        assert result == [updated_document]
+    
+    def test_update_recommendation_results_partial_failure(self):
+        # given
+        first_id = "6123456789abcdef01234567"
+        second_id = "6123456789abcdef01234568"
+        self.mock_collection.bulk_write.side_effect = BulkWriteError({
+            "writeErrors": [{"index": 1, "code": 2, "errmsg": "error"}]
+        })
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[])
+        self.mock_collection.find = MagicMock(return_value=cursor)
+        
+        # when
+        asyncio.run(self.repository.update_recommendation_results([(first_id, "기술"), (second_id, "예술")]))
+        
+        # then - 기록에 실패한 항목은 다시 조회하지 않음
+        self.mock_collection.find.assert_called_once_with({
+            "_id": {"$in": [ObjectId(first_id)]},
+            "is_completed": True
+        })
+
@@ -1,7 +1,11 @@
+import asyncio
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from bson import ObjectId
+from bson.binary import Binary, BinaryVectorDtype
 from datetime import datetime, timezone
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from src.main.ai.data.FileDuplicateCheckRepository import FileDuplicateCheckRepository
 
@@ -9,9 +13,9 @@ from src.main.ai.data.FileDuplicateCheckRepository import FileDuplicateCheckRepo
 class TestFileDuplicateCheckRepository:
     def setup_method(self):
         # 목업 MongoDB 클라이언트 생성
-        self.mock_collection = MagicMock()
-        self.mock_files_collection = MagicMock()
-        self.mock_embeddings_collection = MagicMock()
+        self.mock_collection = AsyncMock()
+        self.mock_files_collection = AsyncMock()
+        self.mock_embeddings_collection = AsyncMock()
         self.mock_db = MagicMock()
         
         # 컬렉션 이름에 따라 적절한 mock 객체 반환
@@ -48,16 +52,6 @@ class TestFileDuplicateCheckRepository:
     def test_create_duplicate_check_request(self):
         # given
         expected_document = {
-            "file_id": self.test_file_id,
-            "user_id": self.test_user_id,
-            "is_completed": False,
-            "is_duplicated": None,
-            "created_at": self.test_time
-        }
-        self.mock_collection.insert_one.return_value.inserted_id = self.test_object_id
-        
-        # mock find_one 결과 설정
-        expected_result = {
             "_id": self.test_object_id,
             "file_id": self.test_file_id,
             "user_id": self.test_user_id,
@@ -65,19 +59,49 @@ class TestFileDuplicateCheckRepository:
             "is_duplicated": None,
             "created_at": self.test_time
         }
-        self.mock_collection.find_one.return_value = expected_result
+        self.mock_collection.update_one.return_value.upserted_id = self.test_object_id
         
         # when
-        result = self.repository.create_duplicate_check_request(self.test_file_id, self.test_user_id)
+        result = asyncio.run(self.repository.create_duplicate_check_request(self.test_file_id, self.test_user_id))
         
         # then
-        self.mock_collection.insert_one.assert_called_once_with(expected_document)
-        assert result["_id"] == self.test_object_id
-        assert result["file_id"] == self.test_file_id
-        assert result["user_id"] == self.test_user_id
-        assert result["is_completed"] == False
-        assert result["is_duplicated"] is None
-        assert result["created_at"] == self.test_time
+        self.mock_collection.update_one.assert_called_once_with(
+            {"file_id": self.test_file_id, "user_id": self.test_user_id},
+            {
+                "$setOnInsert": {
+                    "is_completed": False,
+                    "is_duplicated": None,
+                    "created_at": self.test_time
+                }
+            },
+            upsert=True,
+            session=None
+        )
+        self.mock_collection.find_one.assert_not_called()
+        assert result == expected_document
+    
+    def test_create_duplicate_check_request_already_exists(self):
+        # given
+        # 이미 문서가 있어 upsert가 삽입하지 않음
+        self.mock_collection.update_one.return_value.upserted_id = None
+        
+        # when
+        result = asyncio.run(self.repository.create_duplicate_check_request(self.test_file_id, self.test_user_id))
+        
+        # then
+        self.mock_collection.update_one.assert_called_once()
+        assert result is None
+    
+    def test_create_duplicate_check_request_concurrent_insert(self):
+        # given
+        # 동시에 들어온 요청과 고유 인덱스 충돌
+        self.mock_collection.update_one.side_effect = DuplicateKeyError("E11000 duplicate key error")
+        
+        # when
+        result = asyncio.run(self.repository.create_duplicate_check_request(self.test_file_id, self.test_user_id))
+        
+        # then
+        assert result is None
     
     def test_get_duplicate_check_by_id_found(self):
         # given
@@ -92,7 +116,7 @@ class TestFileDuplicateCheckRepository:
         self.mock_collection.find_one.return_value = expected_document
         
         # when
-        result = self.repository.get_duplicate_check_by_id(self.test_request_id)
+        result = asyncio.run(self.repository.get_duplicate_check_by_id(self.test_request_id))
         
         # then
         self.mock_collection.find_one.assert_called_once_with({"_id": self.test_object_id})
@@ -103,7 +127,7 @@ class TestFileDuplicateCheckRepository:
         self.mock_collection.find_one.return_value = None
         
         # when
-        result = self.repository.get_duplicate_check_by_id(self.test_request_id)
+        result = asyncio.run(self.repository.get_duplicate_check_by_id(self.test_request_id))
         
         # then
         self.mock_collection.find_one.assert_called_once_with({"_id": self.test_object_id})
@@ -114,7 +138,7 @@ class TestFileDuplicateCheckRepository:
         # ObjectId 변환 실패
         
         # when
-        result = self.repository.get_duplicate_check_by_id("invalid_id")
+        result = asyncio.run(self.repository.get_duplicate_check_by_id("invalid_id"))
         
         # then
         self.mock_collection.find_one.assert_not_called()
@@ -133,7 +157,7 @@ class TestFileDuplicateCheckRepository:
         self.mock_collection.find_one.return_value = expected_document
         
         # when
-        result = self.repository.get_duplicate_check_by_file_id(self.test_file_id, self.test_user_id)
+        result = asyncio.run(self.repository.get_duplicate_check_by_file_id(self.test_file_id, self.test_user_id))
         
         # then
         self.mock_collection.find_one.assert_called_once_with({
@@ -147,7 +171,7 @@ class TestFileDuplicateCheckRepository:
         self.mock_collection.find_one.return_value = None
         
         # when
-        result = self.repository.get_duplicate_check_by_file_id(self.test_file_id, self.test_user_id)
+        result = asyncio.run(self.repository.get_duplicate_check_by_file_id(self.test_file_id, self.test_user_id))
         
         # then
         self.mock_collection.find_one.assert_called_once_with({
@@ -158,9 +182,7 @@ class TestFileDuplicateCheckRepository:
     
     def test_update_duplicate_check_result_success(self):
         # given
-        # 업데이트 성공
-        self.mock_collection.update_one.return_value.modified_count = 1
-        
+        # 업데이트 후 문서 반환
         expected_document = {
             "_id": self.test_object_id,
             "file_id": self.test_file_id,
@@ -170,13 +192,13 @@ class TestFileDuplicateCheckRepository:
             "created_at": self.test_time,
             "updated_at": self.test_time
         }
-        self.mock_collection.find_one.return_value = expected_document
+        self.mock_collection.find_one_and_update.return_value = expected_document
         
         # when
-        result = self.repository.update_duplicate_check_result(self.test_request_id, False)
+        result = asyncio.run(self.repository.update_duplicate_check_result(self.test_request_id, False))
         
         # then
-        self.mock_collection.update_one.assert_called_once_with(
+        self.mock_collection.find_one_and_update.assert_called_once_with(
             {"_id": self.test_object_id},
             {
                 "$set": {
@@ -184,22 +206,22 @@ class TestFileDuplicateCheckRepository:
                     "is_duplicated": False,
                     "updated_at": self.test_time
                 }
-            }
+            },
+            return_document=ReturnDocument.AFTER
         )
-        self.mock_collection.find_one.assert_called_once_with({"_id": self.test_object_id})
+        self.mock_collection.find_one.assert_not_called()
         assert result == expected_document
     
     def test_update_duplicate_check_result_not_found(self):
         # given
-        # 업데이트 실패
-        self.mock_collection.update_one.return_value.modified_count = 0
+        # 일치하는 문서 없음
+        self.mock_collection.find_one_and_update.return_value = None
         
         # when
-        result = self.repository.update_duplicate_check_result(self.test_request_id, False)
+        result = asyncio.run(self.repository.update_duplicate_check_result(self.test_request_id, False))
         
         # then
-        self.mock_collection.update_one.assert_called_once()
-        self.mock_collection.find_one.assert_not_called()
+        self.mock_collection.find_one_and_update.assert_called_once()
         assert result is None
     
     def test_update_duplicate_check_result_invalid_id(self):
@@ -207,13 +229,34 @@ class TestFileDuplicateCheckRepository:
         # ObjectId 변환 실패
         
         # when
-        result = self.repository.update_duplicate_check_result("invalid_id", False)
+        result = asyncio.run(self.repository.update_duplicate_check_result("invalid_id", False))
         
         # then
-        self.mock_collection.update_one.assert_not_called()
-        self.mock_collection.find_one.assert_not_called()
+        self.mock_collection.find_one_and_update.assert_not_called()
         assert result is None
     
+    def test_update_file_duplicate_status_success(self):
+        # given
+        expected_document = {
+            "_id": self.test_file_object_id,
+            "s3_bucket": "test-bucket",
+            "s3_key": "example.pdf",
+            "is_duplicated": True
+        }
+        self.mock_files_collection.find_one_and_update.return_value = expected_document
+        
+        # when
+        result = asyncio.run(self.repository.update_file_duplicate_status(self.test_file_id, True))
+        
+        # then
+        self.mock_files_collection.find_one_and_update.assert_called_once_with(
+            {"_id": self.test_file_object_id},
+            {"$set": {"is_duplicated": True}},
+            return_document=ReturnDocument.AFTER
+        )
+        self.mock_files_collection.find_one.assert_not_called()
+        assert result == expected_document
+    
     def test_get_file_by_id_found(self):
         # given
         expected_document = {
@@ -224,7 +267,7 @@ class TestFileDuplicateCheckRepository:
         self.mock_files_collection.find_one.return_value = expected_document
         
         # when
-        result = self.repository.get_file_by_id(self.test_file_id)
+        result = asyncio.run(self.repository.get_file_by_id(self.test_file_id))
         
         # then
         self.mock_files_collection.find_one.assert_called_once_with({"_id": self.test_file_object_id})
@@ -235,7 +278,7 @@ class TestFileDuplicateCheckRepository:
         self.mock_files_collection.find_one.return_value = None
         
         # when
-        result = self.repository.get_file_by_id(self.test_file_id)
+        result = asyncio.run(self.repository.get_file_by_id(self.test_file_id))
         
         # then
         self.mock_files_collection.find_one.assert_called_once_with({"_id": self.test_file_object_id})
@@ -246,8 +289,276 @@ class TestFileDuplicateCheckRepository:
         # ObjectId 변환 실패
         
         # when
-        result = self.repository.get_file_by_id("invalid_id")
+        result = asyncio.run(self.repository.get_file_by_id("invalid_id"))
         
         # then
         self.mock_files_collection.find_one.assert_not_called()
-        assert result is None 
\ No newline at end of file
+        assert result is None
+    
+    def test_find_file_by_content_hash(self):
+        # given
+        content_hash = "a" * 64
+        self.mock_files_collection.find_one.return_value = {"_id": ObjectId("6123456789abcdef01234568")}
+        
+        # when
+        result = asyncio.run(self.repository.find_file_by_content_hash(content_hash, self.test_file_id))
+        
+        # then - 자기 자신은 제외하고 _id만 조회
+        self.mock_files_collection.find_one.assert_called_once_with(
+            {"sha256": content_hash, "_id": {"$ne": self.test_file_object_id}},
+            {"_id": True}
+        )
+        assert result == {"_id": ObjectId("6123456789abcdef01234568")}
+    
+    def test_save_file_content_hash(self):
+        # when
+        asyncio.run(self.repository.save_file_content_hash(self.test_file_id, "b" * 64))
+        
+        # then
+        self.mock_files_collection.update_one.assert_called_once_with(
+            {"_id": self.test_file_object_id},
+            {"$set": {"sha256": "b" * 64}}
+        )
+    
+    def test_save_file_content_hash_invalid_id(self):
+        # when
+        result = asyncio.run(self.repository.save_file_content_hash("invalid_id", "b" * 64))
+        
+        # then
+        assert result is None
+        self.mock_files_collection.update_one.assert_not_called()
+    
+    def test_get_pending_duplicate_checks(self):
+        # given
+        user_id = "12345678-1234-5678-1234-567812345678"
+        pending_document = {"_id": ObjectId("6123456789abcdef01234567"), "user_id": user_id, "is_completed": False}
+        cursor = MagicMock()
+        cursor.sort.return_value = cursor
+        cursor.limit.return_value = cursor
+        cursor.to_list = AsyncMock(return_value=[pending_document])
+        self.mock_collection.find = MagicMock(return_value=cursor)
+        
+        # when
+        result = asyncio.run(self.repository.get_pending_duplicate_checks(user_id, 100))
+        
+        # then
+        self.mock_collection.find.assert_called_once_with({"user_id": user_id, "is_completed": False})
+        cursor.sort.assert_called_once_with("created_at", -1)
+        cursor.limit.assert_called_once_with(100)
+        assert result == [pending_document]
+    
+    def test_get_duplicate_checks_by_file_ids(self):
+        # given
+        file_ids = [self.test_file_id, "6123456789abcdef01234568"]
+        documents = [{"_id": self.test_object_id, "file_id": self.test_file_id, "user_id": self.test_user_id}]
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=documents)
+        self.mock_collection.find = MagicMock(return_value=cursor)
+        
+        # when
+        result = asyncio.run(self.repository.get_duplicate_checks_by_file_ids(file_ids, self.test_user_id))
+        
+        # then
+        self.mock_collection.find.assert_called_once_with({
+            "file_id": {"$in": file_ids},
+            "user_id": self.test_user_id
+        })
+        assert result == documents
+    
+    def test_get_duplicate_checks_by_ids(self):
+        # given
+        documents = [{"_id": self.test_object_id, "file_id": self.test_file_id, "user_id": self.test_user_id}]
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=documents)
+        self.mock_collection.find = MagicMock(return_value=cursor)
+        
+        # when
+        result = asyncio.run(self.repository.get_duplicate_checks_by_ids([self.test_request_id, "invalid-id"]))
+        
+        # then - 올바르지 않은 ID는 쿼리에서 제외
+        self.mock_collection.find.assert_called_once_with({"_id": {"$in": [self.test_object_id]}})
+        assert result == documents
+    
+    def test_update_duplicate_check_results(self):
+        # given
+        other_check = {"_id": ObjectId("7123456789abcdef01234568"), "file_id": "6123456789abcdef01234568"}
+        check = {"_id": self.test_object_id, "file_id": self.test_file_id}
+        
+        # when
+        failed = asyncio.run(self.repository.update_duplicate_check_results([(check, True), (other_check, False)]))
+        
+        # then - files, file_duplicate_checks 각각 unordered bulk_write 한 번
+        assert failed == set()
+        self.mock_files_collection.bulk_write.assert_called_once_with([
+            UpdateOne({"_id": self.test_file_object_id}, {"$set": {"is_duplicated": True}}),
+            UpdateOne({"_id": ObjectId("6123456789abcdef01234568")}, {"$set": {"is_duplicated": False}})
+        ], ordered=False)
+        self.mock_collection.bulk_write.assert_called_once_with([
+            UpdateOne(
+                {"_id": self.test_object_id},
+                {"$set": {"is_completed": True, "is_duplicated": True, "updated_at": self.test_time}}
+            ),
+            UpdateOne(
+                {"_id": other_check["_id"]},
+                {"$set": {"is_completed": True, "is_duplicated": False, "updated_at": self.test_time}}
+            )
+        ], ordered=False)
+    
+    def test_update_duplicate_check_results_partial_failure(self):
+        # given
+        other_check = {"_id": ObjectId("7123456789abcdef01234568"), "file_id": "6123456789abcdef01234568"}
+        check = {"_id": self.test_object_id, "file_id": self.test_file_id}
+        self.mock_collection.bulk_write.side_effect = BulkWriteError({"writeErrors": [{"index": 1, "errmsg": "error"}]})
+        
+        # when
+        failed = asyncio.run(self.repository.update_duplicate_check_results([(check, True), (other_check, False)]))
+        
+        # then - 실패한 항목의 요청 _id만 반환
+        assert failed == {other_check["_id"]}
+    
+    def test_update_duplicate_check_results_file_write_failure(self):
+        # given
+        other_check = {"_id": ObjectId("7123456789abcdef01234568"), "file_id": "6123456789abcdef01234568"}
+        invalid_check = {"_id": ObjectId("7123456789abcdef01234569"), "file_id": "invalid-id"}
+        check = {"_id": self.test_object_id, "file_id": self.test_file_id}
+        self.mock_files_collection.bulk_write.side_effect = BulkWriteError({"writeErrors": [{"index": 1, "errmsg": "error"}]})
+        
+        # when
+        failed = asyncio.run(self.repository.update_duplicate_check_results(
+            [(check, True), (invalid_check, False), (other_check, False)]
+        ))
+        
+        # then - files 기록에 실패한 요청은 완료 처리하지 않고 실패로 반환
+        assert failed == {other_check["_id"]}
+        self.mock_collection.bulk_write.assert_called_once_with([
+            UpdateOne(
+                {"_id": self.test_object_id},
+                {"$set": {"is_completed": True, "is_duplicated": True, "updated_at": self.test_time}}
+            ),
+            UpdateOne(
+                {"_id": invalid_check["_id"]},
+                {"$set": {"is_completed": True, "is_duplicated": False, "updated_at": self.test_time}}
+            )
+        ], ordered=False)
+    
+    def test_update_duplicate_check_results_empty(self):
+        # when
+        failed = asyncio.run(self.repository.update_duplicate_check_results([]))
+        
+        # then
+        assert failed == set()
+        self.mock_files_collection.bulk_write.assert_not_called()
+        self.mock_collection.bulk_write.assert_not_called()
+    
+    def test_save_file_embedding(self):
+        # given
+        embeddings = [0.5, -1.0, 2.25]
+        self.mock_embeddings_collection.find_one_and_update.return_value = {"file_id": self.test_file_object_id}
+        
+        # when
+        asyncio.run(self.repository.save_file_embedding(self.test_file_id, embeddings))
+        
+        # then - float32 BSON Binary vector와 차원/형식 메타데이터로 upsert
+        args, kwargs = self.mock_embeddings_collection.find_one_and_update.call_args
+        assert args[0] == {"file_id": self.test_file_object_id}
+        update = args[1]
+        assert update["$set"]["embedding"] == Binary.from_vector(embeddings, BinaryVectorDtype.FLOAT32)
+        assert update["$set"]["dimensions"] == 3
+        assert update["$set"]["dtype"] == "float32"
+        assert update["$setOnInsert"] == {"created_at": self.test_time}
+        assert kwargs["upsert"] is True
+        # float64 배열보다 작게 저장 (헤더 2바이트 + 4바이트 * 차원)
+        assert len(update["$set"]["embedding"]) == 2 + 4 * len(embeddings)
+    
+    def test_get_file_embedding(self):
+        # given
+        self.mock_embeddings_collection.find_one.return_value = {
+            "file_id": self.test_file_object_id,
+            "embedding": Binary.from_vector([0.5, -1.0, 2.25], BinaryVectorDtype.FLOAT32)
+        }
+        
+        # when
+        result = asyncio.run(self.repository.get_file_embedding(self.test_file_id))
+        
+        # then
+        self.mock_embeddings_collection.find_one.assert_called_once_with({"file_id": self.test_file_object_id})
+        assert result == [0.5, -1.0, 2.25]
+    
+    def test_get_file_embedding_legacy_float_array(self):
+        # given
+        self.mock_embeddings_collection.find_one.return_value = {
+            "file_id": self.test_file_object_id,
+            "embedding": [0.5, -1.0]
+        }
+        
+        # when
+        result = asyncio.run(self.repository.get_file_embedding(self.test_file_id))
+        
+        # then
+        assert result == [0.5, -1.0]
+    
+    def test_get_file_embedding_invalid_id(self):
+        # given
+        self.mock_embeddings_collection.find_one.return_value = None
+        
+        # when
+        result = asyncio.run(self.repository.get_file_embedding("invalid-id"))
+        
+        # then
+        assert result is None
+        self.mock_embeddings_collection.find_one.assert_not_called()
+    
+    def test_create_duplicate_check_request_completed(self):
+        # given
+        self.mock_collection.update_one.return_value.upserted_id = self.test_object_id
+        
+        # when
+        result = asyncio.run(self.repository.create_duplicate_check_request(
+            self.test_file_id, self.test_user_id, is_duplicated=True
+        ))
+        
+        # then - 이미 판정된 결과로 완료된 요청을 생성
+        self.mock_collection.update_one.assert_called_once_with(
+            {"file_id": self.test_file_id, "user_id": self.test_user_id},
+            {
+                "$setOnInsert": {
+                    "is_completed": True,
+                    "is_duplicated": True,
+                    "created_at": self.test_time,
+                    "updated_at": self.test_time
+                }
+            },
+            upsert=True,
+            session=None
+        )
+        assert result["is_completed"] is True
+        assert result["is_duplicated"] is True
+    
+    def test_find_file_embeddings(self):
+        # given
+        self.mock_embeddings_collection.find = MagicMock()
+        
+        # when
+        cursor = self.repository.find_file_embeddings(500)
+        
+        # then
+        self.mock_embeddings_collection.find.assert_called_once_with(
+            {},
+            {"_id": False, "file_id": True, "embedding": True, "updated_at": True},
+            batch_size=500
+        )
+        assert cursor == self.mock_embeddings_collection.find.return_value
+    
+    def test_find_file_embeddings_updated_after(self):
+        # given
+        self.mock_embeddings_collection.find = MagicMock()
+        
+        # when
+        self.repository.find_file_embeddings(500, updated_after=self.test_time)
+        
+        # then - 마지막 동기화 이후 저장된 임베딩만 조회
+        self.mock_embeddings_collection.find.assert_called_once_with(
+            {"updated_at": {"$gte": self.test_time}},
+            {"_id": False, "file_id": True, "embedding": True, "updated_at": True},
+            batch_size=500
+        )
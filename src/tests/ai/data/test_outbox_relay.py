@@ -0,0 +1,114 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from bson import ObjectId
+from datetime import datetime, timezone
+
+from src.main.ai.data.OutboxRelay import OutboxRelay
+from src.main.ai.data.SQSBatchPublisher import SQSBatchEntryError
+
+
+class TestOutboxRelay:
+    def setup_method(self):
+        # 목업 아웃박스 및 퍼블리셔 생성
+        self.mock_outbox = AsyncMock()
+        self.mock_outbox.get_current_time = MagicMock(return_value=datetime(2023, 1, 1, tzinfo=timezone.utc))
+        self.mock_publisher = AsyncMock()
+
+        # 테스트 대상 릴레이 생성
+        self.relay = OutboxRelay(self.mock_outbox, self.mock_publisher, batch_size=25, max_attempts=3)
+
+    def make_messages(self, count: int, attempts: int = 0):
+        return [
+            {"_id": ObjectId(), "entry": {"MessageDeduplicationId": str(i)}, "attempts": attempts}
+            for i in range(count)
+        ]
+
+    def test_relay_once_sends_in_chunks_and_deletes_sent(self):
+        # given
+        messages = self.make_messages(25)
+        self.mock_outbox.claim_messages.return_value = messages
+
+        async def send_batch(entries):
+            return [{"MessageId": entry["MessageDeduplicationId"]} for entry in entries]
+        self.mock_publisher.send_batch.side_effect = send_batch
+
+        # when
+        relayed = asyncio.run(self.relay.relay_once())
+
+        # then
+        assert relayed == 25
+        assert self.mock_publisher.send_batch.call_count == 3
+        self.mock_outbox.delete_messages.assert_called_once_with([m["_id"] for m in messages])
+        self.mock_outbox.reschedule_messages.assert_called_once_with([])
+        assert self.relay.stats()["messages_sent"] == 25
+
+    def test_relay_once_reschedules_failures_with_backoff(self):
+        # given
+        messages = self.make_messages(2)
+        self.mock_outbox.claim_messages.return_value = messages
+        self.mock_publisher.send_batch.return_value = [
+            {"MessageId": "0"},
+            SQSBatchEntryError("InternalError", "error")
+        ]
+
+        # when
+        asyncio.run(self.relay.relay_once())
+
+        # then
+        self.mock_outbox.delete_messages.assert_called_once_with([messages[0]["_id"]])
+        failures = self.mock_outbox.reschedule_messages.call_args.args[0]
+        assert len(failures) == 1
+        assert failures[0]["_id"] == messages[1]["_id"]
+        assert failures[0]["give_up"] is False
+        assert (failures[0]["next_attempt_at"] - self.mock_outbox.get_current_time()).total_seconds() == self.relay.get_backoff(0)
+
+    def test_relay_once_gives_up_after_max_attempts(self):
+        # given
+        messages = self.make_messages(1, attempts=2)
+        self.mock_outbox.claim_messages.return_value = messages
+        self.mock_publisher.send_batch.side_effect = Exception("SQS error")
+
+        # when
+        asyncio.run(self.relay.relay_once())
+
+        # then
+        failures = self.mock_outbox.reschedule_messages.call_args.args[0]
+        assert failures[0]["give_up"] is True
+        assert self.relay.stats()["messages_given_up"] == 1
+
+    def test_relay_once_nothing_to_send(self):
+        # given
+        self.mock_outbox.claim_messages.return_value = []
+
+        # when
+        relayed = asyncio.run(self.relay.relay_once())
+
+        # then
+        assert relayed == 0
+        self.mock_publisher.send_batch.assert_not_called()
+
+    def test_get_backoff_is_capped(self):
+        assert self.relay.get_backoff(0) == 1.0
+        assert self.relay.get_backoff(3) == 8.0
+        assert self.relay.get_backoff(100) == self.relay.max_backoff
+
+    def test_notify_wakes_running_relay(self):
+        # given
+        self.relay.poll_interval = 60
+        self.mock_outbox.claim_messages.return_value = []
+
+        async def scenario():
+            self.relay.start()
+            await asyncio.sleep(0.01)
+            calls_before = self.mock_outbox.claim_messages.call_count
+            self.relay.notify()
+            await asyncio.sleep(0.01)
+            calls_after = self.mock_outbox.claim_messages.call_count
+            await self.relay.stop()
+            return calls_before, calls_after
+
+        # when
+        calls_before, calls_after = asyncio.run(scenario())
+
+        # then
+        assert calls_after == calls_before + 1
@@ -0,0 +1,149 @@
+import sys
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from bson import ObjectId
+from datetime import datetime, timedelta, timezone
+from pymongo import UpdateOne
+
+from src.main.ai.data.OutboxRepository import OutboxRepository
+
+# 패키지에서 같은 이름의 클래스를 다시 내보내므로 모듈은 sys.modules에서 가져옴
+outbox_module = sys.modules[OutboxRepository.__module__]
+
+
+def make_cursor(documents):
+    # find()가 반환하는 AsyncCursor 목업
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=documents)
+    return cursor
+
+
+class TestOutboxRepository:
+    def setup_method(self):
+        # 목업 MongoDB 클라이언트 생성
+        self.mock_collection = AsyncMock()
+        self.mock_db = MagicMock()
+        self.mock_db.get_collection.return_value = self.mock_collection
+        self.mock_client = MagicMock()
+        self.mock_client.get_database.return_value = self.mock_db
+
+        # 테스트 대상 리포지토리 생성
+        self.repository = OutboxRepository(self.mock_client)
+
+        # 시간 고정을 위한 패치
+        self.test_time = datetime(2023, 1, 1, tzinfo=timezone.utc)
+        self.time_patch = patch.object(self.repository, 'get_current_time', return_value=self.test_time)
+        self.time_patch.start()
+
+    def teardown_method(self):
+        self.time_patch.stop()
+
+    def test_add_messages(self):
+        # given
+        entry = {"MessageGroupId": "user", "MessageDeduplicationId": "id", "MessageBody": "{}"}
+        inserted_id = ObjectId()
+        self.mock_collection.insert_many.return_value.inserted_ids = [inserted_id]
+
+        # when
+        result = asyncio.run(self.repository.add_messages([entry], session="test-session"))
+
+        # then
+        self.mock_collection.insert_many.assert_called_once_with(
+            [{
+                "entry": entry,
+                "status": "pending",
+                "attempts": 0,
+                "next_attempt_at": self.test_time,
+                "created_at": self.test_time
+            }],
+            ordered=False,
+            session="test-session"
+        )
+        assert result == [inserted_id]
+
+    def test_add_messages_empty(self):
+        # when
+        result = asyncio.run(self.repository.add_messages([]))
+
+        # then
+        self.mock_collection.insert_many.assert_not_called()
+        assert result == []
+
+    def test_run_in_transaction_disabled(self):
+        # given
+        async def callback(session):
+            return session
+
+        # when
+        with patch.object(outbox_module, "MONGODB_TRANSACTIONS_ENABLED", False):
+            result = asyncio.run(self.repository.run_in_transaction(callback))
+
+        # then
+        assert result is None
+        self.mock_client.start_session.assert_not_called()
+
+    def test_claim_messages(self):
+        # given
+        message_id = ObjectId()
+        claimed = [{"_id": message_id, "entry": {}, "attempts": 0}]
+        self.mock_collection.find = MagicMock(side_effect=[
+            make_cursor([{"_id": message_id}]),
+            make_cursor(claimed)
+        ])
+
+        # when
+        result = asyncio.run(self.repository.claim_messages(limit=10, lease_seconds=30))
+
+        # then
+        update_filter, update = self.mock_collection.update_many.call_args.args
+        assert update_filter["_id"] == {"$in": [message_id]}
+        assert update_filter["status"] == "pending"
+        assert update["$set"]["next_attempt_at"] == self.test_time + timedelta(seconds=30)
+        claim_filter = self.mock_collection.find.call_args_list[1].args[0]
+        assert claim_filter["claim_id"] == update["$set"]["claim_id"]
+        assert result == claimed
+
+    def test_claim_messages_nothing_due(self):
+        # given
+        self.mock_collection.find = MagicMock(return_value=make_cursor([]))
+
+        # when
+        result = asyncio.run(self.repository.claim_messages(limit=10, lease_seconds=30))
+
+        # then
+        self.mock_collection.update_many.assert_not_called()
+        assert result == []
+
+    def test_delete_messages(self):
+        # given
+        ids = [ObjectId(), ObjectId()]
+        self.mock_collection.delete_many.return_value.deleted_count = 2
+
+        # when
+        result = asyncio.run(self.repository.delete_messages(ids))
+
+        # then
+        self.mock_collection.delete_many.assert_called_once_with({"_id": {"$in": ids}})
+        assert result == 2
+
+    def test_reschedule_messages(self):
+        # given
+        retry_id, give_up_id = ObjectId(), ObjectId()
+        next_attempt_at = self.test_time + timedelta(seconds=2)
+        self.mock_collection.bulk_write.return_value.modified_count = 2
+
+        # when
+        asyncio.run(self.repository.reschedule_messages([
+            {"_id": retry_id, "error": "error", "next_attempt_at": next_attempt_at, "give_up": False},
+            {"_id": give_up_id, "error": "error", "next_attempt_at": next_attempt_at, "give_up": True}
+        ]))
+
+        # then
+        operations = self.mock_collection.bulk_write.call_args.args[0]
+        assert self.mock_collection.bulk_write.call_args.kwargs == {"ordered": False}
+        assert all(isinstance(operation, UpdateOne) for operation in operations)
+        assert "status" not in operations[0]._doc["$set"]
+        assert operations[1]._doc["$set"]["status"] == "failed"
@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from src.main.ai.data.SQSBatchPublisher import SQSBatchPublisher, SQSBatchEntryError
+
+
+class TestSQSBatchPublisher:
+    def setup_method(self):
+        # 목업 SQS 클라이언트 생성
+        self.mock_sqs = MagicMock()
+        self.queue_url = "https://example.com/queue.fifo"
+
+        # 요청받은 엔트리를 모두 성공 처리
+        def send_message_batch(QueueUrl, Entries):
+            return {
+                "Successful": [
+                    {"Id": entry["Id"], "MessageId": f"message-{entry['MessageDeduplicationId']}"}
+                    for entry in Entries
+                ],
+                "Failed": []
+            }
+        self.mock_sqs.send_message_batch.side_effect = send_message_batch
+
+    def make_entry(self, index: int) -> dict:
+        return {
+            "MessageGroupId": "test-user-id",
+            "MessageDeduplicationId": str(index),
+            "MessageBody": "{}"
+        }
+
+    def test_send_batch_returns_results_in_order(self):
+        # given
+        publisher = SQSBatchPublisher(self.mock_sqs, self.queue_url)
+
+        # when
+        results = asyncio.run(publisher.send_batch([self.make_entry(i) for i in range(10)]))
+
+        # then
+        assert results == [{"MessageId": f"message-{i}"} for i in range(10)]
+        self.mock_sqs.send_message_batch.assert_called_once()
+        call = self.mock_sqs.send_message_batch.call_args.kwargs
+        assert call["QueueUrl"] == self.queue_url
+        assert [entry["Id"] for entry in call["Entries"]] == [str(i) for i in range(10)]
+        assert publisher.stats() == {"batches_sent": 1, "messages_sent": 10, "messages_failed": 0}
+
+    def test_send_batch_partial_failure(self):
+        # given
+        self.mock_sqs.send_message_batch.side_effect = None
+        self.mock_sqs.send_message_batch.return_value = {
+            "Successful": [{"Id": "0", "MessageId": "message-0"}],
+            "Failed": [{"Id": "1", "Code": "InternalError", "Message": "error", "SenderFault": False}]
+        }
+        publisher = SQSBatchPublisher(self.mock_sqs, self.queue_url)
+
+        # when
+        results = asyncio.run(publisher.send_batch([self.make_entry(0), self.make_entry(1), self.make_entry(2)]))
+
+        # then
+        assert results[0] == {"MessageId": "message-0"}
+        assert isinstance(results[1], SQSBatchEntryError)
+        assert results[1].code == "InternalError"
+        # 응답에 없는 엔트리도 실패로 처리
+        assert isinstance(results[2], SQSBatchEntryError)
+        assert results[2].code == "MissingResult"
+        assert publisher.stats()["messages_failed"] == 2
+
+    def test_send_batch_whole_batch_failure(self):
+        # given
+        self.mock_sqs.send_message_batch.side_effect = Exception("SQS error")
+        publisher = SQSBatchPublisher(self.mock_sqs, self.queue_url)
+
+        # when & then
+        with pytest.raises(Exception) as exc_info:
+            asyncio.run(publisher.send_batch([self.make_entry(0)]))
+
+        assert str(exc_info.value) == "SQS error"
@@ -5,6 +5,8 @@ from pydantic import ValidationError
 from src.main.ai.models.CategoryRecommendation import (
     CategoryRecommendationRequest,
     CategoryRecommendationResponse,
+    CategoryRecommendationBulkRequest,
+    CATEGORY_RECOMMENDATION_BULK_MAX_SIZE,
     CategoryRecommendationStatusResponse,
     CategoryRecommendationResultRequest
 )
@@ -26,6 +28,13 @@ class TestCategoryRecommendationModels:
         with pytest.raises(ValidationError):
             CategoryRecommendationRequest()
     
+    def test_category_recommendation_bulk_request_size(self):
+        # when/then - 빈 목록이나 최대 개수를 넘는 목록은 검증 오류
+        with pytest.raises(ValidationError):
+            CategoryRecommendationBulkRequest(file_ids=[])
+        with pytest.raises(ValidationError):
+            CategoryRecommendationBulkRequest(file_ids=["file-id"] * (CATEGORY_RECOMMENDATION_BULK_MAX_SIZE + 1))
+    
     def test_category_recommendation_response(self):
         # given
         request_id = "test-request-id"
@@ -0,0 +1,77 @@
+import asyncio
+from unittest.mock import MagicMock
+from bson import ObjectId
+
+from src.main.ai.notification.ChangeStreamFeed import ChangeStreamFeed
+from src.main.ai.notification.NotificationHub import NotificationHub, category_recommendation_topic
+from src.main.ai.service.CategoryRecommendationService import CategoryRecommendationService
+
+
+class TestChangeStreamFeed:
+    def setup_method(self):
+        self.hub = MagicMock()
+        self.feed = ChangeStreamFeed(
+            MagicMock(),
+            self.hub,
+            {"category_recommendations": CategoryRecommendationService.completion_events}
+        )
+        self.test_object_id = ObjectId("6123456789abcdef01234567")
+
+    def test_dispatch_publishes_completion(self):
+        # given
+        change = {
+            "operationType": "update",
+            "fullDocument": {
+                "_id": self.test_object_id,
+                "is_completed": True,
+                "predicted_category": "기술"
+            }
+        }
+
+        # when
+        published = self.feed.dispatch("category_recommendations", change)
+
+        # then
+        assert published == 1
+        topic, event = self.hub.publish.call_args[0]
+        assert topic == category_recommendation_topic(str(self.test_object_id))
+        assert self.hub.publish.call_args.kwargs["key"] == str(self.test_object_id)
+        assert event.is_completed is True
+        assert event.predicted_category == "기술"
+
+    def test_dispatch_without_full_document(self):
+        # given - 문서가 이미 삭제된 경우 fullDocument가 없음
+        change = {"operationType": "update", "fullDocument": None}
+
+        # when
+        published = self.feed.dispatch("category_recommendations", change)
+
+        # then
+        assert published == 0
+        self.hub.publish.assert_not_called()
+
+    def test_dispatch_skips_completion_already_published_locally(self):
+        # given
+        hub = NotificationHub()
+        feed = ChangeStreamFeed(
+            MagicMock(),
+            hub,
+            {"category_recommendations": CategoryRecommendationService.completion_events}
+        )
+        document = {"_id": self.test_object_id, "is_completed": True, "predicted_category": "기술"}
+        topic = category_recommendation_topic(str(self.test_object_id))
+
+        async def run():
+            with hub.subscribe(topic) as subscription:
+                # 이 인스턴스의 서비스가 먼저 발행한 뒤 같은 변경이 change stream으로 도착
+                for event_topic, event in CategoryRecommendationService.completion_events(document):
+                    hub.publish(event_topic, event, key=str(document["_id"]))
+                feed.dispatch("category_recommendations", {"operationType": "update", "fullDocument": document})
+                return [await subscription.get(timeout=0.01) for _ in range(2)]
+
+        # when
+        events = asyncio.run(run())
+
+        # then
+        assert events[0].predicted_category == "기술"
+        assert events[1] is None
@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+
+from src.main.ai.notification.NotificationHub import NotificationHub, category_recommendation_topic
+
+
+class TestNotificationHub:
+    def setup_method(self):
+        self.hub = NotificationHub(max_queue_size=2)
+        self.topic = category_recommendation_topic("6123456789abcdef01234567")
+
+    def test_publish_delivers_to_subscribers(self):
+        async def run():
+            first = self.hub.subscribe(self.topic)
+            second = self.hub.subscribe(self.topic)
+            delivered = self.hub.publish(self.topic, "done")
+            return delivered, await first.get(timeout=1), await second.get(timeout=1)
+
+        # when
+        delivered, first_event, second_event = asyncio.run(run())
+
+        # then
+        assert delivered == 2
+        assert first_event == "done"
+        assert second_event == "done"
+
+    def test_publish_without_subscribers(self):
+        # when
+        delivered = self.hub.publish(self.topic, "done")
+
+        # then
+        assert delivered == 0
+        assert self.hub.stats()["published"] == 1
+
+    def test_get_timeout_returns_none(self):
+        async def run():
+            with self.hub.subscribe(self.topic) as subscription:
+                return await subscription.get(timeout=0.01)
+
+        # when
+        event = asyncio.run(run())
+
+        # then
+        assert event is None
+
+    def test_close_unsubscribes(self):
+        # given
+        subscription = self.hub.subscribe(self.topic)
+
+        # when
+        subscription.close()
+        subscription.close()
+
+        # then
+        assert self.hub.publish(self.topic, "done") == 0
+        assert self.hub.stats()["topics"] == 0
+
+    def test_full_queue_drops_events(self):
+        # given
+        self.hub.subscribe(self.topic)
+
+        # when
+        results = [self.hub.publish(self.topic, i) for i in range(3)]
+
+        # then - 큐 크기(2)를 넘는 이벤트는 버려짐
+        assert results == [1, 1, 0]
+        assert self.hub.stats()["dropped"] == 1
+
+    def test_publish_with_same_key_is_delivered_once(self):
+        async def run():
+            with self.hub.subscribe(self.topic) as subscription:
+                first = self.hub.publish(self.topic, "done", key="6123456789abcdef01234567")
+                second = self.hub.publish(self.topic, "done", key="6123456789abcdef01234567")
+                events = [await subscription.get(timeout=0.01) for _ in range(2)]
+                return first, second, events
+
+        # when
+        first, second, events = asyncio.run(run())
+
+        # then - 로컬 처리와 change stream이 같은 완료를 발행해도 한 번만 전달
+        assert (first, second) == (1, 0)
+        assert events == ["done", None]
+        assert self.hub.stats()["duplicates"] == 1
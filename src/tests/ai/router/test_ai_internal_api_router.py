@@ -3,8 +3,20 @@ from unittest.mock import MagicMock, patch
 from fastapi import FastAPI, HTTPException
 from fastapi.testclient import TestClient
 
-from src.main.ai.models.CategoryRecommendation import CategoryRecommendationResultRequest
-from src.main.ai.models.FileDuplicateCheck import FileDuplicateCheckResultRequest, FileDuplicateCheckRequest, FileDuplicateCheckResponse
+from src.main.ai.models.CategoryRecommendation import (
+    CategoryRecommendationResultRequest,
+    CategoryRecommendationResultBatchResponse,
+    CategoryRecommendationResultItemResponse
+)
+from src.main.ai.models.FileDuplicateCheck import (
+    FileDuplicateCheckResultRequest,
+    FileDuplicateCheckRequest,
+    FileDuplicateCheckResponse,
+    FileDuplicateCheckStatusResponse,
+    FileDuplicateCheckResultBatchResponse,
+    FileDuplicateCheckResultItemResponse,
+    FileEmbeddingResponse
+)
 from src.main.ai.service.FileDuplicateCheckService import FileDuplicateCheckService
 from src.main.ai.router.AIInternalAPIRouter import router as internal_router
 
@@ -72,6 +84,34 @@ class TestAIInternalAPIRouter:
             # 직접 호출 파라미터 체크 대신 호출 횟수만 확인
             assert mock_service.call_count == 1
     
+    def test_update_category_recommendation_results(self, client):
+        # given
+        request_data = {
+            "results": [
+                {"request_id": self.test_request_id, "predicted_category": self.test_category},
+                {"request_id": "6123456789abcdef01234568", "predicted_category": self.test_category}
+            ]
+        }
+        
+        with patch('src.main.ai.service.CategoryRecommendationService.CategoryRecommendationService.update_recommendation_results') as mock_service:
+            mock_service.return_value = CategoryRecommendationResultBatchResponse(results=[
+                CategoryRecommendationResultItemResponse(request_id=self.test_request_id, success=True),
+                CategoryRecommendationResultItemResponse(request_id="6123456789abcdef01234568", success=False)
+            ])
+            
+            # when
+            response = client.post("/ai-proxy/category-recommendation-results/batch", json=request_data)
+            
+            # then
+            assert response.status_code == 200
+            assert response.json() == {
+                "results": [
+                    {"request_id": self.test_request_id, "success": True},
+                    {"request_id": "6123456789abcdef01234568", "success": False}
+                ]
+            }
+            assert mock_service.call_count == 1
+    
     def test_create_file_duplicate_check_success(self, client):
         # given
         request_data = {
@@ -206,4 +246,140 @@ class TestAIInternalAPIRouter:
                 "detail": "존재하지 않는 ID입니다."
             }
             
-            mock_service.assert_called_once_with(self.test_request_id, False) 
\ No newline at end of file
+            mock_service.assert_called_once_with(self.test_request_id, False)
+    
+    def test_update_file_duplicate_check_results(self, client):
+        # given
+        other_request_id = "6123456789abcdef01234568"
+        request_data = {
+            "results": [
+                {"request_id": self.test_request_id, "is_duplicated": True},
+                {"request_id": other_request_id, "is_duplicated": False}
+            ]
+        }
+        
+        with patch('src.main.ai.service.FileDuplicateCheckService.FileDuplicateCheckService.update_duplicate_check_results') as mock_service:
+            mock_service.return_value = FileDuplicateCheckResultBatchResponse(results=[
+                FileDuplicateCheckResultItemResponse(
+                    request_id=self.test_request_id,
+                    success=True,
+                    result=FileDuplicateCheckStatusResponse(
+                        request_id=self.test_request_id,
+                        file_id=self.test_file_id,
+                        is_completed=True,
+                        is_duplicated=True
+                    )
+                ),
+                FileDuplicateCheckResultItemResponse(request_id=other_request_id, success=False)
+            ])
+            
+            # when
+            response = client.post("/ai-proxy/file-duplicate-check-results/batch", json=request_data)
+            
+            # then
+            assert response.status_code == 200
+            assert response.json() == {
+                "results": [
+                    {
+                        "request_id": self.test_request_id,
+                        "success": True,
+                        "result": {
+                            "request_id": self.test_request_id,
+                            "file_id": self.test_file_id,
+                            "is_completed": True,
+                            "is_duplicated": True
+                        }
+                    },
+                    {"request_id": other_request_id, "success": False, "result": None}
+                ]
+            }
+            assert mock_service.call_count == 1
+    
+    def test_update_file_duplicate_check_results_empty(self, client):
+        # when
+        response = client.post("/ai-proxy/file-duplicate-check-results/batch", json={"results": []})
+        
+        # then
+        assert response.status_code == 422
+    
+    def test_update_file_duplicate_check_result_new_path(self, client):
+        # given
+        request_data = {
+            "request_id": self.test_request_id,
+            "is_duplicated": True
+        }
+        check_data = {
+            "_id": self.test_request_id,
+            "file_id": self.test_file_id,
+            "is_completed": True,
+            "is_duplicated": True
+        }
+        
+        with patch('src.main.ai.service.FileDuplicateCheckService.FileDuplicateCheckService.update_duplicate_check_result') as mock_service, \
+             patch('src.main.ai.data.FileDuplicateCheckRepository.FileDuplicateCheckRepository.get_duplicate_check_by_id',
+                   return_value=check_data):
+            mock_service.return_value = True
+            
+            # when
+            response = client.post("/ai-proxy/file-duplicate-check-results", json=request_data)
+            
+            # then
+            assert response.status_code == 200
+            assert response.json()["is_duplicated"] is True
+            mock_service.assert_called_once_with(self.test_request_id, True)
+    
+    def test_file_duplicate_check_embeddings_path_deprecated(self):
+        # given
+        schema = app.openapi()
+        
+        # then - 기존 경로는 deprecated 별칭으로만 남김
+        assert schema["paths"]["/ai-proxy/file-duplicate-check-embeddings"]["post"]["deprecated"] is True
+        assert "deprecated" not in schema["paths"]["/ai-proxy/file-duplicate-check-results"]["post"]
+    
+    def test_save_file_embedding(self, client):
+        # given
+        request_data = {
+            "file_id": self.test_file_id,
+            "embeddings": [0.1, 0.2, 0.3]
+        }
+        
+        with patch('src.main.ai.service.FileDuplicateCheckService.FileDuplicateCheckService.save_file_embedding') as mock_service:
+            mock_service.return_value = FileEmbeddingResponse(file_id=self.test_file_id, dimensions=3)
+            
+            # when
+            response = client.post("/ai-proxy/file-embeddings", json=request_data)
+            
+            # then
+            assert response.status_code == 200
+            assert response.json() == {"file_id": self.test_file_id, "dimensions": 3}
+            assert mock_service.call_count == 1
+    
+    def test_save_file_embedding_empty(self, client):
+        # when
+        response = client.post("/ai-proxy/file-embeddings", json={"file_id": self.test_file_id, "embeddings": []})
+        
+        # then
+        assert response.status_code == 422
+    
+    def test_create_file_duplicate_check_decided_immediately(self, client):
+        # given
+        request_data = {
+            "user_id": self.test_user_id,
+            "file_id": self.test_file_id
+        }
+        
+        with patch('src.main.ai.service.FileDuplicateCheckService.FileDuplicateCheckService.create_duplicate_check_request') as mock_service:
+            mock_service.return_value = FileDuplicateCheckResponse(
+                request_id=self.test_request_id, is_completed=True, is_duplicated=True
+            )
+            
+            # when
+            response = client.post("/ai-proxy/file-duplicate-checks", json=request_data)
+            
+            # then - 프록시에서 바로 판정한 경우 결과를 함께 반환
+            assert response.status_code == 200
+            assert response.json() == {
+                "request_id": self.test_request_id,
+                "is_completed": True,
+                "is_duplicated": True
+            }
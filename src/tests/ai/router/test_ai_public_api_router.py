@@ -1,15 +1,19 @@
+import asyncio
 import pytest
 import uuid
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi import FastAPI, Depends, HTTPException
 from fastapi.testclient import TestClient
 
 from src.main.ai.models.CategoryRecommendation import (
     CategoryRecommendationRequest,
     CategoryRecommendationResponse,
+    CategoryRecommendationBulkResponse,
     CategoryRecommendationStatusResponse
 )
 from src.main.ai.models.FileDuplicateCheck import FileDuplicateCheckStatusResponse
+from src.main.ai.models.AIJobEvent import AIJobCompletedEvent
+from src.main.ai.di.dependencies import get_notification_hub
 from src.main.ai.router.AIPublicAPIRouter import router as public_router
 from src.main.auth.dependencies import get_current_user
 
@@ -60,6 +64,27 @@ class TestAIPublicAPIRouter:
             }
             mock_service.assert_called_once()
     
+    def test_create_category_recommendation_requests(self, client):
+        # given
+        request_data = {
+            "file_ids": [self.test_file_id, self.test_check_file_id]
+        }
+        
+        with patch('src.main.ai.service.CategoryRecommendationService.CategoryRecommendationService.create_recommendation_requests') as mock_service:
+            mock_service.return_value = CategoryRecommendationBulkResponse(
+                request_ids=[self.test_request_id, "6123456789abcdef01234568"]
+            )
+            
+            # when
+            response = client.post("/ai/category-recommendations/bulk", json=request_data)
+            
+            # then
+            assert response.status_code == 200
+            assert response.json() == {
+                "request_ids": [self.test_request_id, "6123456789abcdef01234568"]
+            }
+            mock_service.assert_called_once()
+    
     def test_get_category_recommendation_status_exists(self, client):
         # given
         # 서비스 응답 모의 설정
@@ -100,6 +125,62 @@ class TestAIPublicAPIRouter:
             }
             mock_service.assert_called_once()
     
+    def test_stream_category_recommendation_status(self, client):
+        # given
+        pending = CategoryRecommendationStatusResponse(request_id=self.test_request_id, is_completed=False)
+        completed = CategoryRecommendationStatusResponse(
+            request_id=self.test_request_id,
+            is_completed=True,
+            predicted_category="기술"
+        )
+        subscription = MagicMock()
+        subscription.get = AsyncMock(side_effect=[None, completed])
+        
+        with patch('src.main.ai.service.CategoryRecommendationService.CategoryRecommendationService.subscribe_recommendation_status') as mock_service:
+            mock_service.return_value = (pending, subscription)
+            
+            # when
+            response = client.get(f"/ai/category-recommendations/{self.test_request_id}/events")
+            
+            # then - 현재 상태, keep-alive, 완료 상태 순으로 전송 후 종료
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            assert response.text == (
+                f"event: status\ndata: {pending.model_dump_json()}\n\n"
+                ": keep-alive\n\n"
+                f"event: status\ndata: {completed.model_dump_json()}\n\n"
+            )
+            subscription.close.assert_called()
+    
+    def test_stream_category_recommendation_status_completed(self, client):
+        # given
+        completed = CategoryRecommendationStatusResponse(
+            request_id=self.test_request_id,
+            is_completed=True,
+            predicted_category="기술"
+        )
+        
+        with patch('src.main.ai.service.CategoryRecommendationService.CategoryRecommendationService.subscribe_recommendation_status') as mock_service:
+            mock_service.return_value = (completed, None)
+            
+            # when
+            response = client.get(f"/ai/category-recommendations/{self.test_request_id}/events")
+            
+            # then - 이미 완료된 요청은 현재 상태만 보내고 종료
+            assert response.status_code == 200
+            assert response.text == f"event: status\ndata: {completed.model_dump_json()}\n\n"
+    
+    def test_stream_category_recommendation_status_not_found(self, client):
+        # given
+        with patch('src.main.ai.service.CategoryRecommendationService.CategoryRecommendationService.subscribe_recommendation_status') as mock_service:
+            mock_service.return_value = (None, None)
+            
+            # when
+            response = client.get(f"/ai/category-recommendations/{self.test_request_id}/events")
+            
+            # then
+            assert response.status_code == 404
+    
     def test_get_file_duplicate_check_status_exists(self, client):
         # given
         # 서비스 응답 모의 설정
@@ -123,7 +204,7 @@ class TestAIPublicAPIRouter:
                 "is_completed": True,
                 "is_duplicated": False
             }
-            mock_service.assert_called_once_with(self.test_check_file_id, str(self.test_user_id))
+            mock_service.assert_called_once_with(self.test_check_file_id, str(self.test_user_id), wait=0)
     
     def test_get_file_duplicate_check_status_not_found(self, client):
         # given
@@ -140,4 +221,177 @@ class TestAIPublicAPIRouter:
             assert response.json() == {
                 "detail": "요청을 찾을 수 없습니다. 존재하지 않는 ID입니다."
             }
-            mock_service.assert_called_once_with(self.test_check_file_id, str(self.test_user_id)) 
\ No newline at end of file
+            mock_service.assert_called_once_with(self.test_check_file_id, str(self.test_user_id), wait=0)
+    
+    def test_get_file_duplicate_check_status_wait(self, client):
+        # given
+        with patch('src.main.ai.service.FileDuplicateCheckService.FileDuplicateCheckService.get_duplicate_check_status') as mock_service:
+            mock_service.return_value = FileDuplicateCheckStatusResponse(
+                request_id=self.test_request_id,
+                file_id=self.test_check_file_id,
+                is_completed=True,
+                is_duplicated=True
+            )
+            
+            # when
+            response = client.get(f"/ai/file-duplicate-checks?file_id={self.test_check_file_id}&wait=10")
+            
+            # then
+            assert response.status_code == 200
+            mock_service.assert_called_once_with(self.test_check_file_id, str(self.test_user_id), wait=10)
+    
+    def test_get_file_duplicate_check_status_wait_too_long(self, client):
+        # when
+        response = client.get(f"/ai/file-duplicate-checks?file_id={self.test_check_file_id}&wait=3600")
+        
+        # then
+        assert response.status_code == 422
+    
+    def test_stream_user_job_events(self, client):
+        # given
+        completed = AIJobCompletedEvent(
+            type="category_recommendation",
+            result=CategoryRecommendationStatusResponse(
+                request_id=self.test_request_id,
+                is_completed=True,
+                predicted_category="기술"
+            )
+        )
+        
+        async def get(timeout=None):
+            if not subscription.get_calls:
+                subscription.get_calls.append(timeout)
+                return completed
+            # 다음 이벤트는 오지 않음
+            await asyncio.Event().wait()
+        
+        subscription = MagicMock()
+        subscription.dropped = 0
+        subscription.get_calls = []
+        subscription.get = get
+        subscription.__enter__.return_value = subscription
+        hub = MagicMock()
+        hub.subscribe.return_value = subscription
+        app.dependency_overrides[get_notification_hub] = lambda: hub
+        
+        try:
+            with patch('src.main.ai.service.CategoryRecommendationService.CategoryRecommendationService.get_pending_recommendations') as mock_recommendations, \
+                    patch('src.main.ai.service.FileDuplicateCheckService.FileDuplicateCheckService.get_pending_duplicate_checks') as mock_checks:
+                mock_recommendations.return_value = [
+                    CategoryRecommendationStatusResponse(request_id=self.test_request_id, is_completed=False)
+                ]
+                mock_checks.return_value = []
+                
+                # when
+                with client.websocket_connect("/ai/jobs/ws") as websocket:
+                    pending = websocket.receive_json()
+                    event = websocket.receive_json()
+                
+                # then - 진행 중인 작업 목록 다음에 완료 이벤트 전송
+                assert pending == {
+                    "type": "pending",
+                    "category_recommendations": [
+                        {"request_id": self.test_request_id, "is_completed": False, "predicted_category": None}
+                    ],
+                    "file_duplicate_checks": []
+                }
+                assert event == completed.model_dump()
+                hub.subscribe.assert_called_once_with(("user_jobs", str(self.test_user_id)), max_queue_size=100)
+                mock_checks.assert_called_once_with(str(self.test_user_id), 100)
+        finally:
+            del app.dependency_overrides[get_notification_hub]
+    
+    def test_stream_user_job_events_reports_dropped_events(self, client):
+        # given
+        completed = AIJobCompletedEvent(
+            type="file_duplicate_check",
+            result=FileDuplicateCheckStatusResponse(
+                request_id=self.test_request_id,
+                file_id=self.test_check_file_id,
+                is_completed=True,
+                is_duplicated=False
+            )
+        )
+        
+        async def get(timeout=None):
+            if subscription.dropped == 0:
+                # 수신이 느려 이벤트 두 개가 버려진 상황
+                subscription.dropped = 2
+                return completed
+            await asyncio.Event().wait()
+        
+        subscription = MagicMock()
+        subscription.dropped = 0
+        subscription.get = get
+        subscription.__enter__.return_value = subscription
+        hub = MagicMock()
+        hub.subscribe.return_value = subscription
+        app.dependency_overrides[get_notification_hub] = lambda: hub
+        
+        try:
+            with patch('src.main.ai.service.CategoryRecommendationService.CategoryRecommendationService.get_pending_recommendations') as mock_recommendations, \
+                    patch('src.main.ai.service.FileDuplicateCheckService.FileDuplicateCheckService.get_pending_duplicate_checks') as mock_checks:
+                mock_recommendations.return_value = []
+                mock_checks.return_value = []
+                
+                # when
+                with client.websocket_connect("/ai/jobs/ws") as websocket:
+                    websocket.receive_json()
+                    dropped = websocket.receive_json()
+                    event = websocket.receive_json()
+                
+                # then
+                assert dropped == {"type": "events_dropped", "count": 2}
+                assert event["type"] == "file_duplicate_check"
+        finally:
+            del app.dependency_overrides[get_notification_hub]
+    
+    def test_get_category_recommendation_statuses(self, client):
+        # given
+        with patch('src.main.ai.service.CategoryRecommendationService.CategoryRecommendationService.get_recommendation_statuses') as mock_service:
+            mock_service.return_value = {
+                self.test_request_id: CategoryRecommendationStatusResponse(
+                    request_id=self.test_request_id,
+                    is_completed=True,
+                    predicted_category="기술"
+                )
+            }
+            
+            # when
+            response = client.get(
+                f"/ai/category-recommendations/statuses?request_ids={self.test_request_id}&request_ids=6123456789abcdef01234568"
+            )
+            
+            # then
+            assert response.status_code == 200
+            assert response.json() == {
+                self.test_request_id: {
+                    "request_id": self.test_request_id,
+                    "is_completed": True,
+                    "predicted_category": "기술"
+                }
+            }
+            mock_service.assert_called_once_with(
+                [self.test_request_id, "6123456789abcdef01234568"], self.test_user_id
+            )
+    
+    def test_get_file_duplicate_check_statuses(self, client):
+        # given
+        with patch('src.main.ai.service.FileDuplicateCheckService.FileDuplicateCheckService.get_duplicate_check_statuses') as mock_service:
+            mock_service.return_value = {}
+            
+            # when
+            response = client.get(f"/ai/file-duplicate-checks/statuses?file_ids={self.test_check_file_id}")
+            
+            # then
+            assert response.status_code == 200
+            assert response.json() == {}
+            mock_service.assert_called_once_with([self.test_check_file_id], str(self.test_user_id))
+    
+    def test_get_file_duplicate_check_statuses_requires_ids(self, client):
+        # when
+        response = client.get("/ai/file-duplicate-checks/statuses")
+        
+        # then
+        assert response.status_code == 422
+
@@ -1,26 +1,41 @@
+import asyncio
 import pytest
 import uuid
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from bson import ObjectId
 from datetime import datetime, timezone
 
 from src.main.ai.service.CategoryRecommendationService import CategoryRecommendationService
+from src.main.ai.notification.NotificationHub import NotificationHub, category_recommendation_topic
+from src.main.config.cache import LocalStatusCache
 from src.main.ai.models.CategoryRecommendation import (
     CategoryRecommendationRequest,
     CategoryRecommendationResponse,
+    CategoryRecommendationBulkRequest,
+    CategoryRecommendationBulkResponse,
     CategoryRecommendationStatusResponse,
-    CategoryRecommendationResultRequest
+    CategoryRecommendationResultRequest,
+    CategoryRecommendationResultBatchRequest
 )
 
 
 class TestCategoryRecommendationService:
     def setup_method(self):
-        # 목업 리포지토리 및 큐 생성
-        self.mock_repository = MagicMock()
+        # 목업 리포지토리, 큐, 아웃박스 생성
+        self.mock_repository = AsyncMock()
         self.mock_queue = MagicMock()
+        self.mock_outbox = AsyncMock()
+        self.mock_relay = MagicMock()
+        
+        # 트랜잭션은 콜백을 그대로 실행
+        async def run_in_transaction(callback):
+            return await callback("test-session")
+        self.mock_outbox.run_in_transaction.side_effect = run_in_transaction
         
         # 테스트 대상 서비스 생성
-        self.service = CategoryRecommendationService(self.mock_repository, self.mock_queue)
+        self.service = CategoryRecommendationService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay
+        )
         
         # 테스트 공통 데이터
         self.test_file_id = "67dd86ac60a0a6d929904d47"
@@ -43,23 +58,62 @@ class TestCategoryRecommendationService:
         self.mock_repository.create_recommendation_request.return_value = mongo_document
         
         # when
-        result = self.service.create_recommendation_request(request, self.test_user_id)
+        result = asyncio.run(self.service.create_recommendation_request(request, self.test_user_id))
         
         # then
         self.mock_repository.create_recommendation_request.assert_called_once_with(
             file_id=self.test_file_id,
-            user_id=str(self.test_user_id)
+            user_id=str(self.test_user_id),
+            session="test-session"
         )
         
-        self.mock_queue.send_message.assert_called_once_with(
+        # SQS로 직접 보내지 않고 같은 트랜잭션에서 아웃박스에 저장
+        self.mock_queue.build_message_entry.assert_called_once_with(
             request_id=self.test_request_id,
             file_id=self.test_file_id,
             user_id=str(self.test_user_id)
         )
+        self.mock_outbox.add_messages.assert_called_once_with(
+            [self.mock_queue.build_message_entry.return_value],
+            session="test-session"
+        )
+        self.mock_relay.notify.assert_called_once()
         
         assert isinstance(result, CategoryRecommendationResponse)
         assert result.request_id == self.test_request_id
     
+    def test_create_recommendation_requests(self):
+        # given
+        file_ids = [self.test_file_id, "67dd86ac60a0a6d929904d48"]
+        request = CategoryRecommendationBulkRequest(file_ids=file_ids)
+        object_ids = [self.test_object_id, ObjectId("6123456789abcdef01234568")]
+        self.mock_repository.create_recommendation_requests.return_value = [
+            {"_id": object_id, "file_id": file_id, "user_id": str(self.test_user_id), "is_completed": False}
+            for object_id, file_id in zip(object_ids, file_ids)
+        ]
+        self.mock_queue.build_message_entry.side_effect = lambda **kwargs: kwargs
+        
+        # when
+        result = asyncio.run(self.service.create_recommendation_requests(request, self.test_user_id))
+        
+        # then - 문서와 아웃박스 메시지를 한 트랜잭션에서 한 번씩 저장
+        self.mock_repository.create_recommendation_requests.assert_called_once_with(
+            file_ids=file_ids,
+            user_id=str(self.test_user_id),
+            session="test-session"
+        )
+        self.mock_outbox.add_messages.assert_called_once_with(
+            [
+                {"request_id": str(object_id), "file_id": file_id, "user_id": str(self.test_user_id)}
+                for object_id, file_id in zip(object_ids, file_ids)
+            ],
+            session="test-session"
+        )
+        self.mock_relay.notify.assert_called_once()
+        
+        assert isinstance(result, CategoryRecommendationBulkResponse)
+        assert result.request_ids == [str(object_id) for object_id in object_ids]
+    
     def test_get_recommendation_status_exists(self):
         # given
         # 리포지토리 응답 설정 - 완료되지 않은 추천
@@ -73,7 +127,7 @@ class TestCategoryRecommendationService:
         self.mock_repository.get_recommendation_by_id.return_value = mongo_document
         
         # when
-        result = self.service.get_recommendation_status(self.test_request_id, self.test_user_id)
+        result = asyncio.run(self.service.get_recommendation_status(self.test_request_id, self.test_user_id))
         
         # then
         self.mock_repository.get_recommendation_by_id.assert_called_once_with(
@@ -100,7 +154,7 @@ class TestCategoryRecommendationService:
         self.mock_repository.get_recommendation_by_id.return_value = mongo_document
         
         # when
-        result = self.service.get_recommendation_status(self.test_request_id, self.test_user_id)
+        result = asyncio.run(self.service.get_recommendation_status(self.test_request_id, self.test_user_id))
         
         # then
         self.mock_repository.get_recommendation_by_id.assert_called_once_with(
@@ -118,7 +172,7 @@ class TestCategoryRecommendationService:
         self.mock_repository.get_recommendation_by_id.return_value = None
         
         # when
-        result = self.service.get_recommendation_status(self.test_request_id, self.test_user_id)
+        result = asyncio.run(self.service.get_recommendation_status(self.test_request_id, self.test_user_id))
         
         # then
         self.mock_repository.get_recommendation_by_id.assert_called_once_with(
@@ -144,7 +198,7 @@ class TestCategoryRecommendationService:
         self.mock_repository.update_recommendation_result.return_value = updated_document
         
         # when
-        result = self.service.update_recommendation_result(self.test_request_id, request)
+        result = asyncio.run(self.service.update_recommendation_result(self.test_request_id, request))
         
         # then
         self.mock_repository.update_recommendation_result.assert_called_once_with(
@@ -165,7 +219,7 @@ class TestCategoryRecommendationService:
         self.mock_repository.update_recommendation_result.return_value = None
         
         # when
-        result = self.service.update_recommendation_result(self.test_request_id, request)
+        result = asyncio.run(self.service.update_recommendation_result(self.test_request_id, request))
         
         # then
         self.mock_repository.update_recommendation_result.assert_called_once_with(
@@ -173,4 +227,214 @@ class TestCategoryRecommendationService:
             predicted_category=request.predicted_category
         )
         
-        assert result is None 
\ No newline at end of file
+        assert result is None
+    
+    def test_update_recommendation_result_publishes_completion(self):
+        # given
+        hub = NotificationHub()
+        service = CategoryRecommendationService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay, hub
+        )
+        request = CategoryRecommendationResultRequest(predicted_category="기술")
+        self.mock_repository.update_recommendation_result.return_value = {
+            "_id": self.test_object_id,
+            "user_id": str(self.test_user_id),
+            "is_completed": True,
+            "predicted_category": "기술"
+        }
+        
+        async def run():
+            with hub.subscribe(category_recommendation_topic(self.test_request_id)) as subscription:
+                await service.update_recommendation_result(self.test_request_id, request)
+                return await subscription.get(timeout=1)
+        
+        # when
+        event = asyncio.run(run())
+        
+        # then
+        assert event == CategoryRecommendationStatusResponse(
+            request_id=self.test_request_id,
+            is_completed=True,
+            predicted_category="기술"
+        )
+    
+    def test_subscribe_recommendation_status_pending(self):
+        # given
+        hub = NotificationHub()
+        service = CategoryRecommendationService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay, hub
+        )
+        self.mock_repository.get_recommendation_by_id.return_value = {
+            "_id": self.test_object_id,
+            "is_completed": False
+        }
+        
+        # when
+        current, subscription = asyncio.run(
+            service.subscribe_recommendation_status(self.test_request_id, self.test_user_id)
+        )
+        
+        # then
+        assert current.is_completed is False
+        assert subscription is not None
+        assert hub.stats()["subscriptions"] == 1
+        subscription.close()
+        assert hub.stats()["subscriptions"] == 0
+    
+    def test_subscribe_recommendation_status_completed(self):
+        # given
+        hub = NotificationHub()
+        service = CategoryRecommendationService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay, hub
+        )
+        self.mock_repository.get_recommendation_by_id.return_value = {
+            "_id": self.test_object_id,
+            "is_completed": True,
+            "predicted_category": "기술"
+        }
+        
+        # when
+        current, subscription = asyncio.run(
+            service.subscribe_recommendation_status(self.test_request_id, self.test_user_id)
+        )
+        
+        # then - 이미 완료된 요청은 구독하지 않음
+        assert current.is_completed is True
+        assert subscription is None
+        assert hub.stats()["subscriptions"] == 0
+    
+    def test_get_recommendation_status_served_from_cache(self):
+        # given
+        service = CategoryRecommendationService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay,
+            cache=LocalStatusCache(max_size=10, default_ttl=60)
+        )
+        self.mock_repository.get_recommendation_by_id.return_value = {
+            "_id": self.test_object_id,
+            "is_completed": True,
+            "predicted_category": "기술"
+        }
+        
+        # when
+        first = asyncio.run(service.get_recommendation_status(self.test_request_id, self.test_user_id))
+        second = asyncio.run(service.get_recommendation_status(self.test_request_id, self.test_user_id))
+        
+        # then - 완료된 결과는 두 번째 조회부터 MongoDB를 거치지 않음
+        assert first == second
+        self.mock_repository.get_recommendation_by_id.assert_called_once()
+    
+    def test_update_recommendation_result_writes_through_cache(self):
+        # given
+        cache = LocalStatusCache(max_size=10, default_ttl=60)
+        service = CategoryRecommendationService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay, cache=cache
+        )
+        request = CategoryRecommendationResultRequest(predicted_category="기술")
+        self.mock_repository.update_recommendation_result.return_value = {
+            "_id": self.test_object_id,
+            "user_id": str(self.test_user_id),
+            "is_completed": True,
+            "predicted_category": "기술"
+        }
+        
+        # when
+        asyncio.run(service.update_recommendation_result(self.test_request_id, request))
+        result = asyncio.run(service.get_recommendation_status(self.test_request_id, self.test_user_id))
+        
+        # then
+        assert result.predicted_category == "기술"
+        self.mock_repository.get_recommendation_by_id.assert_not_called()
+    
+    def test_subscribe_recommendation_status_skips_pending_cache(self):
+        # given
+        cache = LocalStatusCache(max_size=10, default_ttl=60)
+        service = CategoryRecommendationService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay, NotificationHub(), cache
+        )
+        cache.cache.set(
+            CategoryRecommendationService.cache_key(self.test_request_id, self.test_user_id),
+            {"request_id": self.test_request_id, "is_completed": False, "predicted_category": None}
+        )
+        self.mock_repository.get_recommendation_by_id.return_value = {
+            "_id": self.test_object_id,
+            "is_completed": True,
+            "predicted_category": "기술"
+        }
+        
+        # when
+        current, subscription = asyncio.run(
+            service.subscribe_recommendation_status(self.test_request_id, self.test_user_id)
+        )
+        
+        # then
+        assert current.is_completed is True
+        assert subscription is None
+    
+    def test_get_recommendation_statuses(self):
+        # given
+        cache = LocalStatusCache(max_size=10, default_ttl=60)
+        service = CategoryRecommendationService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay, cache=cache
+        )
+        cached_id = "6123456789abcdef01234568"
+        missing_id = "6123456789abcdef01234569"
+        cache.cache.set(
+            CategoryRecommendationService.cache_key(cached_id, self.test_user_id),
+            {"request_id": cached_id, "is_completed": True, "predicted_category": "기술"}
+        )
+        self.mock_repository.get_recommendations_by_ids.return_value = [
+            {"_id": self.test_object_id, "is_completed": False}
+        ]
+        
+        # when
+        result = asyncio.run(service.get_recommendation_statuses(
+            [self.test_request_id, cached_id, missing_id], self.test_user_id
+        ))
+        
+        # then - 캐시에 없는 ID만 한 번에 조회하고, 없는 ID는 결과에서 제외
+        self.mock_repository.get_recommendations_by_ids.assert_called_once_with(
+            [self.test_request_id, missing_id], str(self.test_user_id)
+        )
+        assert list(result) == [self.test_request_id, cached_id]
+        assert result[self.test_request_id].is_completed is False
+        assert result[cached_id].predicted_category == "기술"
+    
+    def test_update_recommendation_results(self):
+        # given
+        hub = NotificationHub()
+        service = CategoryRecommendationService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay, hub
+        )
+        missing_id = "6123456789abcdef01234568"
+        request = CategoryRecommendationResultBatchRequest(results=[
+            CategoryRecommendationResultRequest(request_id=self.test_request_id, predicted_category="기술"),
+            CategoryRecommendationResultRequest(request_id=missing_id, predicted_category="예술"),
+            CategoryRecommendationResultRequest(predicted_category="예술")
+        ])
+        self.mock_repository.update_recommendation_results.return_value = [{
+            "_id": self.test_object_id,
+            "user_id": str(self.test_user_id),
+            "is_completed": True,
+            "predicted_category": "기술"
+        }]
+        
+        async def run():
+            with hub.subscribe(category_recommendation_topic(self.test_request_id)) as subscription:
+                response = await service.update_recommendation_results(request)
+                return response, await subscription.get(timeout=1)
+        
+        # when
+        result, event = asyncio.run(run())
+        
+        # then - request_id가 없는 항목은 기록하지 않고 실패로 반환
+        self.mock_repository.update_recommendation_results.assert_called_once_with([
+            (self.test_request_id, "기술"),
+            (missing_id, "예술")
+        ])
+        assert [(item.request_id, item.success) for item in result.results] == [
+            (self.test_request_id, True),
+            (missing_id, False),
+            (None, False)
+        ]
+        assert event.predicted_category == "기술"
+
@@ -1,27 +1,42 @@
+import asyncio
 import pytest
 import uuid
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from bson import ObjectId
 from datetime import datetime, timezone
 from fastapi import HTTPException
 
 from src.main.ai.service.FileDuplicateCheckService import FileDuplicateCheckService
+from src.main.ai.notification.NotificationHub import NotificationHub
+from src.main.config.cache import LocalStatusCache
+from src.main.ai.similarity.SimilarityEngine import SimilarityEngine
 from src.main.ai.models.FileDuplicateCheck import (
     FileDuplicateCheckRequest,
     FileDuplicateCheckResponse,
     FileDuplicateCheckStatusResponse,
-    FileDuplicateCheckResultRequest
+    FileDuplicateCheckResultRequest,
+    FileDuplicateCheckResultBatchRequest,
+    FileDuplicateCheckEmbeddingsRequest
 )
 
 
 class TestFileDuplicateCheckService:
     def setup_method(self):
-        # 목업 리포지토리 및 큐 생성
-        self.mock_repository = MagicMock()
+        # 목업 리포지토리, 큐, 아웃박스 생성
+        self.mock_repository = AsyncMock()
         self.mock_queue = MagicMock()
+        self.mock_outbox = AsyncMock()
+        self.mock_relay = MagicMock()
+        
+        # 트랜잭션은 콜백을 그대로 실행
+        async def run_in_transaction(callback):
+            return await callback("test-session")
+        self.mock_outbox.run_in_transaction.side_effect = run_in_transaction
         
         # 테스트 대상 서비스 생성
-        self.service = FileDuplicateCheckService(self.mock_repository, self.mock_queue)
+        self.service = FileDuplicateCheckService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay
+        )
         
         # 테스트 공통 데이터
         self.test_file_id = "6123456789abcdef01234567"
@@ -48,9 +63,6 @@ class TestFileDuplicateCheckService:
         }
         self.mock_repository.get_file_by_id.return_value = file_document
         
-        # 기존 요청 없음
-        self.mock_repository.get_duplicate_check_by_file_id.return_value = None
-        
         # 요청 생성 응답
         mongo_document = {
             "_id": self.test_object_id,
@@ -63,16 +75,27 @@ class TestFileDuplicateCheckService:
         self.mock_repository.create_duplicate_check_request.return_value = mongo_document
         
         # when
-        result = self.service.create_duplicate_check_request(request)
+        result = asyncio.run(self.service.create_duplicate_check_request(request))
         
         # then
         self.mock_repository.get_file_by_id.assert_called_once_with(self.test_file_id)
-        self.mock_repository.get_duplicate_check_by_file_id.assert_called_once_with(self.test_file_id, self.test_user_id)
+        self.mock_repository.get_duplicate_check_by_file_id.assert_not_called()
         self.mock_repository.create_duplicate_check_request.assert_called_once_with(
             file_id=self.test_file_id,
-            user_id=self.test_user_id
+            user_id=self.test_user_id,
+            session="test-session"
         )
-        self.mock_queue.send_message.assert_called_once()
+        self.mock_queue.build_message_entry.assert_called_once_with(
+            request_id=str(self.test_object_id),
+            user_id=self.test_user_id,
+            s3_bucket="test-bucket",
+            s3_key="example.pdf"
+        )
+        self.mock_outbox.add_messages.assert_called_once_with(
+            [self.mock_queue.build_message_entry.return_value],
+            session="test-session"
+        )
+        self.mock_relay.notify.assert_called_once()
         
         assert isinstance(result, FileDuplicateCheckResponse)
         assert result.request_id == str(self.test_object_id)
@@ -94,28 +117,25 @@ class TestFileDuplicateCheckService:
         }
         self.mock_repository.get_file_by_id.return_value = file_document
         
-        # 이미 요청이 존재함
-        existing_check = {
-            "_id": self.test_object_id,
-            "file_id": self.test_file_id,
-            "user_id": self.test_user_id,
-            "is_completed": False,
-            "is_duplicated": None,
-            "created_at": self.test_time
-        }
-        self.mock_repository.get_duplicate_check_by_file_id.return_value = existing_check
+        # 이미 요청이 존재함 - upsert로 생성되지 않음
+        self.mock_repository.create_duplicate_check_request.return_value = None
         
         # when & then
         with pytest.raises(HTTPException) as exc_info:
-            self.service.create_duplicate_check_request(request)
+            asyncio.run(self.service.create_duplicate_check_request(request))
         
         assert exc_info.value.status_code == 400
         assert exc_info.value.detail == "이미 중복 검사 요청이 존재합니다."
         
         self.mock_repository.get_file_by_id.assert_called_once_with(self.test_file_id)
-        self.mock_repository.get_duplicate_check_by_file_id.assert_called_once_with(self.test_file_id, self.test_user_id)
-        self.mock_repository.create_duplicate_check_request.assert_not_called()
-        self.mock_queue.send_message.assert_not_called()
+        self.mock_repository.get_duplicate_check_by_file_id.assert_not_called()
+        self.mock_repository.create_duplicate_check_request.assert_called_once_with(
+            file_id=self.test_file_id,
+            user_id=self.test_user_id,
+            session="test-session"
+        )
+        self.mock_outbox.add_messages.assert_not_called()
+        self.mock_relay.notify.assert_not_called()
     
     def test_create_duplicate_check_request_file_not_found(self):
         # given
@@ -129,13 +149,13 @@ class TestFileDuplicateCheckService:
         
         # when & then
         with pytest.raises(HTTPException) as exc_info:
-            self.service.create_duplicate_check_request(request)
+            asyncio.run(self.service.create_duplicate_check_request(request))
         
         assert exc_info.value.status_code == 404
         self.mock_repository.get_file_by_id.assert_called_once_with(self.test_file_id)
         self.mock_repository.get_duplicate_check_by_file_id.assert_not_called()
         self.mock_repository.create_duplicate_check_request.assert_not_called()
-        self.mock_queue.send_message.assert_not_called()
+        self.mock_outbox.add_messages.assert_not_called()
     
     def test_get_duplicate_check_status_exists(self):
         # given
@@ -151,7 +171,7 @@ class TestFileDuplicateCheckService:
         self.mock_repository.get_duplicate_check_by_file_id.return_value = mongo_document
         
         # when
-        result = self.service.get_duplicate_check_status(self.test_file_id, self.test_user_id)
+        result = asyncio.run(self.service.get_duplicate_check_status(self.test_file_id, self.test_user_id))
         
         # then
         self.mock_repository.get_duplicate_check_by_file_id.assert_called_once_with(
@@ -179,7 +199,7 @@ class TestFileDuplicateCheckService:
         self.mock_repository.get_duplicate_check_by_file_id.return_value = mongo_document
         
         # when
-        result = self.service.get_duplicate_check_status(self.test_file_id, self.test_user_id)
+        result = asyncio.run(self.service.get_duplicate_check_status(self.test_file_id, self.test_user_id))
         
         # then
         self.mock_repository.get_duplicate_check_by_file_id.assert_called_once_with(
@@ -199,7 +219,7 @@ class TestFileDuplicateCheckService:
         self.mock_repository.get_duplicate_check_by_file_id.return_value = None
         
         # when
-        result = self.service.get_duplicate_check_status(self.test_file_id, self.test_user_id)
+        result = asyncio.run(self.service.get_duplicate_check_status(self.test_file_id, self.test_user_id))
         
         # then
         self.mock_repository.get_duplicate_check_by_file_id.assert_called_once_with(
@@ -209,6 +229,63 @@ class TestFileDuplicateCheckService:
         
         assert result is None
     
+    def test_get_duplicate_check_status_wait_until_completed(self):
+        # given
+        hub = NotificationHub()
+        service = FileDuplicateCheckService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay, hub
+        )
+        pending_document = {
+            "_id": self.test_object_id,
+            "file_id": self.test_file_id,
+            "user_id": self.test_user_id,
+            "is_completed": False,
+            "is_duplicated": None
+        }
+        completed_document = {**pending_document, "is_completed": True, "is_duplicated": True}
+        self.mock_repository.get_duplicate_check_by_file_id.return_value = pending_document
+        self.mock_repository.get_duplicate_check_by_id.return_value = pending_document
+        self.mock_repository.update_duplicate_check_result.return_value = completed_document
+        
+        async def run():
+            waiting = asyncio.create_task(
+                service.get_duplicate_check_status(self.test_file_id, self.test_user_id, wait=5)
+            )
+            await asyncio.sleep(0)
+            # 워커 결과 콜백이 대기 중인 요청을 깨움
+            await service.update_duplicate_check_result(self.test_request_id, True)
+            return await asyncio.wait_for(waiting, 1)
+        
+        # when
+        result = asyncio.run(run())
+        
+        # then
+        self.mock_repository.get_duplicate_check_by_file_id.assert_called_once()
+        assert result.is_completed is True
+        assert result.is_duplicated is True
+        assert hub.stats()["subscriptions"] == 0
+    
+    def test_get_duplicate_check_status_wait_timeout(self):
+        # given
+        hub = NotificationHub()
+        service = FileDuplicateCheckService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay, hub
+        )
+        self.mock_repository.get_duplicate_check_by_file_id.return_value = {
+            "_id": self.test_object_id,
+            "file_id": self.test_file_id,
+            "user_id": self.test_user_id,
+            "is_completed": False,
+            "is_duplicated": None
+        }
+        
+        # when
+        result = asyncio.run(service.get_duplicate_check_status(self.test_file_id, self.test_user_id, wait=0.01))
+        
+        # then - 시간이 지나면 현재 상태 반환
+        assert result.is_completed is False
+        assert hub.stats()["subscriptions"] == 0
+    
     def test_update_duplicate_check_result_success(self):
         # given
         is_duplicated = False
@@ -245,7 +322,7 @@ class TestFileDuplicateCheckService:
         self.mock_repository.update_duplicate_check_result.return_value = updated_document
         
         # when
-        result = self.service.update_duplicate_check_result(self.test_request_id, is_duplicated)
+        result = asyncio.run(self.service.update_duplicate_check_result(self.test_request_id, is_duplicated))
         
         # then
         self.mock_repository.get_duplicate_check_by_id.assert_called_once_with(self.test_request_id)
@@ -265,11 +342,363 @@ class TestFileDuplicateCheckService:
         self.mock_repository.get_duplicate_check_by_id.return_value = None
         
         # when
-        result = self.service.update_duplicate_check_result(self.test_request_id, is_duplicated)
+        result = asyncio.run(self.service.update_duplicate_check_result(self.test_request_id, is_duplicated))
         
         # then
         self.mock_repository.get_duplicate_check_by_id.assert_called_once_with(self.test_request_id)
         self.mock_repository.update_file_duplicate_status.assert_not_called()
         self.mock_repository.update_duplicate_check_result.assert_not_called()
         
-        assert result == False 
\ No newline at end of file
+        assert result == False
+    
+    def test_get_duplicate_check_status_pending_cached_briefly(self):
+        # given
+        service = FileDuplicateCheckService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay,
+            cache=LocalStatusCache(max_size=10, default_ttl=60)
+        )
+        self.mock_repository.get_duplicate_check_by_file_id.return_value = {
+            "_id": self.test_object_id,
+            "file_id": self.test_file_id,
+            "user_id": self.test_user_id,
+            "is_completed": False,
+            "is_duplicated": None
+        }
+        
+        # when
+        for _ in range(3):
+            result = asyncio.run(service.get_duplicate_check_status(self.test_file_id, self.test_user_id))
+        
+        # then - 짧은 TTL 동안 반복 조회는 캐시에서 처리
+        assert result.is_completed is False
+        self.mock_repository.get_duplicate_check_by_file_id.assert_called_once()
+    
+    def test_update_duplicate_check_result_writes_through_cache(self):
+        # given
+        service = FileDuplicateCheckService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay,
+            cache=LocalStatusCache(max_size=10, default_ttl=60)
+        )
+        check_document = {
+            "_id": self.test_object_id,
+            "file_id": self.test_file_id,
+            "user_id": self.test_user_id,
+            "is_completed": False,
+            "is_duplicated": None
+        }
+        self.mock_repository.get_duplicate_check_by_id.return_value = check_document
+        self.mock_repository.update_duplicate_check_result.return_value = {
+            **check_document, "is_completed": True, "is_duplicated": True
+        }
+        
+        # when
+        asyncio.run(service.update_duplicate_check_result(self.test_request_id, True))
+        result = asyncio.run(service.get_duplicate_check_status(self.test_file_id, self.test_user_id))
+        
+        # then
+        assert result.is_duplicated is True
+        self.mock_repository.get_duplicate_check_by_file_id.assert_not_called()
+    
+    def test_get_duplicate_check_statuses(self):
+        # given
+        other_file_id = "6123456789abcdef01234568"
+        self.mock_repository.get_duplicate_checks_by_file_ids.return_value = [
+            {
+                "_id": self.test_object_id,
+                "file_id": self.test_file_id,
+                "user_id": self.test_user_id,
+                "is_completed": True,
+                "is_duplicated": False
+            }
+        ]
+        
+        # when
+        result = asyncio.run(self.service.get_duplicate_check_statuses(
+            [self.test_file_id, other_file_id, self.test_file_id], self.test_user_id
+        ))
+        
+        # then - 중복 ID를 제거하고 $in 쿼리 한 번으로 조회
+        self.mock_repository.get_duplicate_checks_by_file_ids.assert_called_once_with(
+            [self.test_file_id, other_file_id], self.test_user_id
+        )
+        assert list(result) == [self.test_file_id]
+        assert result[self.test_file_id].is_duplicated is False
+    
+    def test_update_duplicate_check_results(self):
+        # given
+        hub = NotificationHub()
+        service = FileDuplicateCheckService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay,
+            hub=hub, cache=LocalStatusCache(max_size=10, default_ttl=60)
+        )
+        failed_request_id = "7123456789abcdef01234568"
+        missing_request_id = "7123456789abcdef01234569"
+        check_document = {
+            "_id": self.test_object_id,
+            "file_id": self.test_file_id,
+            "user_id": self.test_user_id,
+            "is_completed": False,
+            "is_duplicated": None
+        }
+        failed_document = {**check_document, "_id": ObjectId(failed_request_id), "file_id": "6123456789abcdef01234568"}
+        self.mock_repository.get_duplicate_checks_by_ids.return_value = [check_document, failed_document]
+        self.mock_repository.update_duplicate_check_results.return_value = {ObjectId(failed_request_id)}
+        request = FileDuplicateCheckResultBatchRequest(results=[
+            FileDuplicateCheckResultRequest(request_id=missing_request_id, is_duplicated=True),
+            FileDuplicateCheckResultRequest(request_id=self.test_request_id, is_duplicated=True),
+            FileDuplicateCheckResultRequest(request_id=failed_request_id, is_duplicated=False)
+        ])
+        
+        async def run():
+            with hub.subscribe(("file_duplicate_check", self.test_file_id, self.test_user_id)) as subscription:
+                response = await service.update_duplicate_check_results(request)
+                return response, await subscription.get(timeout=1)
+        
+        # when
+        response, event = asyncio.run(run())
+        status = asyncio.run(service.get_duplicate_check_status(self.test_file_id, self.test_user_id))
+        
+        # then - $in 조회 한 번, bulk_write 묶음 한 번으로 처리하고 다시 조회하지 않음
+        self.mock_repository.get_duplicate_checks_by_ids.assert_called_once_with(
+            [missing_request_id, self.test_request_id, failed_request_id]
+        )
+        self.mock_repository.update_duplicate_check_results.assert_called_once_with(
+            [(check_document, True), (failed_document, False)]
+        )
+        self.mock_repository.get_duplicate_check_by_id.assert_not_called()
+        self.mock_repository.get_duplicate_check_by_file_id.assert_not_called()
+        
+        # then - 항목별 결과는 요청 순서대로 반환
+        assert [(item.request_id, item.success) for item in response.results] == [
+            (missing_request_id, False),
+            (self.test_request_id, True),
+            (failed_request_id, False)
+        ]
+        assert response.results[1].result.is_completed is True
+        assert response.results[1].result.is_duplicated is True
+        assert event.is_duplicated is True
+        assert status.is_duplicated is True
+    
+    def test_save_file_embedding(self):
+        # given
+        self.mock_repository.get_file_by_id.return_value = {"_id": self.test_file_object_id}
+        request = FileDuplicateCheckEmbeddingsRequest(file_id=self.test_file_id, embeddings=[0.1, 0.2, 0.3])
+        
+        # when
+        response = asyncio.run(self.service.save_file_embedding(request))
+        
+        # then
+        self.mock_repository.save_file_embedding.assert_called_once_with(self.test_file_id, [0.1, 0.2, 0.3])
+        assert response.file_id == self.test_file_id
+        assert response.dimensions == 3
+    
+    def test_save_file_embedding_file_not_found(self):
+        # given
+        self.mock_repository.get_file_by_id.return_value = None
+        request = FileDuplicateCheckEmbeddingsRequest(file_id=self.test_file_id, embeddings=[0.1])
+        
+        # when
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(self.service.save_file_embedding(request))
+        
+        # then
+        assert exc_info.value.status_code == 404
+        self.mock_repository.save_file_embedding.assert_not_called()
+    
+    def test_create_duplicate_check_request_identical_content(self):
+        # given
+        service, similarity = self.create_similarity_service()
+        content_hash = "a" * 64
+        self.mock_repository.get_file_by_id.return_value = {"_id": self.test_file_object_id, "sha256": content_hash}
+        self.mock_repository.find_file_by_content_hash.return_value = {"_id": ObjectId("6123456789abcdef01234568")}
+        self.mock_repository.create_duplicate_check_request.return_value = {
+            "_id": self.test_object_id,
+            "file_id": self.test_file_id,
+            "user_id": self.test_user_id,
+            "is_completed": True,
+            "is_duplicated": True
+        }
+        request = FileDuplicateCheckRequest(user_id=self.test_user_id, file_id=self.test_file_id)
+        
+        # when
+        result = asyncio.run(service.create_duplicate_check_request(request))
+        
+        # then - 임베딩 없이 해시만으로 중복 판정
+        self.mock_repository.find_file_by_content_hash.assert_called_once_with(content_hash, self.test_file_id)
+        self.mock_repository.create_duplicate_check_request.assert_called_once_with(
+            file_id=self.test_file_id,
+            user_id=self.test_user_id,
+            is_duplicated=True
+        )
+        self.mock_repository.update_file_duplicate_status.assert_called_once_with(self.test_file_id, True)
+        self.mock_outbox.run_in_transaction.assert_not_called()
+        assert similarity.checks == 0
+        assert result == FileDuplicateCheckResponse(
+            request_id=str(self.test_object_id), is_completed=True, is_duplicated=True
+        )
+    
+    def test_create_duplicate_check_request_unique_content_uses_worker(self):
+        # given
+        self.mock_repository.get_file_by_id.return_value = {
+            "_id": self.test_file_object_id,
+            "s3_bucket": "test-bucket",
+            "s3_key": "example.pdf",
+            "sha256": "a" * 64
+        }
+        self.mock_repository.find_file_by_content_hash.return_value = None
+        self.mock_repository.create_duplicate_check_request.return_value = {"_id": self.test_object_id}
+        request = FileDuplicateCheckRequest(user_id=self.test_user_id, file_id=self.test_file_id)
+        
+        # when
+        result = asyncio.run(self.service.create_duplicate_check_request(request))
+        
+        # then - 같은 내용의 파일이 없으면 기존처럼 아웃박스에 메시지 저장
+        self.mock_repository.find_file_by_content_hash.assert_called_once_with("a" * 64, self.test_file_id)
+        self.mock_outbox.add_messages.assert_called_once()
+        assert result == FileDuplicateCheckResponse(request_id=str(self.test_object_id))
+    
+    def test_create_duplicate_check_request_without_content_hash(self):
+        # given
+        self.mock_repository.get_file_by_id.return_value = {
+            "_id": self.test_file_object_id,
+            "s3_bucket": "test-bucket",
+            "s3_key": "example.pdf"
+        }
+        self.mock_repository.create_duplicate_check_request.return_value = {"_id": self.test_object_id}
+        request = FileDuplicateCheckRequest(user_id=self.test_user_id, file_id=self.test_file_id)
+        
+        # when
+        asyncio.run(self.service.create_duplicate_check_request(request))
+        
+        # then
+        self.mock_repository.find_file_by_content_hash.assert_not_called()
+        self.mock_outbox.add_messages.assert_called_once()
+    
+    def test_save_file_embedding_records_content_hash(self):
+        # given
+        self.mock_repository.get_file_by_id.return_value = {"_id": self.test_file_object_id}
+        request = FileDuplicateCheckEmbeddingsRequest(
+            file_id=self.test_file_id, embeddings=[0.1, 0.2], sha256="b" * 64
+        )
+        
+        # when
+        asyncio.run(self.service.save_file_embedding(request))
+        
+        # then
+        self.mock_repository.save_file_content_hash.assert_called_once_with(self.test_file_id, "b" * 64)
+    
+    def test_save_file_embedding_rejects_invalid_content_hash(self):
+        # when & then
+        with pytest.raises(ValueError):
+            FileDuplicateCheckEmbeddingsRequest(file_id=self.test_file_id, embeddings=[0.1], sha256="not-a-hash")
+    
+    def create_similarity_service(self):
+        similarity = SimilarityEngine(threshold=0.95)
+        similarity.ready = True
+        service = FileDuplicateCheckService(
+            self.mock_repository, self.mock_queue, self.mock_outbox, self.mock_relay,
+            cache=LocalStatusCache(max_size=10, default_ttl=60), similarity=similarity
+        )
+        return service, similarity
+    
+    def test_create_duplicate_check_request_decided_by_similarity(self):
+        # given
+        service, similarity = self.create_similarity_service()
+        asyncio.run(similarity.add(self.test_file_id, [1.0, 0.0, 0.0]))
+        asyncio.run(similarity.add("6123456789abcdef01234568", [0.99, 0.05, 0.0]))
+        self.mock_repository.get_file_by_id.return_value = {"_id": self.test_file_object_id}
+        self.mock_repository.create_duplicate_check_request.return_value = {
+            "_id": self.test_object_id,
+            "file_id": self.test_file_id,
+            "user_id": self.test_user_id,
+            "is_completed": True,
+            "is_duplicated": True
+        }
+        request = FileDuplicateCheckRequest(user_id=self.test_user_id, file_id=self.test_file_id)
+        
+        # when
+        result = asyncio.run(service.create_duplicate_check_request(request))
+        status = asyncio.run(service.get_duplicate_check_status(self.test_file_id, self.test_user_id))
+        
+        # then - 워커를 거치지 않고 완료된 요청을 생성
+        self.mock_repository.create_duplicate_check_request.assert_called_once_with(
+            file_id=self.test_file_id,
+            user_id=self.test_user_id,
+            is_duplicated=True
+        )
+        self.mock_repository.update_file_duplicate_status.assert_called_once_with(self.test_file_id, True)
+        self.mock_outbox.run_in_transaction.assert_not_called()
+        self.mock_relay.notify.assert_not_called()
+        assert result == FileDuplicateCheckResponse(
+            request_id=str(self.test_object_id), is_completed=True, is_duplicated=True
+        )
+        assert status.is_duplicated is True
+        self.mock_repository.get_duplicate_check_by_file_id.assert_not_called()
+    
+    def test_create_duplicate_check_request_not_duplicated_by_similarity(self):
+        # given
+        service, similarity = self.create_similarity_service()
+        asyncio.run(similarity.add(self.test_file_id, [1.0, 0.0, 0.0]))
+        asyncio.run(similarity.add("6123456789abcdef01234568", [0.0, 1.0, 0.0]))
+        self.mock_repository.get_file_by_id.return_value = {"_id": self.test_file_object_id}
+        self.mock_repository.create_duplicate_check_request.return_value = {
+            "_id": self.test_object_id,
+            "file_id": self.test_file_id,
+            "user_id": self.test_user_id,
+            "is_completed": True,
+            "is_duplicated": False
+        }
+        request = FileDuplicateCheckRequest(user_id=self.test_user_id, file_id=self.test_file_id)
+        
+        # when
+        result = asyncio.run(service.create_duplicate_check_request(request))
+        
+        # then
+        self.mock_repository.update_file_duplicate_status.assert_called_once_with(self.test_file_id, False)
+        assert result.is_duplicated is False
+    
+    def test_create_duplicate_check_request_without_embedding_uses_worker(self):
+        # given
+        service, similarity = self.create_similarity_service()
+        asyncio.run(similarity.add("6123456789abcdef01234568", [1.0, 0.0, 0.0]))
+        self.mock_repository.get_file_by_id.return_value = {
+            "_id": self.test_file_object_id,
+            "s3_bucket": "test-bucket",
+            "s3_key": "example.pdf"
+        }
+        self.mock_repository.create_duplicate_check_request.return_value = {"_id": self.test_object_id}
+        request = FileDuplicateCheckRequest(user_id=self.test_user_id, file_id=self.test_file_id)
+        
+        # when
+        result = asyncio.run(service.create_duplicate_check_request(request))
+        
+        # then - 임베딩이 없으면 기존처럼 아웃박스에 메시지 저장
+        self.mock_outbox.add_messages.assert_called_once()
+        assert result == FileDuplicateCheckResponse(request_id=str(self.test_object_id))
+    
+    def test_save_file_embedding_adds_to_similarity_index(self):
+        # given
+        service, similarity = self.create_similarity_service()
+        self.mock_repository.get_file_by_id.return_value = {"_id": self.test_file_object_id}
+        request = FileDuplicateCheckEmbeddingsRequest(file_id=self.test_file_id, embeddings=[0.1, 0.2, 0.3])
+        
+        # when
+        asyncio.run(service.save_file_embedding(request))
+        
+        # then
+        assert self.test_file_id in similarity.index
+    
+    def test_save_file_embedding_with_mismatched_dimensions(self):
+        # given
+        service, similarity = self.create_similarity_service()
+        asyncio.run(similarity.add("6123456789abcdef01234568", [1.0, 0.0, 0.0]))
+        self.mock_repository.get_file_by_id.return_value = {"_id": self.test_file_object_id}
+        request = FileDuplicateCheckEmbeddingsRequest(file_id=self.test_file_id, embeddings=[0.1, 0.2])
+        
+        # when
+        response = asyncio.run(service.save_file_embedding(request))
+        
+        # then - 저장은 성공하고 유사도 인덱스에는 추가하지 않음
+        self.mock_repository.save_file_embedding.assert_called_once_with(self.test_file_id, [0.1, 0.2])
+        assert response.dimensions == 2
+        assert self.test_file_id not in similarity.index
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+from bson.binary import Binary, BinaryVectorDtype
+
+from src.main.ai.similarity.EmbeddingIndex import ExactIndex, embedding_to_array, normalize
+
+
+class TestEmbeddingToArray:
+    def test_binary_vector(self):
+        # given
+        embedding = Binary.from_vector([0.5, -1.0, 2.25], BinaryVectorDtype.FLOAT32)
+
+        # when
+        result = embedding_to_array(embedding)
+
+        # then
+        assert result.dtype == np.float32
+        assert result.tolist() == [0.5, -1.0, 2.25]
+
+    def test_legacy_float_array(self):
+        # when
+        result = embedding_to_array([0.5, -1.0])
+
+        # then
+        assert result.dtype == np.float32
+        assert result.tolist() == [0.5, -1.0]
+
+    def test_normalize_keeps_zero_vector(self):
+        # when
+        result = normalize(np.array([[3.0, 4.0], [0.0, 0.0]]))
+
+        # then
+        assert np.allclose(result, [[0.6, 0.8], [0.0, 0.0]])
+
+
+class TestExactIndex:
+    def setup_method(self):
+        self.index = ExactIndex(initial_capacity=2)
+
+    def test_search_orders_by_cosine_similarity(self):
+        # given
+        self.index.add_many(["a", "b", "c"], np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]))
+
+        # when
+        result = self.index.search([2.0, 0.1], k=2)
+
+        # then - 크기와 무관하게 방향으로만 비교
+        assert [file_id for file_id, _ in result] == ["a", "c"]
+        assert result[0][1] == pytest.approx(0.99875, abs=1e-4)
+
+    def test_search_excludes_file(self):
+        # given
+        self.index.add_many(["a", "b"], np.array([[1.0, 0.0], [0.0, 1.0]]))
+
+        # when
+        result = self.index.search([1.0, 0.0], k=1, exclude="a")
+
+        # then
+        assert result[0][0] == "b"
+
+    def test_search_empty(self):
+        # when
+        result = self.index.search([1.0, 0.0])
+
+        # then
+        assert result == []
+
+    def test_add_grows_contiguous_matrix(self):
+        # when
+        for i in range(5):
+            self.index.add(str(i), [float(i + 1), 1.0])
+
+        # then
+        assert len(self.index) == 5
+        assert self.index.vectors.shape == (5, 2)
+        assert self.index.vectors.flags["C_CONTIGUOUS"]
+        assert np.allclose(np.linalg.norm(self.index.vectors, axis=1), 1.0)
+
+    def test_add_replaces_existing_vector(self):
+        # given
+        self.index.add("a", [1.0, 0.0])
+
+        # when
+        self.index.add_many(["a", "a"], np.array([[0.0, 2.0], [0.0, 1.0]]))
+
+        # then
+        assert len(self.index) == 1
+        assert self.index.get("a").tolist() == [0.0, 1.0]
+
+    def test_add_dimension_mismatch(self):
+        # given
+        self.index.add("a", [1.0, 0.0])
+
+        # when / then
+        with pytest.raises(ValueError):
+            self.index.add("b", [1.0, 0.0, 0.0])
+
+    def test_remove_moves_last_row(self):
+        # given
+        self.index.add_many(["a", "b", "c"], np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]))
+
+        # when
+        removed = self.index.remove("a")
+
+        # then
+        assert removed is True
+        assert "a" not in self.index
+        assert len(self.index) == 2
+        assert self.index.search([1.0, 1.0], k=1)[0][0] == "c"
+        assert self.index.remove("a") is False
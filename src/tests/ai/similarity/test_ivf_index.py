@@ -0,0 +1,181 @@
+import asyncio
+import numpy as np
+from datetime import datetime
+import pytest
+
+from src.main.ai.similarity.EmbeddingIndex import ExactIndex, normalize
+from src.main.ai.similarity.IVFIndex import IVFIndex, train_kmeans
+from src.main.ai.similarity.MemmapIndex import MemmapIndex
+from src.main.ai.similarity.benchmark import build_index, generate_clustered_vectors, measure, run
+
+
+class TestTrainKmeans:
+    def test_finds_separated_clusters(self):
+        # given
+        vectors = normalize(np.array([[1.0, 0.0], [0.9, 0.1], [0.0, 1.0], [0.1, 0.9]]))
+
+        # when
+        centroids = train_kmeans(vectors, clusters=2, iterations=5)
+
+        # then
+        assert centroids.shape == (2, 2)
+        assert np.allclose(np.linalg.norm(centroids, axis=1), 1.0)
+        assert sorted(np.argmax(centroids, axis=1).tolist()) == [0, 1]
+
+
+class TestIVFIndex:
+    def setup_method(self):
+        self.vectors = generate_clustered_vectors(2000, 16, clusters=20, seed=0)
+        self.index = build_index(IVFIndex(nlist=16, nprobe=4, train_size=500), self.vectors, batch_size=300)
+        self.exact = build_index(ExactIndex(), self.vectors)
+
+    def test_trains_after_train_size(self):
+        # then
+        assert self.index.is_trained is True
+        assert len(self.index) == 2000
+        assert self.index.stats()["nlist"] == 16
+
+    def test_search_all_lists_matches_exact(self):
+        # given
+        query = self.vectors[7]
+
+        # when
+        result = self.index.search(query, k=5, nprobe=16)
+
+        # then - 모든 목록을 비교하면 전수 비교와 같음
+        expected = self.exact.search(query, k=5)
+        assert [file_id for file_id, _ in result] == [file_id for file_id, _ in expected]
+        assert [score for _, score in result] == pytest.approx([score for _, score in expected])
+
+    def test_recall_on_clustered_data(self):
+        # when
+        report = measure(self.index, self.exact, self.vectors[:50], k=10)
+
+        # then
+        assert report["recall"] >= 0.9
+
+    def test_search_before_training_is_exact(self):
+        # given
+        index = IVFIndex(nlist=4, train_size=100)
+        index.add_many(["a", "b"], np.array([[1.0, 0.0], [0.0, 1.0]]))
+
+        # when
+        result = index.search([1.0, 0.1], k=1)
+
+        # then
+        assert index.is_trained is False
+        assert result[0][0] == "a"
+
+    def test_add_does_not_train_inline(self):
+        # given
+        index = IVFIndex(nlist=16, train_size=500)
+
+        # when
+        index.add_many([str(row) for row in range(600)], self.vectors[:600])
+
+        # then - 학습은 train()에서 별도 스레드로 수행
+        assert index.is_trained is False
+        assert index.needs_training() is True
+
+    def test_train_applies_changes_made_during_training(self):
+        # given
+        index = IVFIndex(nlist=16, train_size=500)
+        index.add_many([str(row) for row in range(600)], self.vectors[:600])
+        replacement = -self.vectors[0]
+
+        async def train_while_changing():
+            task = asyncio.create_task(index.train())
+            await asyncio.sleep(0)
+            # 학습 중에도 기존 목록으로 추가/삭제/검색
+            index.add("0", replacement)
+            index.add("new", self.vectors[700])
+            index.remove("1")
+            assert index.search(self.vectors[2], k=1)[0][0] == "2"
+            await task
+
+        # when
+        asyncio.run(train_while_changing())
+
+        # then
+        assert index.is_trained is True
+        assert index.needs_training() is False
+        assert len(index) == 600
+        assert "1" not in index
+        assert np.allclose(index.get("0"), normalize(replacement))
+        assert index.search(replacement, k=1, nprobe=16)[0][0] == "0"
+        assert index.search(self.vectors[700], k=1, nprobe=16)[0][0] == "new"
+
+    def test_incremental_add_replace_and_remove(self):
+        # given
+        replacement = -self.vectors[0]
+
+        # when
+        self.index.add("0", replacement)
+        self.index.add("new", self.vectors[1])
+        self.index.remove("2")
+
+        # then
+        assert len(self.index) == 2000
+        assert np.allclose(self.index.get("0"), normalize(replacement))
+        assert self.index.search(replacement, k=1)[0][0] == "0"
+        assert "2" not in self.index
+        assert self.index.get("2") is None
+
+    def test_rebuilds_lists_from_disk_vector_index(self, tmp_path):
+        # given
+        index = build_index(IVFIndex(nlist=16, train_size=500, vector_index=MemmapIndex(str(tmp_path))), self.vectors)
+        index.remove("5")
+        index.synced_at = datetime(2024, 1, 1)
+        index.close()
+
+        # when
+        reopened = IVFIndex(nlist=16, train_size=500, vector_index=MemmapIndex(str(tmp_path)))
+        asyncio.run(reopened.restore())
+
+        # then - Mongo를 다시 읽지 않도록 디스크의 벡터와 동기화 시각을 사용하고, 저장된 대표 벡터로 목록을 나눔
+        assert len(reopened) == 1999
+        assert "5" not in reopened
+        assert reopened.synced_at == datetime(2024, 1, 1)
+        assert reopened.is_trained is True
+        assert reopened.needs_training() is False
+        assert np.allclose(reopened.centroids, index.centroids)
+        assert reopened.search(self.vectors[7], k=1)[0][0] == "7"
+        reopened.close()
+
+    def test_restore_without_saved_centroids_trains_in_background(self, tmp_path):
+        # given - 학습 전에 멈춘 디스크 인덱스
+        index = IVFIndex(nlist=16, train_size=5000, vector_index=MemmapIndex(str(tmp_path)))
+        index.add_many([str(row) for row in range(2000)], self.vectors)
+        index.close()
+
+        # when
+        reopened = IVFIndex(nlist=16, train_size=500, vector_index=MemmapIndex(str(tmp_path)))
+        assert len(reopened) == 0
+        asyncio.run(reopened.restore())
+
+        # then - 생성자가 아닌 restore()에서 목록을 만들고, 학습은 train()에서
+        assert len(reopened) == 2000
+        assert reopened.needs_training() is True
+        asyncio.run(reopened.train())
+        assert reopened.search(self.vectors[7], k=1, nprobe=16)[0][0] == "7"
+        reopened.close()
+
+    def test_search_excludes_file(self):
+        # when
+        result = self.index.search(self.vectors[3], k=1, exclude="3")
+
+        # then
+        assert result[0][0] != "3"
+
+
+class TestBenchmark:
+    def test_run_reports_recall_and_latency(self):
+        # when
+        reports = run(IVFIndex(nlist=8, train_size=200), size=1000, dimensions=8, queries=20, k=5, nprobes=[1, 8])
+
+        # then
+        assert [report["index"] for report in reports] == ["exact", "ivf", "ivf"]
+        assert reports[0]["recall"] == 1.0
+        assert reports[2]["nprobe"] == 8
+        assert reports[2]["recall"] == 1.0
+        assert all(report["mean_ms"] >= 0 for report in reports)
@@ -0,0 +1,193 @@
+import asyncio
+import numpy as np
+import pytest
+
+from src.main.ai.similarity.EmbeddingIndex import ExactIndex, normalize
+from src.main.ai.similarity.LSHIndex import (
+    MERGE_ROWS,
+    LSHIndex,
+    SimHasher,
+    bands_for_false_negative_rate,
+    collision_probability
+)
+from src.main.ai.similarity.MemmapIndex import MemmapIndex
+from src.main.ai.similarity.benchmark import build_index, generate_clustered_vectors, measure
+
+
+class TestCollisionProbability:
+    def test_identical_vectors_always_collide(self):
+        # then
+        assert collision_probability(1.0, rows=16, bands=1) == pytest.approx(1.0)
+
+    def test_bands_for_false_negative_rate(self):
+        # when
+        bands = bands_for_false_negative_rate(0.95, rows=16, false_negative_rate=0.01)
+
+        # then - 기준 유사도에서는 놓침 확률을 지키고, 무관한 벡터는 거의 후보가 되지 않음
+        assert 1 - collision_probability(0.95, 16, bands) <= 0.01
+        assert 1 - collision_probability(0.95, 16, bands - 1) > 0.01
+        assert collision_probability(0.0, 16, bands) < 0.001
+
+
+class TestSimHasher:
+    def test_band_keys(self):
+        # given
+        hasher = SimHasher(dimensions=8, bands=4, rows=16)
+        vectors = normalize(np.random.default_rng(0).standard_normal((3, 8)))
+
+        # when
+        keys = hasher.band_keys(vectors)
+
+        # then - 부호만 보므로 크기가 달라도 같은 키
+        assert keys.shape == (3, 4)
+        assert keys.dtype == np.uint64
+        assert np.array_equal(hasher.band_keys(vectors * 3), keys)
+        assert int(keys.max()) < 2 ** 16
+
+    def test_rejects_too_many_rows(self):
+        # when / then
+        with pytest.raises(ValueError):
+            SimHasher(dimensions=8, bands=1, rows=65)
+
+
+class TestLSHIndex:
+    def setup_method(self):
+        self.vectors = generate_clustered_vectors(5000, 64, clusters=50, noise=1.0, seed=0)
+        rng = np.random.default_rng(1)
+        # 저장된 파일에 작은 변화를 준 중복 후보 질의
+        self.queries = self.vectors[:100] + 0.1 * rng.standard_normal((100, 64)).astype(np.float32)
+        self.exact = build_index(ExactIndex(), self.vectors)
+        self.index = build_index(LSHIndex(), self.vectors, batch_size=1000)
+
+    def test_near_duplicate_recall_with_few_candidates(self):
+        # when
+        report = measure(self.index, self.exact, self.queries, k=1)
+
+        # then - 일부 후보만 정확히 비교
+        assert report["recall"] >= 0.98
+        assert self.index.stats()["mean_candidates"] < len(self.index) * 0.1
+
+    def test_search_scores_are_exact(self):
+        # when
+        result = self.index.search(self.queries[0], k=1)
+
+        # then
+        expected = self.exact.search(self.queries[0], k=1)
+        assert result[0][0] == expected[0][0]
+        assert result[0][1] == pytest.approx(expected[0][1])
+
+    def test_unrelated_query_has_no_candidates(self):
+        # given
+        index = LSHIndex(bands=4, rows=16)
+        index.add_many(["a", "b"], np.array([[1.0, 0.0, 0.0], [0.9, 0.1, 0.0]]))
+
+        # when
+        result = index.search([-1.0, 0.0, 0.0], k=1)
+
+        # then - 반대 방향 벡터는 어느 밴드에서도 만나지 않음
+        assert result == []
+
+    def test_incremental_add_replace_and_remove(self):
+        # given
+        replacement = -self.vectors[0]
+
+        # when
+        self.index.add("0", replacement)
+        self.index.add("new", self.vectors[1])
+        self.index.remove("2")
+
+        # then
+        assert len(self.index) == 5000
+        assert self.index.search(replacement, k=1)[0][0] == "0"
+        assert self.index.search(self.vectors[0], k=1)[0][0] != "0"
+        assert "2" not in self.index
+        assert self.index.get("2") is None
+        assert "2" not in self.index.candidates_for(self.vectors[2])
+
+    def test_search_excludes_file(self):
+        # when
+        result = self.index.search(self.vectors[3], k=1, exclude="3")
+
+        # then
+        assert result == [] or result[0][0] != "3"
+
+    def test_rebuilds_buckets_from_disk_vector_index(self, tmp_path):
+        # given
+        index = build_index(LSHIndex(vector_index=MemmapIndex(str(tmp_path))), self.vectors[:500])
+        index.close()
+
+        # when
+        reopened = LSHIndex(vector_index=MemmapIndex(str(tmp_path)))
+        asyncio.run(reopened.restore())
+
+        # then
+        assert len(reopened) == 500
+        assert reopened.search(self.queries[0], k=1)[0][0] == "0"
+        reopened.close()
+
+    def test_constructor_does_not_rebuild_buckets(self, tmp_path):
+        # given
+        index = build_index(LSHIndex(vector_index=MemmapIndex(str(tmp_path))), self.vectors[:500])
+        index.close()
+
+        # when
+        reopened = LSHIndex(vector_index=MemmapIndex(str(tmp_path)))
+
+        # then - 버킷은 restore()에서 다시 만듦
+        assert len(reopened) == 0
+        assert len(reopened.vector_index) == 500
+        reopened.close()
+
+    def test_restore_keeps_changes_made_while_restoring(self):
+        # given
+        vector_index = build_index(ExactIndex(), self.vectors[:100])
+        index = LSHIndex(vector_index=vector_index)
+        replacement = -self.vectors[0]
+
+        async def restore_with_changes():
+            restoring = asyncio.create_task(index.restore())
+            await asyncio.sleep(0)
+            index.add("0", replacement)
+            index.remove("1")
+            await restoring
+
+        # when
+        asyncio.run(restore_with_changes())
+
+        # then
+        assert len(index) == 99
+        assert index.search(replacement, k=1)[0][0] == "0"
+        assert "1" not in index.candidates_for(self.vectors[1])
+
+    def test_candidates_include_merged_and_recent_rows(self):
+        # given - MERGE_ROWS개를 넘으면 정렬 배열에 합치고 이후 행은 직접 비교
+        index = build_index(LSHIndex(), self.vectors[:MERGE_ROWS + 100], batch_size=100)
+
+        # then
+        assert 0 < index._merged < len(index)
+        assert "0" in index.candidates_for(self.vectors[0])
+        assert str(MERGE_ROWS + 99) in index.candidates_for(self.vectors[MERGE_ROWS + 99])
+
+    def test_compact_drops_dead_rows(self):
+        # given
+        index = LSHIndex(compact_min_rows=10)
+        build_index(index, self.vectors[:100])
+        for row in range(50):
+            index.remove(str(row))
+        index.add("99", self.vectors[0])
+
+        # when
+        assert index.needs_compaction()
+        asyncio.run(index.compact())
+
+        # then
+        stats = index.stats()
+        assert stats["rows"] == 50
+        assert stats["dead_rows"] == 0
+        assert index.search(self.vectors[0], k=1)[0][0] == "99"
+        assert index.search(self.vectors[60], k=1)[0][0] == "60"
+
+    def test_memory_per_file(self):
+        # then - 파일당 밴드 키, 정렬 키, 행 번호만 배열로 저장
+        stats = self.index.stats()
+        assert stats["memory_bytes"] / len(self.index) < 1024
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import numpy as np
+import pytest
+from datetime import datetime
+
+from src.main.ai.similarity.MemmapIndex import MemmapIndex
+
+
+class TestMemmapIndex:
+    @pytest.fixture(autouse=True)
+    def setup_index(self, tmp_path):
+        self.path = str(tmp_path / "index")
+        self.index = MemmapIndex(self.path, initial_capacity=2, compact_ratio=0.2, compact_min_rows=1)
+        yield
+        self.index.close()
+
+    def reopen(self):
+        self.index.close()
+        self.index = MemmapIndex(self.path, initial_capacity=2, compact_ratio=0.2, compact_min_rows=1)
+
+    def test_search_orders_by_cosine_similarity(self):
+        # given
+        self.index.add_many(["a", "b", "c"], np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]))
+
+        # when
+        result = self.index.search([2.0, 0.1], k=2)
+
+        # then
+        assert [file_id for file_id, _ in result] == ["a", "c"]
+
+    def test_reopen_restores_vectors_and_ids(self):
+        # given
+        self.index.add_many(["a", "b", "c"], np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]))
+        self.index.add("a", [0.0, -1.0])
+        self.index.remove("b")
+        self.index.synced_at = datetime(2025, 1, 1)
+        self.index.flush()
+
+        # when
+        self.reopen()
+
+        # then - 행렬을 읽지 않고 매핑만 해서 이전 상태를 복원
+        assert isinstance(self.index._vectors, np.memmap)
+        assert len(self.index) == 2
+        assert "b" not in self.index
+        assert self.index.get("a").tolist() == [0.0, -1.0]
+        assert self.index.search([0.0, -1.0], k=1)[0][0] == "a"
+        assert self.index.synced_at == datetime(2025, 1, 1)
+
+    def test_replaced_and_removed_rows_are_excluded_from_search(self):
+        # given
+        self.index.add_many(["a", "b"], np.array([[1.0, 0.0], [0.0, 1.0]]))
+        self.index.add("a", [0.0, 1.0])
+        self.index.remove("b")
+
+        # when
+        result = self.index.search([1.0, 0.0], k=3)
+
+        # then
+        assert [file_id for file_id, _ in result] == ["a"]
+        assert self.index.dead_rows == 2
+
+    def test_reopen_ignores_truncated_id_log_line(self):
+        # given
+        self.index.add("a", [1.0, 0.0])
+        self.index.flush()
+        with open(f"{self.path}/ids.0.log", "a", encoding="utf-8") as f:
+            f.write("+b")
+
+        # when
+        self.reopen()
+
+        # then
+        assert len(self.index) == 1
+        assert "b" not in self.index
+
+    def test_compact_rewrites_live_rows(self):
+        # given
+        self.index.add_many(["a", "b", "c"], np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]))
+        self.index.remove("b")
+        self.index.add("c", [-1.0, 0.0])
+        assert self.index.needs_compaction() is True
+
+        # when
+        asyncio.run(self.index.compact())
+
+        # then
+        assert self.index.generation == 1
+        assert self.index.dead_rows == 0
+        assert len(self.index) == 2
+        assert self.index.get("c").tolist() == [-1.0, 0.0]
+        assert not os.path.exists(f"{self.path}/vectors.0.f32")
+        assert not os.path.exists(f"{self.path}/ids.0.log")
+
+        # then - 새 세대로 다시 열어도 같은 상태
+        self.reopen()
+        assert self.index.generation == 1
+        assert sorted(file_id for file_id, _ in self.index.search([1.0, 0.0], k=5)) == ["a", "c"]
+
+    def test_compact_keeps_changes_made_while_copying(self):
+        # given
+        self.index.add_many(["a", "b", "c"], np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]]))
+        self.index.remove("c")
+        write_generation = self.index._write_generation
+
+        def write_and_change(*args):
+            # 복사 중에 루프에서 들어온 변경을 흉내냄
+            write_generation(*args)
+            self.index.add("d", [0.0, -1.0])
+            self.index.add("a", [-1.0, 0.0])
+            self.index.remove("b")
+
+        self.index._write_generation = write_and_change
+
+        # when
+        asyncio.run(self.index.compact())
+        self.reopen()
+
+        # then
+        assert sorted(self.index._rows) == ["a", "d"]
+        assert self.index.get("a").tolist() == [-1.0, 0.0]
+        assert self.index.get("d").tolist() == [0.0, -1.0]
+
+    def test_add_dimension_mismatch(self):
+        # given
+        self.index.add("a", [1.0, 0.0])
+
+        # when / then
+        with pytest.raises(ValueError):
+            self.index.add("b", [1.0, 0.0, 0.0])
@@ -0,0 +1,238 @@
+import asyncio
+import numpy as np
+from datetime import datetime
+import pytest
+from unittest.mock import MagicMock
+
+from src.main.ai.similarity.EmbeddingIndex import ExactIndex, normalize
+from src.main.ai.similarity.MemmapIndex import MemmapIndex
+from src.main.ai.similarity.PQIndex import PQIndex, ProductQuantizer
+from src.main.ai.similarity.benchmark import build_index, generate_clustered_vectors, measure
+
+
+class TestProductQuantizer:
+    def setup_method(self):
+        self.vectors = normalize(generate_clustered_vectors(1000, 30, clusters=10, seed=0))
+        self.quantizer = ProductQuantizer(subvector_dimensions=4, codebook_size=64)
+        self.quantizer.train(self.vectors, iterations=10)
+
+    def test_encode_to_uint8_codes(self):
+        # when
+        codes = self.quantizer.encode(self.vectors)
+
+        # then - 30차원은 4차원 부분 벡터 8개로 채워 나눔
+        assert codes.dtype == np.uint8
+        assert codes.shape == (8, 1000)
+        assert self.quantizer.codebooks.shape == (8, 64, 4)
+
+    def test_decode_approximates_vectors(self):
+        # when
+        decoded = self.quantizer.decode(self.quantizer.encode(self.vectors))
+
+        # then
+        assert decoded.shape == self.vectors.shape
+        similarity = np.einsum("ij,ij->i", decoded, self.vectors) / np.linalg.norm(decoded, axis=1)
+        assert similarity.mean() > 0.95
+
+    def test_lookup_table_scores_match_decoded_dot_product(self):
+        # given
+        query = self.vectors[3]
+        codes = self.quantizer.encode(self.vectors)
+
+        # when
+        scores = self.quantizer.scores(self.quantizer.lookup_table(query), codes)
+
+        # then
+        assert scores == pytest.approx(self.quantizer.decode(codes) @ query, abs=1e-5)
+
+    def test_rejects_codebook_larger_than_uint8(self):
+        # when / then
+        with pytest.raises(ValueError):
+            ProductQuantizer(codebook_size=512)
+
+
+class TestPQIndex:
+    def setup_method(self):
+        self.vectors = generate_clustered_vectors(3000, 32, clusters=30, noise=1.0, seed=0)
+        rng = np.random.default_rng(1)
+        # 저장된 파일에 작은 변화를 준 중복 후보 질의
+        self.queries = self.vectors[:100] + 0.1 * rng.standard_normal((100, 32)).astype(np.float32)
+        self.exact = build_index(ExactIndex(), self.vectors)
+
+    def test_memory_reduction(self):
+        # when
+        index = build_index(PQIndex(train_size=1000), self.vectors, batch_size=500)
+
+        # then - float32 128바이트가 코드 8바이트로
+        stats = index.stats()
+        assert stats["trained"] is True
+        assert stats["bytes_per_vector"] == 8
+        assert self.exact.stats()["memory_bytes"] / (stats["bytes_per_vector"] * len(index)) >= 16
+
+    def test_near_duplicate_recall_without_rerank(self):
+        # given
+        index = build_index(PQIndex(train_size=1000), self.vectors, batch_size=500)
+
+        # when
+        report = measure(index, self.exact, self.queries, k=1)
+
+        # then
+        assert report["recall"] >= 0.95
+
+    def test_rerank_recall_and_exact_scores(self):
+        # given
+        index = build_index(PQIndex(train_size=1000, rerank_index=ExactIndex()), self.vectors, batch_size=500)
+
+        # when
+        report = measure(index, self.exact, self.queries, k=10)
+        result = index.search(self.queries[0], k=3)
+
+        # then - 재정렬한 유사도는 원본 벡터로 계산한 값
+        assert report["recall"] >= 0.95
+        expected = self.exact.search(self.queries[0], k=3)
+        assert [file_id for file_id, _ in result] == [file_id for file_id, _ in expected]
+        assert [score for _, score in result] == pytest.approx([score for _, score in expected])
+
+    def test_search_before_training_is_exact(self):
+        # given
+        index = PQIndex(train_size=100)
+        index.add_many(["a", "b"], np.array([[1.0, 0.0], [0.0, 1.0]]))
+
+        # when
+        result = index.search([1.0, 0.1], k=1)
+
+        # then
+        assert index.is_trained is False
+        assert result[0][0] == "a"
+        assert result[0][1] == pytest.approx(1.0 / np.sqrt(1.01))
+
+    def test_add_does_not_train_inline(self):
+        # given
+        index = PQIndex(train_size=1000)
+
+        # when
+        index.add_many([str(row) for row in range(1500)], self.vectors[:1500])
+
+        # then - 학습은 train()에서 별도 스레드로 수행
+        assert index.is_trained is False
+        assert index.needs_training() is True
+
+    def test_train_applies_changes_made_during_training(self):
+        # given
+        index = PQIndex(train_size=1000, rerank_index=ExactIndex())
+        index.add_many([str(row) for row in range(1500)], self.vectors[:1500])
+        replacement = -self.vectors[0]
+
+        async def train_while_changing():
+            task = asyncio.create_task(index.train())
+            await asyncio.sleep(0)
+            # 학습 중에도 원본 벡터로 추가/삭제/검색
+            index.add("0", replacement)
+            index.add("new", self.vectors[2000])
+            index.remove("1")
+            assert index.search(self.vectors[2], k=1)[0][0] == "2"
+            await task
+
+        # when
+        asyncio.run(train_while_changing())
+
+        # then
+        assert index.is_trained is True
+        assert len(index) == 1500
+        assert "1" not in index
+        assert index.search(replacement, k=1)[0][0] == "0"
+        assert index.search(self.vectors[2000], k=1)[0][0] == "new"
+
+    def test_incremental_add_replace_and_remove(self):
+        # given
+        index = build_index(PQIndex(train_size=1000), self.vectors, batch_size=500)
+        replacement = -self.vectors[0]
+
+        # when
+        index.add("0", replacement)
+        index.add("new", self.vectors[1])
+        index.remove("2")
+
+        # then
+        assert len(index) == 3000
+        assert index.search(replacement, k=1)[0][0] == "0"
+        assert "2" not in index
+        assert index.get("2") is None
+        assert index.search(self.vectors[5], k=1, exclude="5")[0][0] != "5"
+
+    def test_rebuilds_codes_from_disk_rerank_index(self, tmp_path):
+        # given
+        index = build_index(PQIndex(train_size=1000, rerank_index=MemmapIndex(str(tmp_path))), self.vectors)
+        index.synced_at = datetime(2024, 1, 1)
+        index.close()
+
+        # when
+        reopened = PQIndex(train_size=1000, rerank_index=MemmapIndex(str(tmp_path)))
+        reopened._fit = MagicMock(side_effect=AssertionError("다시 학습하지 않아야 합니다."))
+        asyncio.run(reopened.restore())
+
+        # then - 저장된 코드북과 코드를 사용
+        assert reopened.is_trained is True
+        assert reopened.needs_training() is False
+        assert len(reopened) == 3000
+        assert reopened.synced_at == datetime(2024, 1, 1)
+        assert reopened.search(self.queries[0], k=1)[0][0] == "0"
+        reopened.close()
+
+    def test_constructor_does_not_read_rerank_index(self, tmp_path):
+        # given
+        index = build_index(PQIndex(train_size=1000, rerank_index=MemmapIndex(str(tmp_path))), self.vectors[:500])
+        index.close()
+
+        # when
+        reopened = PQIndex(train_size=1000, rerank_index=MemmapIndex(str(tmp_path)))
+
+        # then - 학습 전에는 원본 벡터를 복사하지 않고 rerank_index로 검색
+        assert reopened._pending is None
+        assert len(reopened) == 500
+        assert reopened.stats()["memory_bytes"] == 0
+        assert reopened.search(self.vectors[3], k=1)[0][0] == "3"
+        reopened.close()
+
+    def test_restore_encodes_rows_changed_after_save(self, tmp_path):
+        # given - 저장 이후 원본 벡터만 바뀐 상태 (저장 전에 멈춘 경우)
+        index = build_index(PQIndex(train_size=1000, rerank_index=MemmapIndex(str(tmp_path))), self.vectors)
+        index.close()
+        vector_index = MemmapIndex(str(tmp_path))
+        replacement = -self.vectors[0]
+        vector_index.add("0", replacement)
+        vector_index.add("new", self.vectors[1])
+        vector_index.remove("2")
+        vector_index.close()
+
+        # when
+        reopened = PQIndex(train_size=1000, rerank_index=MemmapIndex(str(tmp_path)))
+        asyncio.run(reopened.restore())
+
+        # then
+        assert len(reopened) == 3000
+        assert "2" not in reopened
+        assert reopened.search(replacement, k=1)[0][0] == "0"
+        assert reopened.search(self.vectors[1], k=2, exclude="1")[0][0] == "new"
+        reopened.close()
+
+    def test_restore_after_compaction_reencodes_with_saved_codebooks(self, tmp_path):
+        # given - 저장 이후 원본 벡터가 압축되어 세대가 바뀐 상태
+        index = build_index(PQIndex(train_size=1000, rerank_index=MemmapIndex(str(tmp_path))), self.vectors)
+        index.close()
+        vector_index = MemmapIndex(str(tmp_path), compact_min_rows=1)
+        for row in range(1000):
+            vector_index.remove(str(row))
+        asyncio.run(vector_index.compact())
+        vector_index.close()
+
+        # when
+        reopened = PQIndex(train_size=1000, rerank_index=MemmapIndex(str(tmp_path)))
+        reopened._fit = MagicMock(side_effect=AssertionError("다시 학습하지 않아야 합니다."))
+        asyncio.run(reopened.restore())
+
+        # then
+        assert len(reopened) == 2000
+        assert "0" not in reopened
+        assert reopened.search(self.vectors[1500], k=1)[0][0] == "1500"
+        reopened.close()
@@ -0,0 +1,311 @@
+import asyncio
+import threading
+import pytest
+from unittest.mock import MagicMock
+from bson import ObjectId
+from bson.binary import Binary, BinaryVectorDtype
+from datetime import datetime
+
+from src.main.ai.similarity.IVFIndex import IVFIndex
+from src.main.ai.similarity.LSHIndex import LSHIndex
+from src.main.ai.similarity.MemmapIndex import MemmapIndex
+from src.main.ai.similarity.SimilarityEngine import SimilarityEngine
+
+
+class AsyncCursor:
+    """async for로 순회하는 테스트용 커서"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self.documents:
+            yield document
+
+
+class TestSimilarityEngine:
+    def setup_method(self):
+        self.engine = SimilarityEngine(threshold=0.95)
+        self.file_id = "6123456789abcdef01234567"
+        self.similar_file_id = "6123456789abcdef01234568"
+        self.other_file_id = "6123456789abcdef01234569"
+
+    def load(self, documents, batch_size=2):
+        repository = MagicMock()
+        repository.find_file_embeddings.return_value = AsyncCursor(documents)
+        asyncio.run(self.engine.load(repository, batch_size=batch_size))
+        return repository
+    
+    def test_load_reads_only_updated_embeddings(self):
+        # given
+        first_time = datetime(2025, 1, 1)
+        second_time = datetime(2025, 1, 2)
+        self.load([
+            {"file_id": ObjectId(self.file_id), "embedding": [1.0, 0.0], "updated_at": first_time},
+            {"file_id": ObjectId(self.other_file_id), "embedding": [0.0, 1.0], "updated_at": second_time},
+        ])
+        
+        # when - 경계 시각의 문서가 다시 조회되어도 이미 있는 것은 건너뜀
+        repository = MagicMock()
+        repository.find_file_embeddings.return_value = AsyncCursor([
+            {"file_id": ObjectId(self.other_file_id), "embedding": [0.0, 1.0], "updated_at": second_time},
+            {"file_id": ObjectId(self.similar_file_id), "embedding": [1.0, 0.1], "updated_at": datetime(2025, 1, 3)},
+        ])
+        loaded = asyncio.run(self.engine.load(repository))
+        
+        # then
+        repository.find_file_embeddings.assert_called_once_with(1000, updated_after=second_time)
+        assert loaded == 1
+        assert len(self.engine.index) == 3
+        assert self.engine.index.synced_at == datetime(2025, 1, 3)
+    
+    def test_load_skips_embeddings_added_on_this_instance(self, tmp_path):
+        # given - 이 인스턴스가 저장하며 add()로 넣은 임베딩 5개
+        self.engine = SimilarityEngine(MemmapIndex(str(tmp_path)), threshold=0.95)
+        added_time = datetime(2025, 1, 1)
+        documents = []
+        for row in range(10):
+            embedding = [1.0, float(row)]
+            if row < 5:
+                asyncio.run(self.engine.add(str(row), embedding))
+            documents.append({"file_id": str(row), "embedding": embedding, "updated_at": added_time})
+        
+        # when - 동기화에서 같은 임베딩과 다른 인스턴스가 저장한 임베딩 5개를 읽음
+        self.load(documents)
+        
+        # then - 이미 있는 임베딩은 다시 기록하지 않음
+        stats = self.engine.index.stats()
+        assert len(self.engine.index) == 10
+        assert stats["rows"] == 10
+        assert stats["dead_rows"] == 0
+        self.engine.index.close()
+    
+    def test_load_restores_index_from_disk(self, tmp_path):
+        # given - 이전 실행에서 디스크에 저장한 벡터
+        previous = LSHIndex(vector_index=MemmapIndex(str(tmp_path)))
+        previous.add_many([self.file_id, self.similar_file_id], [[1.0, 0.0, 0.0], [0.99, 0.05, 0.0]])
+        previous.close()
+        self.engine = SimilarityEngine(LSHIndex(vector_index=MemmapIndex(str(tmp_path))), threshold=0.95)
+
+        # when
+        self.load([])
+
+        # then - 생성자가 아닌 첫 적재에서 버킷을 다시 만듦
+        assert len(self.engine.index) == 2
+        assert asyncio.run(self.engine.find_duplicate(self.file_id))[0] == self.similar_file_id
+        self.engine.index.close()
+
+    def test_load_replaces_changed_embedding(self):
+        # given
+        asyncio.run(self.engine.add(self.file_id, [1.0, 0.0]))
+        
+        # when
+        self.load([{"file_id": ObjectId(self.file_id), "embedding": [0.0, 1.0], "updated_at": datetime(2025, 1, 1)}])
+        
+        # then
+        assert self.engine.index.get(self.file_id) == pytest.approx([0.0, 1.0])
+    
+    def test_start_and_stop(self):
+        # given
+        engine = SimilarityEngine(sync_interval=60)
+        engine.index.close = MagicMock()
+        repository = MagicMock()
+        repository.find_file_embeddings.side_effect = lambda *args, **kwargs: AsyncCursor([
+            {"file_id": ObjectId(self.file_id), "embedding": [1.0, 0.0]}
+        ])
+        
+        async def run():
+            engine.start(repository)
+            await asyncio.sleep(0.01)
+            ready = engine.ready
+            await engine.stop()
+            return ready
+        
+        # when
+        ready = asyncio.run(run())
+        
+        # then
+        assert ready is True
+        assert self.file_id in engine.index
+        assert engine.is_running is False
+        engine.index.close.assert_called_once()
+
+    def test_run_trains_index_in_background(self):
+        # given
+        engine = SimilarityEngine(index=IVFIndex(nlist=2, train_size=4), sync_interval=60)
+        repository = MagicMock()
+        repository.find_file_embeddings.side_effect = lambda *args, **kwargs: AsyncCursor([
+            {"file_id": ObjectId(), "embedding": embedding}
+            for embedding in ([1.0, 0.0], [0.9, 0.1], [0.0, 1.0], [0.1, 0.9])
+        ])
+
+        async def run():
+            engine.start(repository)
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if engine.index.is_trained:
+                    break
+            await engine.stop()
+
+        # when
+        asyncio.run(run())
+
+        # then
+        assert engine.index.is_trained is True
+        assert len(engine.index) == 4
+
+    def test_load_reads_binary_and_legacy_embeddings(self):
+        # given
+        documents = [
+            {"file_id": ObjectId(self.file_id), "embedding": Binary.from_vector([1.0, 0.0, 0.0], BinaryVectorDtype.FLOAT32)},
+            {"file_id": ObjectId(self.similar_file_id), "embedding": [0.99, 0.05, 0.0]},
+            {"file_id": ObjectId(self.other_file_id), "embedding": Binary.from_vector([0.0, 1.0, 0.0], BinaryVectorDtype.FLOAT32)},
+        ]
+
+        # when
+        repository = self.load(documents)
+
+        # then
+        repository.find_file_embeddings.assert_called_once_with(2, updated_after=None)
+        assert self.engine.ready is True
+        assert len(self.engine.index) == 3
+
+    def test_load_skips_mismatched_dimensions(self):
+        # given
+        documents = [
+            {"file_id": ObjectId(self.file_id), "embedding": [1.0, 0.0]},
+            {"file_id": ObjectId(self.similar_file_id), "embedding": [1.0, 0.0, 0.0]},
+        ]
+
+        # when
+        self.load(documents)
+
+        # then
+        assert len(self.engine.index) == 1
+
+    def test_add_skips_mismatched_dimensions(self):
+        # given
+        asyncio.run(self.engine.add(self.file_id, [1.0, 0.0, 0.0]))
+
+        # when
+        added = asyncio.run(self.engine.add(self.similar_file_id, [1.0, 0.0]))
+
+        # then - 예외 없이 건너뜀
+        assert added is False
+        assert self.similar_file_id not in self.engine.index
+        assert len(self.engine.index) == 1
+
+    def test_find_duplicate(self):
+        # given
+        self.load([])
+        asyncio.run(self.engine.add(self.file_id, [1.0, 0.0, 0.0]))
+        asyncio.run(self.engine.add(self.similar_file_id, [0.99, 0.05, 0.0]))
+        asyncio.run(self.engine.add(self.other_file_id, [0.0, 1.0, 0.0]))
+
+        # when
+        result = asyncio.run(self.engine.find_duplicate(self.file_id))
+
+        # then - 자기 자신은 제외하고 가장 유사한 파일을 반환
+        assert result[0] == self.similar_file_id
+        assert result[1] >= 0.95
+        assert self.engine.stats()["duplicates"] == 1
+
+    def test_find_duplicate_below_threshold(self):
+        # given
+        self.load([])
+        asyncio.run(self.engine.add(self.file_id, [1.0, 0.0, 0.0]))
+        asyncio.run(self.engine.add(self.other_file_id, [0.0, 1.0, 0.0]))
+
+        # when
+        result = asyncio.run(self.engine.find_duplicate(self.file_id))
+
+        # then - 판정은 했지만 중복 파일 없음
+        assert result == (None, pytest.approx(0.0))
+
+    def test_find_duplicate_unknown_file(self):
+        # given
+        self.load([])
+
+        # when
+        result = asyncio.run(self.engine.find_duplicate(self.file_id))
+
+        # then
+        assert result is None
+
+    def test_find_duplicate_before_load(self):
+        # given
+        asyncio.run(self.engine.add(self.file_id, [1.0, 0.0, 0.0]))
+
+        # when
+        result = asyncio.run(self.engine.find_duplicate(self.file_id))
+
+        # then - 적재 전에는 판정하지 않음
+        assert result is None
+
+    def test_find_duplicate_runs_search_in_thread(self):
+        # given
+        self.load([])
+        asyncio.run(self.engine.add(self.file_id, [1.0, 0.0, 0.0]))
+        asyncio.run(self.engine.add(self.similar_file_id, [0.99, 0.05, 0.0]))
+        search = self.engine.index.search
+        threads = []
+
+        def record_thread(*args):
+            threads.append(threading.get_ident())
+            return search(*args)
+
+        self.engine.index.search = record_thread
+
+        # when
+        result = asyncio.run(self.engine.find_duplicate(self.file_id))
+
+        # then - 이벤트 루프가 아닌 스레드에서 검색
+        assert result[0] == self.similar_file_id
+        assert threads and threads[0] != threading.get_ident()
+
+    def test_add_waits_for_running_search(self):
+        # given - 검색 스레드가 멈춰 있는 상태
+        self.load([])
+        asyncio.run(self.engine.add(self.file_id, [1.0, 0.0, 0.0]))
+        search = self.engine.index.search
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking_search(*args):
+            started.set()
+            release.wait(5)
+            return search(*args)
+
+        self.engine.index.search = blocking_search
+
+        async def run():
+            finding = asyncio.create_task(self.engine.find_duplicate(self.file_id))
+            await asyncio.to_thread(started.wait, 5)
+            adding = asyncio.create_task(self.engine.add(self.similar_file_id, [0.99, 0.05, 0.0]))
+            await asyncio.sleep(0.05)
+            added_during_search = self.similar_file_id in self.engine.index
+            release.set()
+            await asyncio.gather(finding, adding)
+            return added_during_search
+
+        # when
+        added_during_search = asyncio.run(run())
+
+        # then - 검색이 끝난 뒤에 인덱스를 변경
+        assert added_during_search is False
+        assert self.similar_file_id in self.engine.index
+
+    def test_find_duplicate_during_maintenance(self):
+        # given
+        self.load([])
+        asyncio.run(self.engine.add(self.file_id, [1.0, 0.0, 0.0]))
+        self.engine._maintaining = True
+
+        # when
+        result = asyncio.run(self.engine.find_duplicate(self.file_id))
+
+        # then - 학습/압축 중에는 판정하지 않음
+        assert result is None
@@ -0,0 +1,202 @@
+import asyncio
+import pytest
+import fakeredis
+from unittest.mock import AsyncMock
+
+from src.main.config.cache import TTLCache, StatusCache, LocalStatusCache, RedisStatusCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(max_size=2, default_ttl=10, clock=self.clock)
+
+    def test_get_returns_cached_value(self):
+        # given
+        self.cache.set("a", 1)
+
+        # when
+        value = self.cache.get("a")
+
+        # then
+        assert value == 1
+        assert self.cache.stats()["hits"] == 1
+
+    def test_get_missing_key(self):
+        # when
+        value = self.cache.get("a")
+
+        # then
+        assert value is None
+        assert self.cache.stats()["misses"] == 1
+
+    def test_expired_entry_is_removed(self):
+        # given
+        self.cache.set("a", 1, ttl=1)
+        self.clock.now = 1.5
+
+        # when
+        value = self.cache.get("a")
+
+        # then
+        assert value is None
+        assert self.cache.stats()["expirations"] == 1
+        assert self.cache.stats()["size"] == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        # given
+        self.cache.set("a", 1)
+        self.cache.set("b", 2)
+        self.cache.get("a")
+
+        # when
+        self.cache.set("c", 3)
+
+        # then - 최근에 조회한 a는 남고 b가 내보내짐
+        assert self.cache.get("a") == 1
+        assert self.cache.get("b") is None
+        assert self.cache.get("c") == 3
+        assert self.cache.stats()["evictions"] == 1
+
+    def test_non_positive_ttl_is_not_cached(self):
+        # when
+        self.cache.set("a", 1, ttl=0)
+
+        # then
+        assert self.cache.get("a") is None
+
+
+class TestStatusCache:
+    def test_backend_must_implement_interface(self):
+        # given - stats를 구현하지 않은 백엔드
+        class IncompleteStatusCache(StatusCache):
+            async def get(self, key):
+                return None
+
+            async def set(self, key, value, ttl):
+                pass
+
+            async def delete(self, key):
+                pass
+
+        # when & then
+        with pytest.raises(TypeError):
+            IncompleteStatusCache()
+
+
+class TestLocalStatusCache:
+    def test_set_and_get(self):
+        # given
+        cache = LocalStatusCache(max_size=10, default_ttl=60)
+
+        async def run():
+            await cache.set(("category_recommendation", "a", "u"), {"is_completed": True}, 60)
+            return await cache.get(("category_recommendation", "a", "u"))
+
+        # when
+        value = asyncio.run(run())
+
+        # then
+        assert value == {"is_completed": True}
+        assert cache.stats()["backend"] == "local"
+
+
+class TestRedisStatusCache:
+    def setup_method(self):
+        # 로컬 Redis 대체 서버
+        self.server = fakeredis.FakeServer()
+        self.key = ("file_duplicate_check", "file-id", "user-id")
+
+    def create_cache(self):
+        return RedisStatusCache(fakeredis.FakeAsyncRedis(server=self.server), key_prefix="test:")
+
+    def test_value_is_shared_between_clients(self):
+        # given - 서로 다른 태스크의 캐시가 같은 Redis를 사용
+        writer = self.create_cache()
+        reader = self.create_cache()
+
+        async def run():
+            await writer.set(self.key, {"is_completed": True, "is_duplicated": False}, 60)
+            return await reader.get(self.key)
+
+        # when
+        value = asyncio.run(run())
+
+        # then
+        assert value == {"is_completed": True, "is_duplicated": False}
+        assert reader.stats()["hits"] == 1
+
+    def test_set_uses_ttl_and_key_prefix(self):
+        # given
+        cache = self.create_cache()
+
+        async def run():
+            await cache.set(self.key, {"is_completed": False}, 1.5)
+            return await cache.client.pttl("test:file_duplicate_check:file-id:user-id")
+
+        # when
+        ttl_ms = asyncio.run(run())
+
+        # then
+        assert 0 < ttl_ms <= 1500
+
+    def test_delete_invalidates_value(self):
+        # given
+        cache = self.create_cache()
+
+        async def run():
+            await cache.set(self.key, {"is_completed": False}, 60)
+            await cache.delete(self.key)
+            return await cache.get(self.key)
+
+        # when
+        value = asyncio.run(run())
+
+        # then
+        assert value is None
+        assert cache.stats()["misses"] == 1
+
+    def test_errors_are_treated_as_miss(self):
+        # given - Redis 연결 실패
+        client = AsyncMock()
+        client.get.side_effect = ConnectionError("connection refused")
+        client.set.side_effect = ConnectionError("connection refused")
+        cache = RedisStatusCache(client)
+
+        async def run():
+            await cache.set(self.key, {"is_completed": True}, 60)
+            return await cache.get(self.key)
+
+        # when
+        value = asyncio.run(run())
+
+        # then
+        assert value is None
+        assert cache.stats()["errors"] == 2
+        assert cache.stats()["misses"] == 1
+
+    def test_get_many_and_set_many(self):
+        # given
+        cache = self.create_cache()
+        other_key = ("file_duplicate_check", "other-file-id", "user-id")
+
+        async def run():
+            await cache.set_many([(self.key, {"is_completed": True}, 60)])
+            return await cache.get_many([self.key, other_key])
+
+        # when
+        values = asyncio.run(run())
+
+        # then - MGET 한 번으로 조회하고 없는 키는 None
+        assert values == [{"is_completed": True}, None]
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
@@ -0,0 +1,63 @@
+import asyncio
+import threading
+import pytest
+
+from src.main.config.executor import BoundedExecutor
+
+
+class TestBoundedExecutor:
+    def setup_method(self):
+        self.executor = BoundedExecutor(max_workers=2, name="test")
+
+    def teardown_method(self):
+        self.executor.shutdown()
+
+    def test_run_returns_result_off_event_loop(self):
+        # given
+        loop_thread = threading.get_ident()
+
+        # when
+        result_thread = asyncio.run(self.executor.run(threading.get_ident))
+
+        # then
+        assert result_thread != loop_thread
+        assert self.executor.stats()["completed"] == 1
+
+    def test_run_records_failure(self):
+        # given
+        def fail():
+            raise ValueError("boom")
+
+        # when & then
+        with pytest.raises(ValueError):
+            asyncio.run(self.executor.run(fail))
+
+        assert self.executor.stats()["failed"] == 1
+        assert self.executor.stats()["in_flight"] == 0
+
+    def test_run_bounds_concurrency_and_tracks_queue_depth(self):
+        # given
+        release = threading.Event()
+        running = []
+
+        def block():
+            running.append(1)
+            release.wait(timeout=5)
+
+        async def scenario():
+            tasks = [asyncio.create_task(self.executor.run(block)) for _ in range(5)]
+            while len(running) < 2:
+                await asyncio.sleep(0.01)
+            stats = self.executor.stats()
+            release.set()
+            await asyncio.gather(*tasks)
+            return stats
+
+        # when
+        stats = asyncio.run(scenario())
+
+        # then
+        assert stats["in_flight"] == 2
+        assert stats["queue_depth"] == 3
+        assert self.executor.stats()["completed"] == 5
+        assert self.executor.stats()["max_queue_depth"] >= 3
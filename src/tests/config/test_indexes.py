@@ -0,0 +1,156 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from pymongo.errors import OperationFailure
+
+from src.main.config.indexes import (
+    ensure_indexes,
+    get_index_report,
+    check_required_indexes,
+    remove_duplicate_checks,
+    IndexCreationError,
+    INDEXES
+)
+
+
+class TestIndexes:
+    def setup_method(self):
+        # 컬렉션 이름별 목업 컬렉션 생성
+        self.collections = {name: AsyncMock() for name in INDEXES}
+        for collection in self.collections.values():
+            collection.index_information.return_value = {"_id_": {"key": [("_id", 1)]}}
+
+        self.mock_db = MagicMock()
+        self.mock_db.get_collection.side_effect = lambda name: self.collections[name]
+
+    def test_ensure_indexes_creates_missing_indexes(self):
+        # when
+        report = asyncio.run(ensure_indexes(self.mock_db))
+
+        # then
+        assert all(entry["status"] == "created" for entry in report)
+        assert len(report) == sum(len(models) for models in INDEXES.values())
+        for collection in self.collections.values():
+            collection.create_indexes.assert_called()
+
+    def test_ensure_indexes_skips_existing_indexes(self):
+        # given
+        checks = self.collections["file_duplicate_checks"]
+        checks.index_information.return_value = {
+            "file_id_1_user_id_1": {"key": [("file_id", 1), ("user_id", 1)], "unique": True}
+        }
+
+        # when
+        report = asyncio.run(ensure_indexes(self.mock_db))
+
+        # then
+        entry = next(e for e in report if e["name"] == "file_id_1_user_id_1")
+        assert entry["status"] == "exists"
+        created = [call.args[0][0].document["name"] for call in checks.create_indexes.call_args_list]
+        assert "file_id_1_user_id_1" not in created
+
+    def test_ensure_indexes_reports_failure(self):
+        # given
+        checks = self.collections["file_duplicate_checks"]
+        checks.create_indexes.side_effect = OperationFailure("E11000 duplicate key error")
+
+        # when
+        report = asyncio.run(ensure_indexes(self.mock_db))
+
+        # then
+        entry = next(e for e in report if e["name"] == "file_id_1_user_id_1")
+        assert entry["status"] == "failed"
+        assert "duplicate key" in entry["error"]
+
+    def test_ensure_indexes_fails_when_required_index_is_not_unique(self):
+        # given - 기본 이름이 같은 유니크가 아닌 인덱스
+        checks = self.collections["file_duplicate_checks"]
+        checks.index_information.return_value = {
+            "file_id_1_user_id_1": {"key": [("file_id", 1), ("user_id", 1)]}
+        }
+
+        # when
+        report = asyncio.run(ensure_indexes(self.mock_db))
+
+        # then
+        entry = next(e for e in report if e["name"] == "file_id_1_user_id_1")
+        assert entry["status"] == "failed"
+        assert "unique" in entry["error"]
+        with pytest.raises(IndexCreationError):
+            check_required_indexes(report)
+
+    def test_ensure_indexes_accepts_matching_required_index(self):
+        # given
+        checks = self.collections["file_duplicate_checks"]
+        checks.index_information.return_value = {
+            "file_id_1_user_id_1": {"key": [("file_id", 1), ("user_id", 1)], "unique": True}
+        }
+
+        # when
+        report = asyncio.run(ensure_indexes(self.mock_db))
+
+        # then
+        entry = next(e for e in report if e["name"] == "file_id_1_user_id_1")
+        assert entry["status"] == "exists"
+        check_required_indexes(report)
+
+    def test_ensure_indexes_keeps_last_report(self):
+        # when
+        report = asyncio.run(ensure_indexes(self.mock_db))
+
+        # then
+        assert get_index_report() == report
+
+    def test_check_required_indexes_raises_when_unique_index_failed(self):
+        # given
+        checks = self.collections["file_duplicate_checks"]
+        checks.create_indexes.side_effect = OperationFailure("E11000 duplicate key error")
+        report = asyncio.run(ensure_indexes(self.mock_db))
+
+        # when & then
+        with pytest.raises(IndexCreationError) as exc_info:
+            check_required_indexes(report)
+
+        assert "file_duplicate_checks.file_id_1_user_id_1" in str(exc_info.value)
+        assert "--remove-duplicates" in str(exc_info.value)
+
+    def test_check_required_indexes_ignores_optional_failures(self):
+        # given
+        self.collections["outbox"].create_indexes.side_effect = OperationFailure("error")
+        report = asyncio.run(ensure_indexes(self.mock_db))
+
+        # when & then - 필수 인덱스가 아니면 예외 없음
+        check_required_indexes(report)
+
+    def test_remove_duplicate_checks_keeps_first_of_each_group(self):
+        # given
+        checks = self.collections["file_duplicate_checks"]
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[
+            {"_id": {"file_id": "file-1", "user_id": "user-1"}, "ids": ["a", "b", "c"], "count": 3},
+        ])
+        checks.aggregate.return_value = cursor
+        checks.delete_many.return_value = MagicMock(deleted_count=2)
+
+        # when
+        duplicates = asyncio.run(remove_duplicate_checks(self.mock_db, apply=True))
+
+        # then
+        assert duplicates == [{"file_id": "file-1", "user_id": "user-1", "keep": "a", "remove": ["b", "c"]}]
+        checks.delete_many.assert_called_once_with({"_id": {"$in": ["b", "c"]}})
+
+    def test_remove_duplicate_checks_dry_run(self):
+        # given
+        checks = self.collections["file_duplicate_checks"]
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[
+            {"_id": {"file_id": "file-1", "user_id": "user-1"}, "ids": ["a", "b"], "count": 2},
+        ])
+        checks.aggregate.return_value = cursor
+
+        # when
+        duplicates = asyncio.run(remove_duplicate_checks(self.mock_db))
+
+        # then
+        assert duplicates[0]["remove"] == ["b"]
+        checks.delete_many.assert_not_called()
@@ -0,0 +1,43 @@
+import asyncio
+from unittest.mock import patch
+
+from src.main.config import mongodb
+
+
+class TestMongoDB:
+    def setup_method(self):
+        # 테스트마다 공유 클라이언트 초기화
+        mongodb._client = None
+        self.url_patch = patch.object(mongodb, "MONGODB_URL", "mongodb://localhost:27017/test")
+        self.url_patch.start()
+
+    def teardown_method(self):
+        asyncio.run(mongodb.close_mongo_client())
+        self.url_patch.stop()
+
+    def test_get_mongo_client_returns_shared_client(self):
+        # when
+        first = mongodb.get_mongo_client()
+        second = mongodb.get_mongo_client()
+
+        # then
+        assert first is second
+
+    def test_get_mongo_client_applies_pool_options(self):
+        # when
+        client = mongodb.get_mongo_client()
+
+        # then
+        assert client.options.pool_options.max_pool_size == mongodb.MONGODB_MAX_POOL_SIZE
+        assert client.options.pool_options.min_pool_size == mongodb.MONGODB_MIN_POOL_SIZE
+
+    def test_close_mongo_client_resets_shared_client(self):
+        # given
+        first = mongodb.get_mongo_client()
+
+        # when
+        asyncio.run(mongodb.close_mongo_client())
+        second = mongodb.get_mongo_client()
+
+        # then
+        assert first is not second
@@ -0,0 +1,66 @@
+from src.main.config.similarity import create_embedding_index
+from src.main.ai.similarity.EmbeddingIndex import ExactIndex
+from src.main.ai.similarity.MemmapIndex import MemmapIndex
+from src.main.ai.similarity.IVFIndex import IVFIndex
+from src.main.ai.similarity.PQIndex import PQIndex
+from src.main.ai.similarity.LSHIndex import LSHIndex
+
+
+class TestCreateEmbeddingIndex:
+    def test_memory_index_without_path(self):
+        # when
+        index = create_embedding_index("")
+
+        # then
+        assert isinstance(index, ExactIndex)
+
+    def test_memmap_index_with_path(self, tmp_path):
+        # when
+        index = create_embedding_index(str(tmp_path))
+
+        # then
+        assert isinstance(index, MemmapIndex)
+        index.close()
+
+    def test_ivf_index(self):
+        # when
+        index = create_embedding_index("", index_type="ivf")
+
+        # then
+        assert isinstance(index, IVFIndex)
+        assert index.vector_index is None
+
+    def test_ivf_index_with_path_keeps_vectors_on_disk(self, tmp_path):
+        # when
+        index = create_embedding_index(str(tmp_path), index_type="ivf")
+
+        # then
+        assert isinstance(index, IVFIndex)
+        assert isinstance(index.vector_index, MemmapIndex)
+        index.close()
+
+    def test_pq_index_reranks_with_memmap_index(self, tmp_path):
+        # when
+        index = create_embedding_index(str(tmp_path), index_type="pq")
+
+        # then
+        assert isinstance(index, PQIndex)
+        assert isinstance(index.rerank_index, MemmapIndex)
+        index.close()
+
+    def test_lsh_index_bands_from_false_negative_rate(self):
+        # when
+        index = create_embedding_index("", index_type="lsh")
+
+        # then - 기본 설정(유사도 0.95, rows 16, 놓침 확률 1%)
+        assert isinstance(index, LSHIndex)
+        assert index.rows == 16
+        assert index.bands == 23
+
+    def test_pq_index_without_path_reranks_in_memory(self):
+        # when
+        index = create_embedding_index("", index_type="pq")
+
+        # then - 판정 유사도가 양자화 오차에 좌우되지 않도록 원본 벡터로 재정렬
+        assert isinstance(index, PQIndex)
+        assert isinstance(index.rerank_index, ExactIndex)
@@ -0,0 +1,44 @@
+from unittest.mock import MagicMock, patch
+
+from src.main.config import sqs
+
+
+class TestSQS:
+    def setup_method(self):
+        # 테스트마다 공유 클라이언트 초기화
+        sqs._sqs_client = None
+
+    def teardown_method(self):
+        sqs._sqs_client = None
+
+    def test_get_sqs_client_returns_shared_client(self):
+        # given
+        with patch.object(sqs, "create_sqs_client", return_value=MagicMock()) as mock_create:
+            # when
+            first = sqs.get_sqs_client()
+            second = sqs.get_sqs_client()
+
+        # then
+        assert first is second
+        mock_create.assert_called_once()
+
+    def test_close_sqs_client_closes_and_resets(self):
+        # given
+        mock_client = MagicMock()
+        sqs._sqs_client = mock_client
+
+        # when
+        sqs.close_sqs_client()
+
+        # then
+        mock_client.close.assert_called_once()
+        assert sqs._sqs_client is None
+
+    def test_get_sqs_config(self):
+        # when
+        config = sqs.get_sqs_config()
+
+        # then
+        assert config.max_pool_connections == sqs.SQS_MAX_POOL_CONNECTIONS
+        assert config.tcp_keepalive is True
+        assert config.retries == {"max_attempts": sqs.SQS_MAX_ATTEMPTS, "mode": "standard"}
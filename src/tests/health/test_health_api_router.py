@@ -7,4 +7,10 @@ class TestHealthApiRouter:
     def test_health(self):
         response = client.get("/health")
         assert response.status_code == 200
-        assert response.json() == {"status": "ok"}
\ No newline at end of file
+        assert response.json() == {"status": "ok"}
+
+    def test_metrics(self):
+        response = client.get("/health/metrics")
+        assert response.status_code == 200
+        assert "queue_depth" in response.json()["sqs_executor"]
+        assert "indexes" in response.json()